@@ -0,0 +1,6 @@
+"""Keeper modules shared by the vault and strategy brownie projects.
+
+Each project installs this package from its requirements (`-e ../keeper` from
+vaults/), its `scripts/` keep the project specific plans and `brownie run`
+entry points.
+"""
@@ -0,0 +1,189 @@
+"""Local ABI registry used by the keeper scripts instead of `Contract.from_explorer`.
+
+ABIs are seeded from the compiled `build/` artifacts of this repo and indexed by
+the keccak of their runtime bytecode. Deployed addresses are resolved once (by
+code hash, following EIP-1967 proxies, falling back to the explorer only for
+unknown code) and pinned in `REGISTRY_PATH`, so later runs build contract
+objects from local data without touching the explorer. The pinned code hash is
+checked against the chain once per run, an address whose code changed is
+resolved again.
+
+Build directories are relative to the brownie project running the keeper, each
+project passes its own along with the `refresh` and `benchmark` entry points.
+"""
+import glob
+import json
+import os
+import tempfile
+import threading
+import time
+
+from brownie import Contract, web3
+from eth_utils import keccak, to_checksum_address
+from hexbytes import HexBytes
+
+REGISTRY_PATH = "build/registry.json"
+REGISTRY_VERSION = 1
+
+BUILD_DIRS = ["build/contracts"]
+
+# bytes32(uint256(keccak256("eip1967.proxy.implementation")) - 1)
+IMPLEMENTATION_SLOT = 0x360894A13BA1A3210667C828492DB98DCA3E2076CC3735A920A3CA505D382BBC
+
+
+def code_hash(code):
+    return "0x" + keccak(bytes(code)).hex()
+
+
+EMPTY_CODE_HASH = code_hash(b"")
+
+
+class ContractRegistry:
+    def __init__(self, path=REGISTRY_PATH, build_dirs=BUILD_DIRS):
+        self.path = path
+        self.build_dirs = build_dirs
+        self.abis = {}
+        self.code_hashes = {}
+        self.contracts = {}
+        self._checked = set()
+        self._lock = threading.RLock()
+
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            data = {}
+
+        if data.get("version") == REGISTRY_VERSION:
+            self.abis = data["abis"]
+            self.code_hashes = data["codeHashes"]
+            self.contracts = data["contracts"]
+        else:
+            self.seed()
+            self.save()
+
+    def seed(self):
+        """Loads every ABI found in the build artifacts, indexed by runtime code hash."""
+        for pattern in self.build_dirs:
+            for path in sorted(glob.glob(os.path.join(pattern, "*.json"))):
+                with open(path) as f:
+                    artifact = json.load(f)
+
+                name = artifact.get("contractName")
+                if not name or artifact.get("abi") is None:
+                    continue
+
+                self.abis[name] = artifact["abi"]
+
+                # abstract contracts have no bytecode, unlinked libraries cannot be hashed
+                bytecode = artifact.get("deployedBytecode") or ""
+                if bytecode and "__" not in bytecode:
+                    self.code_hashes[code_hash(HexBytes(bytecode))] = name
+
+    def save(self):
+        with self._lock:
+            data = {
+                "version": REGISTRY_VERSION,
+                "abis": self.abis,
+                "codeHashes": self.code_hashes,
+                "contracts": self.contracts,
+            }
+            directory = os.path.dirname(self.path) or "."
+            os.makedirs(directory, exist_ok=True)
+
+            fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp, self.path)
+
+    def resolve(self, address):
+        """Returns `(name, code_hash)` for `address`, name is None for unknown code."""
+        code = web3.eth.get_code(address)
+        name = self.code_hashes.get(code_hash(code))
+
+        if name is None:
+            implementation = int.from_bytes(web3.eth.get_storage_at(address, IMPLEMENTATION_SLOT), "big")
+            if implementation:
+                implementation = to_checksum_address(implementation.to_bytes(20, "big"))
+                name = self.code_hashes.get(code_hash(web3.eth.get_code(implementation)))
+
+        return name, code_hash(code)
+
+    def _pin(self, address, name, current):
+        if name is None:
+            contract = Contract.from_explorer(address)
+            name = contract._name
+            self.abis.setdefault(name, contract.abi)
+
+        with self._lock:
+            self.contracts[address] = {"name": name, "codeHash": current}
+            self.save()
+
+        return self.contracts[address]
+
+    def contract(self, address, name=None, owner=None):
+        """Builds a contract object for `address` from local data.
+
+        Unknown addresses are resolved by code hash, then `name` (an ABI of this
+        registry, e.g. "Vault") is used, and the explorer is the last resort.
+        """
+        address = to_checksum_address(address)
+        entry = self.contracts.get(address)
+
+        # redeployed or destroyed since it was pinned
+        if entry is not None and address not in self._checked:
+            if code_hash(web3.eth.get_code(address)) != entry["codeHash"]:
+                entry = None
+
+        if entry is None:
+            resolved, current = self.resolve(address)
+            if current == EMPTY_CODE_HASH:
+                raise ValueError(f"registry: no code at {address}")
+            entry = self._pin(address, resolved or (name if name in self.abis else None), current)
+
+        self._checked.add(address)
+        return Contract.from_abi(entry["name"], address, self.abis[entry["name"]], owner=owner)
+
+    def refresh(self, addresses=()):
+        """Re-seeds ABIs from the build artifacts and re-resolves every pinned address."""
+        with self._lock:
+            self.code_hashes = {}
+            self.seed()
+
+            for address in sorted(set(self.contracts) | {to_checksum_address(a) for a in addresses}):
+                name, current = self.resolve(address)
+                entry = self.contracts.get(address)
+
+                if name is not None:
+                    self.contracts[address] = {"name": name, "codeHash": current}
+                elif entry is None or entry["codeHash"] != current:
+                    # unknown or upgraded code that is not in our artifacts
+                    self._pin(address, None, current)
+
+            self.save()
+
+
+def refresh(registry, addresses):
+    registry.refresh(addresses)
+    print(f"{len(registry.contracts)} contracts, {len(registry.abis)} abis pinned in {registry.path}")
+
+
+def benchmark(registry_class, addresses):
+    """Startup time of `registry_class` for `addresses`, against the explorer."""
+    start = time.perf_counter()
+    registry = registry_class()
+    loaded = time.perf_counter()
+    for address in addresses:
+        registry.contract(address)
+    built = time.perf_counter()
+
+    print(f"registry load: {(loaded - start) * 1e3:.2f}ms")
+    print(f"registry contracts ({len(addresses)}): {(built - loaded) * 1e3:.2f}ms")
+
+    try:
+        start = time.perf_counter()
+        for address in addresses:
+            Contract.from_explorer(address, silent=True)
+        print(f"explorer contracts ({len(addresses)}): {(time.perf_counter() - start) * 1e3:.2f}ms")
+    except Exception as e:
+        print(f"explorer unavailable: {e}")
@@ -0,0 +1,121 @@
+"""Gas-bounded packing of keeper calls into Safe multisends.
+
+Keeper calls are sent through a `CallRecorder`, which skips calls that would
+not change anything (e.g. `depositUnderlying(0)`) and tags every receipt with
+a group, the vault or strategy it belongs to. `pack` then fills multisends
+first-fit with whole groups, largest first, under `gas_ceiling`: calls of a
+group keep their order and stay in one multisend unless the group alone is
+over the ceiling, in which case it is split in order over consecutive ones.
+"""
+import threading
+from dataclasses import dataclass
+
+from brownie.network.transaction import TransactionReceipt
+
+# Fantom blocks fit ~30M gas, stay well under so a multisend is never the block's only tx.
+GAS_CEILING = 10_000_000
+
+# MultiSendCallOnly and Safe execution overhead, on top of the calls themselves.
+MULTISEND_GAS = 60_000
+MULTISEND_GAS_PER_CALL = 5_000
+
+# Calls that do nothing with these arguments.
+NOOPS = {
+    "harvest": lambda strategies: not strategies,
+    "depositIntoStrategy": lambda strategy, amount: amount == 0,
+    "withdrawFromStrategy": lambda strategy, amount: amount == 0,
+    "depositUnderlying": lambda amount: amount == 0,
+    "withdrawUnderlying": lambda amount: amount == 0,
+}
+
+
+@dataclass(frozen=True)
+class PlannedCall:
+    group: str
+    receipt: TransactionReceipt
+
+    @property
+    def gas(self):
+        return self.receipt.gas_used + MULTISEND_GAS_PER_CALL
+
+
+def is_noop(method, args):
+    check = NOOPS.get(method.abi["name"])
+    return check is not None and check(*args)
+
+
+class CallRecorder:
+    def __init__(self):
+        self.calls = []
+        self.skipped = []
+        self._lock = threading.Lock()
+
+    def send(self, group, method, *args):
+        """Sends `method(*args)` unless it is a no-op, a trailing dict is passed on as tx params."""
+        call_args = args[:-1] if args and isinstance(args[-1], dict) else args
+        if is_noop(method, call_args):
+            self.skipped.append((group, method.abi["name"], call_args))
+            return None
+
+        result = method(*args)
+
+        # view methods (e.g. a strategy investing nothing) return values, not receipts
+        if isinstance(result, TransactionReceipt):
+            with self._lock:
+                self.calls.append(PlannedCall(group, result))
+        return result
+
+
+def pack(calls, gas_ceiling=GAS_CEILING):
+    """Splits `calls` into the fewest multisends it can, returns lists of calls in execution order."""
+    capacity = gas_ceiling - MULTISEND_GAS
+
+    groups = {}
+    for call in calls:
+        groups.setdefault(call.group, []).append(call)
+
+    batches, used, oversized = [], [], []
+
+    # first-fit decreasing, ties in order of appearance
+    for group in sorted(groups.values(), key=lambda g: -sum(c.gas for c in g)):
+        gas = sum(c.gas for c in group)
+        if gas > capacity:
+            oversized.append(group)
+            continue
+
+        for i in range(len(batches)):
+            if used[i] + gas <= capacity:
+                batches[i].extend(group)
+                used[i] += gas
+                break
+        else:
+            batches.append(list(group))
+            used.append(gas)
+
+    # groups no multisend can hold are split in order over consecutive multisends of their own
+    for group in oversized:
+        batches.append([])
+        used.append(0)
+        for call in group:
+            if batches[-1] and used[-1] + call.gas > capacity:
+                batches.append([])
+                used.append(0)
+            batches[-1].append(call)
+            used[-1] += call.gas
+
+    return batches
+
+
+def build_multisends(safe, batches, safe_nonce=None):
+    """One Safe transaction per batch, with consecutive nonces."""
+    nonce = safe.pending_nonce() if safe_nonce is None else safe_nonce
+    return [
+        safe.multisend_from_receipts(receipts=[c.receipt for c in batch], safe_nonce=nonce + i)
+        for i, batch in enumerate(batches)
+    ]
+
+
+def post_multisends(safe, batches):
+    for safe_tx in build_multisends(safe, batches):
+        safe.sign_with_frame(safe_tx)
+        safe.post_transaction(safe_tx)
@@ -0,0 +1,160 @@
+"""Append-only columnar store for rate samples taken by the keepers.
+
+Each store is a directory holding one raw file per column plus `meta.json`
+(schema and key ids). A run appends one row per (block, key), where the key is a
+borrowable or vault address. Rows are appended in time order, so a time window
+is a contiguous slice found by binary search on the memory-mapped `timestamp`
+column and queries only page in the rows they touch.
+
+    store = RateStore("data/rates/vaults", ("estimated_return",))
+    store.append(block, timestamp, [vault.address], estimated_return=[apr])
+    times, values = store.series(vault.address, "estimated_return", start=now - 30 * DAY)
+"""
+import json
+import os
+import tempfile
+import threading
+
+import numpy as np
+
+DATA_DIR = "data/rates"
+DAY = 24 * 60 * 60
+
+INDEX_COLUMNS = {"block": np.uint64, "timestamp": np.uint64, "key": np.uint32}
+
+
+class RateStore:
+    def __init__(self, path, columns):
+        self.path = path
+        self.columns = {**INDEX_COLUMNS, **{c: np.float64 for c in columns}}
+        self._lock = threading.Lock()
+
+        os.makedirs(path, exist_ok=True)
+        try:
+            with open(self._meta_path()) as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            meta = {"columns": list(self.columns), "keys": []}
+
+        if meta["columns"] != list(self.columns):
+            raise ValueError(f"rate store: {path} has columns {meta['columns']}")
+
+        self.keys = meta["keys"]
+        self._ids = {k: i for i, k in enumerate(self.keys)}
+        self._save_meta()
+
+    def _meta_path(self):
+        return os.path.join(self.path, "meta.json")
+
+    def _column_path(self, name):
+        return os.path.join(self.path, f"{name}.bin")
+
+    def _save_meta(self):
+        fd, tmp = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump({"columns": list(self.columns), "keys": self.keys}, f)
+        os.replace(tmp, self._meta_path())
+
+    def __len__(self):
+        # an interrupted append can leave columns uneven, only complete rows count
+        rows = []
+        for name, dtype in self.columns.items():
+            try:
+                rows.append(os.path.getsize(self._column_path(name)) // np.dtype(dtype).itemsize)
+            except FileNotFoundError:
+                rows.append(0)
+        return min(rows)
+
+    def key_id(self, key):
+        return self._ids.get(key.lower())
+
+    def append(self, block, timestamp, keys, **values):
+        """Appends one row per key; `values` holds one sequence per value column."""
+        keys = [k.lower() for k in keys]
+        missing = set(self.columns) - set(INDEX_COLUMNS) - set(values)
+        if missing:
+            raise ValueError(f"rate store: missing columns {sorted(missing)}")
+
+        with self._lock:
+            if len(self) and timestamp < self._column("timestamp")[-1]:
+                raise ValueError("rate store: rows must be appended in time order")
+
+            new = [k for k in dict.fromkeys(keys) if k not in self._ids]
+            if new:
+                for k in new:
+                    self._ids[k] = len(self.keys)
+                    self.keys.append(k)
+                self._save_meta()
+
+            n = len(self)
+            rows = {
+                "block": np.full(len(keys), block),
+                "timestamp": np.full(len(keys), timestamp),
+                "key": [self._ids[k] for k in keys],
+                **values,
+            }
+            for name, dtype in self.columns.items():
+                column = np.asarray(rows[name], dtype=dtype)
+                if len(column) != len(keys):
+                    raise ValueError(f"rate store: {name} has {len(column)} values for {len(keys)} keys")
+
+                with open(self._column_path(name), "r+b" if os.path.exists(self._column_path(name)) else "wb") as f:
+                    # drop the tail of an interrupted append before writing
+                    f.truncate(n * column.itemsize)
+                    f.seek(0, os.SEEK_END)
+                    f.write(column.tobytes())
+
+    def _column(self, name, rows=None):
+        rows = len(self) if rows is None else rows
+        if rows == 0:
+            return np.empty(0, dtype=self.columns[name])
+        return np.memmap(self._column_path(name), dtype=self.columns[name], mode="r", shape=(rows,))
+
+    def window(self, start=None, end=None):
+        """Row range `[lo, hi)` with `start <= timestamp < end`."""
+        timestamps = self._column("timestamp")
+        lo = 0 if start is None else int(np.searchsorted(timestamps, start, side="left"))
+        hi = len(timestamps) if end is None else int(np.searchsorted(timestamps, end, side="left"))
+        return lo, hi
+
+    def series(self, key, column, start=None, end=None):
+        """Returns `(timestamps, values)` of `key` within the window."""
+        key_id = self.key_id(key)
+        if key_id is None:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+
+        rows = len(self)
+        lo, hi = self.window(start, end)
+        mask = self._column("key", rows)[lo:hi] == key_id
+        return (
+            np.asarray(self._column("timestamp", rows)[lo:hi][mask], dtype=np.int64),
+            np.asarray(self._column(column, rows)[lo:hi][mask]),
+        )
+
+    def latest(self, column):
+        """Last value recorded for every key, as `{key: value}`."""
+        rows = len(self)
+        keys = np.asarray(self._column("key", rows))
+        values = self._column(column, rows)
+
+        # index of the last occurrence of each key
+        last = len(keys) - 1 - np.unique(keys[::-1], return_index=True)[1]
+        return {self.keys[keys[i]]: float(values[i]) for i in last}
+
+    def rolling_mean(self, key, column, period, start=None, end=None):
+        """Mean over the trailing `period` seconds at every sample of `key`."""
+        times, values = self.series(key, column, None if start is None else start - period, end)
+        sums = np.concatenate([[0.0], np.cumsum(values)])
+
+        first = np.searchsorted(times, times - period, side="right") if len(times) else times
+        counts = np.arange(1, len(times) + 1) - first
+        means = (sums[1:] - sums[first]) / counts
+
+        keep = slice(None) if start is None else times >= start
+        return times[keep], means[keep]
+
+    def percentiles(self, key, column, q, start=None, end=None):
+        _, values = self.series(key, column, start, end)
+        if not len(values):
+            return np.full(np.shape(q), np.nan)
+        return np.percentile(values, q)
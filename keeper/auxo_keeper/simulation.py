@@ -0,0 +1,164 @@
+"""Per-step cost report for dry runs of the keeper scripts.
+
+Run a keeper's `simulate` entry point on a fork (e.g. `--network ftm-main-fork`):
+every transaction of the plan runs on the local chain, nothing is posted to the
+Safe, and the report lists each step's calls with gas used, RPC requests and
+elapsed time. Reports are written as JSON under `reports/` so runs can be diffed.
+"""
+import json
+import os
+import subprocess
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+from brownie import history, web3
+
+REPORTS_DIR = "reports"
+
+
+class RpcCounter:
+    """web3 middleware counting JSON-RPC requests per thread and per method."""
+
+    name = "rpc_counter"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.by_thread = Counter()
+        self.by_method = Counter()
+
+    def __call__(self, make_request, w3):
+        def middleware(method, params):
+            with self._lock:
+                self.by_thread[threading.get_ident()] += 1
+                self.by_method[method] += 1
+            return make_request(method, params)
+
+        return middleware
+
+    def count(self):
+        """Requests issued so far by the calling thread."""
+        with self._lock:
+            return self.by_thread[threading.get_ident()]
+
+    def total(self):
+        with self._lock:
+            return sum(self.by_method.values())
+
+
+def install_rpc_counter():
+    counter = RpcCounter()
+    if RpcCounter.name in web3.middleware_onion:
+        web3.middleware_onion.remove(RpcCounter.name)
+    web3.middleware_onion.add(counter, name=RpcCounter.name)
+    return counter
+
+
+def _describe(tx):
+    return {
+        "to": tx.receiver,
+        "contract": tx.contract_name,
+        "function": tx.fn_name,
+        "gas_used": tx.gas_used,
+        "status": tx.status,
+    }
+
+
+class CostReport:
+    def __init__(self, name, counter=None):
+        self.name = name
+        self.counter = counter or install_rpc_counter()
+        self.steps = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def step(self, label):
+        # transactions are only sent from serialized steps, so history slices are per step
+        first_tx = len(history)
+        rpc = self.counter.count()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            calls = [_describe(tx) for tx in history[first_tx:]]
+            entry = {
+                "step": label,
+                "elapsed": time.perf_counter() - start,
+                "rpc": self.counter.count() - rpc,
+                "gas_used": sum(c["gas_used"] or 0 for c in calls),
+                "calls": calls,
+            }
+            with self._lock:
+                self.steps.append(entry)
+
+    def stage(self, label, name):
+        """`StageTimer.stage` compatible, so the keepers' timed stages can be reported too."""
+        return self.step(f"{name} {label}")
+
+    def preview_multisend(self, safe, safe_tx, label="multisend", reset=True):
+        # `preview` resets the fork before executing unless told not to, so the receipt is recorded directly
+        rpc = self.counter.count()
+        start = time.perf_counter()
+        receipt = safe.preview(safe_tx, events=False, reset=reset)
+        entry = {
+            "step": label,
+            "elapsed": time.perf_counter() - start,
+            "rpc": self.counter.count() - rpc,
+            "gas_used": receipt.gas_used,
+            "calls": [_describe(receipt)],
+        }
+        with self._lock:
+            self.steps.append(entry)
+        return receipt
+
+    def totals(self):
+        return {
+            "steps": len(self.steps),
+            "calls": sum(len(s["calls"]) for s in self.steps),
+            "gas_used": sum(s["gas_used"] for s in self.steps),
+            "rpc": self.counter.total(),
+            "rpc_by_method": dict(self.counter.by_method),
+        }
+
+    def by_stage(self):
+        """Steps summed by kind, e.g. every `harvest <vault>` step under `harvest`."""
+        stages = defaultdict(lambda: {"elapsed": 0, "rpc": 0, "gas_used": 0, "calls": 0})
+        for s in self.steps:
+            stage = stages[s["step"].split()[0]]
+            stage["elapsed"] += s["elapsed"]
+            stage["rpc"] += s["rpc"]
+            stage["gas_used"] += s["gas_used"]
+            stage["calls"] += len(s["calls"])
+        return dict(stages)
+
+    def print(self):
+        print(f"{'step':<40}{'calls':>6}{'gas':>12}{'rpc':>6}{'elapsed':>10}")
+        for s in self.steps:
+            print(f"{s['step']:<40}{len(s['calls']):>6}{s['gas_used']:>12}{s['rpc']:>6}{s['elapsed']:>9.3f}s")
+            for c in s["calls"]:
+                print(f"    {c['contract'] or c['to']}.{c['function']}  gas: {c['gas_used']}  status: {c['status']}")
+
+        totals = self.totals()
+        print(f"total: {totals['calls']} calls, {totals['gas_used']} gas, {totals['rpc']} rpc requests")
+
+    def save(self, directory=REPORTS_DIR):
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{self.name}-{int(time.time())}.json")
+        with open(path, "w") as f:
+            json.dump({"name": self.name, "block": web3.eth.block_number, "steps": self.steps, "totals": self.totals()}, f, indent=4)
+        return path
+
+
+def save_benchmark(name, results, directory=REPORTS_DIR):
+    """Writes benchmark results tagged with the current commit, one file per commit."""
+    try:
+        commit = subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = "unknown"
+
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"benchmark-{name}-{commit}.json")
+    with open(path, "w") as f:
+        json.dump({"name": name, "commit": commit, "timestamp": int(time.time()), "results": results}, f, indent=4)
+    return path
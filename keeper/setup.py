@@ -0,0 +1,10 @@
+from setuptools import find_packages, setup
+
+setup(
+    name="auxo-keeper",
+    version="0.1.0",
+    description="Keeper modules shared by the vault and strategy brownie projects",
+    packages=find_packages(),
+    python_requires=">=3.8",
+    install_requires=["eth-brownie>=1.17.1,<2.0.0", "numpy"],
+)
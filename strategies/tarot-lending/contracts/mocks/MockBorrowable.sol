@@ -0,0 +1,76 @@
+// SPDX-License-Identifier: UNLICENSED
+pragma solidity ^0.8.10;
+
+import {ERC20} from "@openzeppelin/contracts/token/ERC20/ERC20.sol";
+import {IERC20} from "@openzeppelin/contracts/token/ERC20/IERC20.sol";
+
+/// @dev Exposes the Tarot borrowable rate-model state with plain setters.
+/// @dev `accrueInterest` is a no-op so that the state read off-chain is exactly
+///      the state `BorrowableHelpers` computes rates on.
+/// @dev Pool tokens follow Tarot's transfer-then-call flow: `mint` credits the
+///      underlying sent since the last sync, `redeem` burns the pool tokens sent to it.
+contract MockBorrowable is ERC20 {
+    uint256 public constant KINK_MULTIPLIER = 5;
+
+    address public underlying;
+
+    uint256 public totalBorrows;
+    uint256 public totalBalance;
+    uint256 public kinkUtilizationRate;
+    uint256 public kinkBorrowRate;
+    uint256 public reserveFactor;
+    uint256 public exchangeRateLast = 1e18;
+
+    /// @dev Underlying held after the last mint/redeem.
+    uint256 internal cash;
+
+    constructor() ERC20("Mock Borrowable", "bMCK") {}
+
+    function setUnderlying(address underlying_) external {
+        underlying = underlying_;
+    }
+
+    function setState(
+        uint256 totalBorrows_,
+        uint256 totalBalance_,
+        uint256 kinkUtilizationRate_,
+        uint256 kinkBorrowRate_,
+        uint256 reserveFactor_
+    ) external {
+        totalBorrows = totalBorrows_;
+        totalBalance = totalBalance_;
+        kinkUtilizationRate = kinkUtilizationRate_;
+        kinkBorrowRate = kinkBorrowRate_;
+        reserveFactor = reserveFactor_;
+    }
+
+    function accrueInterest() external {}
+
+    function exchangeRate() external view returns (uint256) {
+        return exchangeRateLast;
+    }
+
+    function mint(address minter) external returns (uint256 mintTokens) {
+        uint256 balance = IERC20(underlying).balanceOf(address(this));
+        uint256 mintAmount = balance - cash;
+
+        mintTokens = (mintAmount * 1e18) / exchangeRateLast;
+        require(mintTokens > 0, "MockBorrowable: MINT_AMOUNT_ZERO");
+
+        _mint(minter, mintTokens);
+        totalBalance += mintAmount;
+        cash = balance;
+    }
+
+    function redeem(address redeemer) external returns (uint256 redeemAmount) {
+        uint256 redeemTokens = balanceOf(address(this));
+
+        redeemAmount = (redeemTokens * exchangeRateLast) / 1e18;
+        require(redeemAmount > 0, "MockBorrowable: REDEEM_AMOUNT_ZERO");
+
+        _burn(address(this), redeemTokens);
+        totalBalance -= redeemAmount;
+        cash -= redeemAmount;
+        IERC20(underlying).transfer(redeemer, redeemAmount);
+    }
+}
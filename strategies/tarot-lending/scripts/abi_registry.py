@@ -0,0 +1,28 @@
+"""Keeper entry points of the local ABI registry, see `auxo_keeper.abi_registry`.
+
+    brownie run scripts/abi_registry refresh    # re-seed and re-resolve every address
+    brownie run scripts/abi_registry benchmark  # startup time, registry vs explorer
+"""
+from auxo_keeper import abi_registry
+from auxo_keeper.abi_registry import REGISTRY_PATH
+
+# Artifacts of this project, the other strategies and the vaults.
+BUILD_DIRS = ['build/contracts', '../*/build/contracts', '../../vaults/build/contracts']
+
+class ContractRegistry(abi_registry.ContractRegistry):
+    def __init__(self, path=REGISTRY_PATH, build_dirs=BUILD_DIRS):
+        super().__init__(path, build_dirs)
+
+def keeper_addresses():
+    from scripts.rebalance import strategies
+
+    return [item['strategy'] for item in strategies]
+
+def refresh():
+    abi_registry.refresh(ContractRegistry(), keeper_addresses())
+
+def benchmark():
+    abi_registry.benchmark(ContractRegistry, keeper_addresses())
+
+def main():
+    refresh()
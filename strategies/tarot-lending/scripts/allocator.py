@@ -0,0 +1,111 @@
+"""Water-filling allocation of a strategy's funds across Tarot borrowables.
+
+The strategy earns `x_i * supplyRate_i(x_i)` on each borrowable. Funds are split
+into `steps` equal chunks and every chunk goes where its marginal return is the
+highest, which equalises marginal supply rates across the borrowables we end up
+in. All return curves are evaluated in one float64 pass of the kink model, so a
+100 borrowables problem takes a few milliseconds.
+"""
+from dataclasses import dataclass, replace
+from typing import Tuple
+
+import numpy as np
+
+from scripts.kink import next_supply_rate
+
+# Mirrors `TarotLenderStrategy.ALLOCATION_PRECISION`.
+ALLOCATION_PRECISION = 10**18
+
+STEPS = 1000
+
+
+@dataclass(frozen=True)
+class Allocation:
+    borrowables: Tuple[str, ...]
+    weights: Tuple[int, ...]
+    amounts: Tuple[int, ...]
+    supply_rate: float
+
+    def calldata(self):
+        """`BorrowableAllocation[]` argument for `setAllocations`."""
+        return [(b, w) for b, w in zip(self.borrowables, self.weights)]
+
+
+def _without_position(snapshot):
+    # Take our own funds out of the pools so every borrowable starts from zero.
+    state = snapshot.state
+    total_balance = np.maximum(state.total_balance - snapshot.strategy_balance, 0)
+    return replace(state, total_balance=total_balance)
+
+
+def _to_weights(counts, steps):
+    weights = counts.astype(object) * ALLOCATION_PRECISION // steps
+    # hand rounding dust to the largest allocation so weights add up to exactly 100%
+    weights[np.argmax(counts)] += ALLOCATION_PRECISION - weights.sum()
+    return weights
+
+
+def blended_rate(state, amounts):
+    amounts = np.asarray(amounts, dtype=np.float64)
+    total = amounts.sum()
+    if total == 0:
+        return 0.0
+    supply, _, _ = next_supply_rate(state.astype(np.float64), amounts)
+    return float((supply * amounts).sum() / total)
+
+
+def current_rate(snapshot):
+    """Blended supply rate of the strategy's position as it is now."""
+    supply, _, _ = next_supply_rate(snapshot.state.astype(np.float64))
+    balance = snapshot.strategy_balance.astype(np.float64)
+    return float((supply * balance).sum() / balance.sum()) if balance.sum() else 0.0
+
+
+def optimize(snapshot, total=None, steps=STEPS):
+    """Splits `total` (defaults to the strategy's `estimatedUnderlying`) across the snapshot's borrowables."""
+    total = snapshot.strategy_underlying if total is None else total
+    if not total or not len(snapshot):
+        raise ValueError("optimize: nothing to allocate")
+
+    state = _without_position(snapshot)
+    grid = np.arange(steps + 1, dtype=np.float64) * (float(total) / steps)
+
+    supply, _, _ = next_supply_rate(state.astype(np.float64), grid[None, :])
+    gains = np.diff(supply * grid, axis=1)
+
+    # kink curves are concave where it matters, flatten the rest so each row has
+    # non-increasing marginal gains and picking the best chunks stays a prefix per row
+    gains = np.minimum.accumulate(gains, axis=1)
+
+    best = np.argpartition(-gains.ravel(), steps - 1)[:steps]
+    counts = np.bincount(best // steps, minlength=len(snapshot))
+
+    weights = _to_weights(counts, steps)
+    held = np.flatnonzero(weights)
+    amounts = [int(total) * int(weights[i]) // ALLOCATION_PRECISION for i in held]
+
+    return Allocation(
+        borrowables=tuple(snapshot.borrowables[i] for i in held),
+        weights=tuple(int(weights[i]) for i in held),
+        amounts=tuple(amounts),
+        supply_rate=blended_rate(state.take(held), amounts),
+    )
+
+
+def single_best(snapshot, total=None):
+    """The historical approach: everything into the borrowable with the best next supply rate."""
+    total = snapshot.strategy_underlying if total is None else total
+    state = _without_position(snapshot)
+
+    best, best_rate = 0, -1
+    for i in range(len(snapshot)):
+        rate = next_supply_rate(state.take([i]), total)[0][0]
+        if rate > best_rate:
+            best, best_rate = i, rate
+
+    return Allocation(
+        borrowables=(snapshot.borrowables[best],),
+        weights=(ALLOCATION_PRECISION,),
+        amounts=(int(total),),
+        supply_rate=float(best_rate),
+    )
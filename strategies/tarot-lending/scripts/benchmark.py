@@ -0,0 +1,91 @@
+"""Rebalance keeper benchmark against a fleet of mock borrowables on a local chain.
+
+For every fleet size a strategy is deployed with all of its funds in the first
+borrowable, then `compute_best` and `apply_best` run against the fleet exactly
+as in `rebalance.py`. RPC requests, gas and wall time are recorded per stage
+and written to `reports/benchmark-rebalance-<commit>.json`.
+
+    brownie run scripts/benchmark                   # default fleet sizes
+    brownie run scripts/benchmark main 10 50 200    # custom fleet sizes
+"""
+import os
+import tempfile
+from types import SimpleNamespace
+
+from auxo_keeper.multisend import CallRecorder
+from auxo_keeper.simulation import CostReport, save_benchmark
+from brownie import MockBorrowable, MockToken, TarotLenderStrategy, accounts, chain, multicall
+
+import scripts.rebalance as rebalance
+from scripts.abi_registry import ContractRegistry
+from scripts.allocator import ALLOCATION_PRECISION
+from scripts.benchmark_allocator import synthetic_snapshot
+from scripts.subgraph import BorrowablesRegistry
+
+SIZES = [15, 50, 100]
+STRATEGY_FUNDS = 250_000 * 10**18
+
+# `MockBorrowable.setState` arguments, the kink multiplier is a constant
+STATE_FIELDS = ["total_borrows", "total_balance", "kink_utilization_rate", "kink_borrow_rate", "reserve_factor"]
+
+
+def deploy_fleet(n, deployer):
+    token = deployer.deploy(MockToken, "Mock Token", "MCK")
+    state = synthetic_snapshot(n, seed=n).state
+
+    borrowables = []
+    for i in range(n):
+        borrowable = deployer.deploy(MockBorrowable)
+        borrowable.setUnderlying(token)
+        borrowable.setState(*(int(getattr(state, f)[i]) for f in STATE_FIELDS))
+        borrowables.append(borrowable)
+
+    # the deployer stands in for the vault and the manager
+    strategy = deployer.deploy(TarotLenderStrategy)
+    strategy.initialize(token, deployer, deployer, deployer, [(borrowables[0], ALLOCATION_PRECISION)])
+
+    token.mint(deployer, STRATEGY_FUNDS)
+    token.approve(strategy, STRATEGY_FUNDS)
+    strategy.deposit(STRATEGY_FUNDS)
+    strategy.depositUnderlying(STRATEGY_FUNDS)
+
+    return token, strategy, borrowables
+
+
+def run(n, deployer, directory):
+    token, strategy, borrowables = deploy_fleet(n, deployer)
+
+    # keep the benchmark away from the subgraph and the pinned registry
+    registry = BorrowablesRegistry(cache_dir=directory)
+    registry._write(token.address, [b.address.lower() for b in borrowables])
+    contracts = ContractRegistry(os.path.join(directory, "registry.json"))
+
+    report = CostReport(f"rebalance-{n}")
+    _, plan = rebalance.compute_best(strategy.address, token.address, registry, contracts, chain.height, report)
+
+    with report.step("apply"):
+        rebalance.apply_best(*plan, SimpleNamespace(account=deployer), CallRecorder())
+
+    return {
+        "borrowables": n,
+        "stages": report.by_stage(),
+        "totals": report.totals(),
+    }
+
+
+def main(*sizes):
+    sizes = [int(s) for s in sizes] or SIZES
+    deployer = accounts[0]
+    multicall.deploy({"from": deployer})
+
+    results = []
+    for n in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            results.append(run(n, deployer, directory))
+
+    print(f"{'borrowables':>11} {'stage':<10}{'elapsed':>12}{'rpc':>6}{'gas':>12}")
+    for r in results:
+        for name, stage in r["stages"].items():
+            print(f"{r['borrowables']:>11} {name:<10}{stage['elapsed'] * 1e3:>10.2f}ms{stage['rpc']:>6}{stage['gas_used']:>12}")
+
+    print(f"results written to {save_benchmark('rebalance', results)}")
@@ -0,0 +1,49 @@
+import random
+import timeit
+
+import numpy as np
+
+from scripts.allocator import optimize, single_best
+from scripts.kink import BorrowableState
+from scripts.snapshot import BorrowableSnapshot
+
+SIZES = [15, 30, 50, 100]
+REPEATS = 20
+
+
+def synthetic_snapshot(n, seed=0):
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(n):
+        total_balance = rng.randint(10**21, 10**24)
+        total_borrows = int(total_balance * rng.uniform(0.2, 4.0))
+        kink_ur = rng.choice([70, 75, 80]) * 10**16
+        rows.append((total_borrows, total_balance, kink_ur, rng.randint(10**9, 10**10), 5, 10**17))
+
+    return BorrowableSnapshot(
+        block_number=0,
+        borrowables=tuple(f"0x{i:040x}" for i in range(n)),
+        state=BorrowableState.from_rows(rows),
+        exchange_rate=np.full(n, 10**18, dtype=object),
+        strategy_balance=np.zeros(n, dtype=object),
+        strategy_underlying=250_000 * 10**18,
+    )
+
+
+def best_of(fn):
+    return min(timeit.repeat(fn, number=1, repeat=REPEATS)) * 1e3
+
+
+def main():
+    print(f"{'borrowables':>11} {'optimize':>10} {'brute force':>12} {'rate gain':>10} {'used':>5}")
+
+    for n in SIZES:
+        snapshot = synthetic_snapshot(n)
+
+        allocation = optimize(snapshot)
+        baseline = single_best(snapshot)
+
+        print(
+            f"{n:>11} {best_of(lambda: optimize(snapshot)):>8.2f}ms {best_of(lambda: single_best(snapshot)):>10.2f}ms "
+            f"{allocation.supply_rate / baseline.supply_rate - 1:>9.2%} {len(allocation.borrowables):>5}"
+        )
@@ -0,0 +1,98 @@
+"""Off-chain port of the Tarot kink interest rate model used by `BorrowableHelpers`.
+
+Every function works on whole arrays: the first axis is the borrowable axis and
+deposit/withdraw amounts broadcast against it, so `amounts[None, :]` evaluates
+every borrowable against every amount in one go. With `dtype=object` columns
+(the default) results match the contract bit for bit; `float64` columns trade
+exactness for speed when scanning large grids.
+"""
+from dataclasses import dataclass, fields
+
+import numpy as np
+
+RATE_SCALE = 10**18
+UINT48 = 2**48
+
+
+@dataclass(frozen=True)
+class BorrowableState:
+    total_borrows: np.ndarray
+    total_balance: np.ndarray
+    kink_utilization_rate: np.ndarray
+    kink_borrow_rate: np.ndarray
+    kink_multiplier: np.ndarray
+    reserve_factor: np.ndarray
+
+    @classmethod
+    def from_rows(cls, rows, dtype=object):
+        columns = list(zip(*rows)) if rows else [()] * len(fields(cls))
+        return cls(*(np.array([int(v) for v in c], dtype=dtype) for c in columns))
+
+    def astype(self, dtype):
+        return type(self)(*(getattr(self, f.name).astype(dtype) for f in fields(self)))
+
+    def take(self, index):
+        return type(self)(*(getattr(self, f.name)[index] for f in fields(self)))
+
+    def __len__(self):
+        return len(self.total_borrows)
+
+
+def _column(values, ndim):
+    return values.reshape(values.shape + (1,) * (ndim - 1))
+
+
+def _exact(values):
+    return values.dtype == object
+
+
+def _div(x, y):
+    # Solidity `div` on unsigned integers, zero divisors are masked by the caller.
+    # The float path skips flooring, which is where most of its time would go.
+    y = np.where(y == 0, 1, y) if np.ndim(y) else y
+    return x // y if _exact(x) else x / y
+
+
+def next_borrow_rate(state, deposit=0, withdraw=0):
+    """Returns `(borrow_rate, utilization_rate)` like `getNextBorrowRate`."""
+    deposit = np.asarray(deposit, dtype=state.total_borrows.dtype)
+    withdraw = np.asarray(withdraw, dtype=state.total_borrows.dtype)
+    if np.any((deposit != 0) & (withdraw != 0)):
+        raise ValueError("BH: INVLD_DELTA")
+
+    ndim = max(1, deposit.ndim, withdraw.ndim)
+    total_borrows = _column(state.total_borrows, ndim)
+    kink_ur = _column(state.kink_utilization_rate, ndim)
+    kink_br = _column(state.kink_borrow_rate, ndim)
+    multiplier = _column(state.kink_multiplier, ndim)
+
+    next_balance = _column(state.total_balance, ndim) + total_borrows + deposit - withdraw
+    if np.any(next_balance < 0):
+        raise ValueError("SafeMath: subtraction overflow")
+
+    utilization = np.where(next_balance == 0, 0, _div(total_borrows * RATE_SCALE, next_balance))
+
+    under_kink = utilization <= kink_ur
+    below = _div(kink_br * utilization, kink_ur)
+
+    # over-kink values are discarded where `under_kink`, clamp so they stay non-negative
+    over_utilization = _div(np.maximum(utilization - kink_ur, 0) * RATE_SCALE, RATE_SCALE - kink_ur)
+    above = _div(((multiplier - 1) * over_utilization + RATE_SCALE) * kink_br, RATE_SCALE)
+
+    borrow_rate = np.where(under_kink, below, above)
+    if _exact(borrow_rate):
+        borrow_rate = borrow_rate % UINT48
+    return borrow_rate, utilization
+
+
+def next_supply_rate(state, deposit=0, withdraw=0):
+    """Returns `(supply_rate, borrow_rate, utilization_rate)` like `getNextSupplyRate`."""
+    borrow_rate, utilization = next_borrow_rate(state, deposit, withdraw)
+    reserve_factor = _column(state.reserve_factor, borrow_rate.ndim)
+
+    supply_rate = _div(_div(borrow_rate * utilization, RATE_SCALE) * (RATE_SCALE - reserve_factor), RATE_SCALE)
+    return supply_rate, borrow_rate, utilization
+
+
+def current_supply_rate(state):
+    return next_supply_rate(state, 0, 0)
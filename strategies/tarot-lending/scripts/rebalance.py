@@ -1,9 +1,20 @@
 from ape_safe import ApeSafe
-from brownie import Contract, BorrowableHelpers, accounts
+from auxo_keeper.multisend import CallRecorder, build_multisends, pack, post_multisends
+from auxo_keeper.rate_store import DATA_DIR, RateStore
+from auxo_keeper.simulation import CostReport
+from brownie import web3
 
-import json
 import click
-import requests
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+
+from scripts.abi_registry import ContractRegistry
+from scripts.allocator import current_rate, optimize
+from scripts.kink import RATE_SCALE, current_supply_rate
+from scripts.snapshot import take_snapshot
+from scripts.subgraph import BorrowablesRegistry
+from scripts.timing import StageTimer
 
 strategies = [
     { # wftm
@@ -20,51 +31,121 @@ strategies = [
     }
 ]
 
-def do_query(underlying):
-    query = f'query {{ borrowables(where: {{underlying: "{underlying}"}}) {{id}} }}'
-    api = "https://api.thegraph.com/subgraphs/name/tarot-finance/tarot"
-    response = requests.post(api, json={"query": query}).json()
-    return response['data']['borrowables']
-
-def query(underlying):
-    borrowables = do_query(underlying)
-    json.dump(borrowables, open(f'scripts/borrowables/borrowables-{underlying}.json', 'w+'), indent=4)
-
-def compute_best(strat_addr, underlying, safe):
-    account = accounts[0]
-    strat = Contract.from_explorer(strat_addr)
-    borrowables = json.load(open(f'scripts/borrowables/borrowables-{underlying}.json', 'r+'))
-    borrowable_helper = BorrowableHelpers.deploy({'from': account})
-
-    current_borrowable = strat.allocations(0).dict()['bor']
-
-    best = -1
-    best_borr = ''
-    for borr in borrowables:
-        if borr["id"] != current_borrowable:
-            ret = borrowable_helper.getNextSupplyRate(borr["id"], strat.estimatedUnderlying(), 0).return_value.dict()
-        else:
-            ret = borrowable_helper.getCurrentSupplyRate(borr["id"]).return_value.dict()
-
-        if ret['supplyRate_'] > best:
-            best = ret['supplyRate_']
-            best_borr = borr["id"]
-        
-    print(f'best borrowable: {best_borr}')
-    print(f'supply rate: {best}')
-
-    if best_borr != current_borrowable:
-        strat.setAllocations([(best_borr, 1e18)], {'from': safe.account})
+# relative supply rate improvement required before reallocating
+MIN_RATE_GAIN = 0.01
+
+RATES_PATH = os.path.join(DATA_DIR, 'borrowables')
+RATE_COLUMNS = ('supply_rate', 'borrow_rate', 'utilization')
+
+def stage_label(strat_addr, underlying):
+    return f'{strat_addr[:10]} ({underlying[:8]})'
+
+def record_rates(snapshots, path=RATES_PATH):
+    # the history is best effort, it never fails a run that has already posted
+    try:
+        rates = RateStore(path, RATE_COLUMNS)
+        for snapshot in snapshots:
+            supply, borrow, utilization = current_supply_rate(snapshot.state)
+            timestamp = web3.eth.get_block(snapshot.block_number).timestamp
+
+            # per second rates and utilization as fractions
+            rates.append(
+                snapshot.block_number,
+                timestamp,
+                snapshot.borrowables,
+                supply_rate=supply.astype(float) / RATE_SCALE,
+                borrow_rate=borrow.astype(float) / RATE_SCALE,
+                utilization=utilization.astype(float) / RATE_SCALE,
+            )
+    except (OSError, ValueError) as e:
+        print(f'rates not recorded: {e}')
+
+def compute_best(strat_addr, underlying, registry, contracts, block_number=None, timer=None):
+    timer = timer or StageTimer()
+    label = stage_label(strat_addr, underlying)
+
+    with timer.stage(label, 'sync'):
+        borrowables = registry.sync(underlying)
+
+    with timer.stage(label, 'read'):
+        strat = contracts.contract(strat_addr, 'TarotLenderStrategy')
+        snapshot = take_snapshot(borrowables, strat, block_number)
+
+    if not snapshot.strategy_underlying:
+        return snapshot, (strat, None, 0)
+
+    with timer.stage(label, 'evaluate'):
+        current = current_rate(snapshot)
+        allocation = optimize(snapshot)
+
+    return snapshot, (strat, allocation, current)
+
+def apply_best(strat, allocation, current, safe, recorder):
+    if allocation is None:
+        print(f'nothing to allocate for {strat.address}')
+        return False
+
+    for borr, amount in zip(allocation.borrowables, allocation.amounts):
+        print(f'{borr}: {amount}')
+    print(f'supply rate: {current} -> {allocation.supply_rate}')
+
+    # moving funds costs gas and a redeem/mint round trip, skip marginal gains
+    if allocation.supply_rate > current * (1 + MIN_RATE_GAIN):
+        recorder.send(strat.address, strat.setAllocations, allocation.calldata(), {'from': safe.account})
 
     return True
 
+def rebalance_all(safe, registry, contracts, timer, report=None):
+    step = report.step if report else nullcontext
+
+    # every strategy decides on the same block
+    block_number = web3.eth.block_number
+
+    def plan_strategy(item):
+        with step(f"plan {stage_label(item['strategy'], item['underlying'])}"):
+            return compute_best(item['strategy'], item['underlying'], registry, contracts, block_number, timer)
+
+    # sync, read and evaluate run concurrently, wall clock follows the slowest strategy
+    with ThreadPoolExecutor(max_workers=len(strategies)) as executor:
+        plans = list(executor.map(plan_strategy, strategies))
+
+    # transactions are recorded for the multisend, keep them serialized and in order
+    recorder = CallRecorder()
+    for item, (_, plan) in zip(strategies, plans):
+        label = stage_label(item['strategy'], item['underlying'])
+        with timer.stage(label, 'apply'), step(f'apply {label}'):
+            apply_best(*plan, safe, recorder)
+
+    return recorder.calls, [snapshot for snapshot, _ in plans]
+
 def main():
     safe = ApeSafe('0x309DCdBE77d9D73805e96662503B08FEe229597A')
+    registry = BorrowablesRegistry()
+    contracts = ContractRegistry()
+    timer = StageTimer()
+
+    calls, snapshots = rebalance_all(safe, registry, contracts, timer)
+    post_multisends(safe, pack(calls))
+
+    # only rates of posted runs go to the history, dry runs on a fork never do
+    record_rates(snapshots)
+
+    timer.report()
+
+def simulate():
+    """Dry run on a fork: runs the plan, previews the multisends and never posts them."""
+    safe = ApeSafe('0x309DCdBE77d9D73805e96662503B08FEe229597A')
+    registry = BorrowablesRegistry()
+    contracts = ContractRegistry()
+    timer = StageTimer()
+    report = CostReport('rebalance')
+
+    calls, _ = rebalance_all(safe, registry, contracts, timer, report)
 
-    for item in strategies:
-        query(item['underlying'])
-        compute_best(item['strategy'], item['underlying'], safe)
+    # previews after the first one run on top of it, like the posted multisends would
+    for i, safe_tx in enumerate(build_multisends(safe, pack(calls))):
+        report.preview_multisend(safe, safe_tx, label=f'multisend {i}', reset=i == 0)
 
-    safe_tx = safe.multisend_from_receipts()
-    safe.sign_with_frame(safe_tx)
-    safe.post_transaction(safe_tx)
+    report.print()
+    print(f'report written to {report.save()}')
+    timer.report()
@@ -0,0 +1,91 @@
+"""Block-pinned snapshot of Tarot borrowable state read through multicall.
+
+All reads for every borrowable (and the strategy's position in each of them)
+are packed into `tryAggregate` batches executed at one block, so a full
+rebalance read costs a handful of `eth_call`s and every decision taken from
+the same snapshot sees consistent state.
+"""
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+from brownie import interface, multicall, web3
+
+from scripts.kink import BorrowableState
+
+# Calls aggregated into a single `eth_call`, keeps payloads under provider limits.
+BATCH_SIZE = 240
+
+# Reads issued per borrowable, the last one is the strategy position.
+READS_PER_BORROWABLE = 8
+
+
+@dataclass(frozen=True)
+class BorrowableSnapshot:
+    block_number: int
+    borrowables: Tuple[str, ...]
+    state: BorrowableState
+    exchange_rate: np.ndarray
+    strategy_balance: np.ndarray
+    strategy_underlying: Optional[int] = None
+
+    def index(self, borrowable):
+        return self.borrowables.index(borrowable.lower())
+
+    def __len__(self):
+        return len(self.borrowables)
+
+
+def _read(borrowable, strategy):
+    return (
+        borrowable.totalBorrows(),
+        borrowable.totalBalance(),
+        borrowable.kinkUtilizationRate(),
+        borrowable.kinkBorrowRate(),
+        borrowable.KINK_MULTIPLIER(),
+        borrowable.reserveFactor(),
+        borrowable.exchangeRateLast(),
+        strategy.borrowableBalance(borrowable) if strategy is not None else 0,
+    )
+
+
+def _resolve(value, what):
+    # failed calls in a `tryAggregate` batch resolve to None
+    try:
+        return int(value)
+    except TypeError:
+        raise ValueError(f"snapshot: call reverted ({what})") from None
+
+
+def take_snapshot(borrowables, strategy=None, block_number=None, batch_size=BATCH_SIZE, multicall_address=None):
+    """Reads every borrowable (and `strategy`'s position in it) at `block_number`.
+
+    `exchange_rate` is `exchangeRateLast`, the same rate `TarotLenderStrategy`
+    uses to value its position. Rate-model inputs are read as stored, i.e. before
+    the interest accrual `BorrowableHelpers` triggers.
+    """
+    block_number = block_number if block_number is not None else web3.eth.block_number
+    borrowables = tuple(b.lower() for b in borrowables)
+    contracts = [interface.IBorrowable(b) for b in borrowables]
+    per_batch = max(1, batch_size // READS_PER_BORROWABLE)
+
+    with multicall(address=multicall_address, block_identifier=block_number):
+        pending = []
+        for i, b in enumerate(contracts):
+            pending.append(_read(b, strategy))
+            if (i + 1) % per_batch == 0:
+                multicall.flush()
+
+        strategy_underlying = strategy.estimatedUnderlying() if strategy is not None else None
+
+    rows = [tuple(_resolve(v, borrowables[i]) for v in row) for i, row in enumerate(pending)]
+    columns = list(zip(*rows)) if rows else [()] * READS_PER_BORROWABLE
+
+    return BorrowableSnapshot(
+        block_number=block_number,
+        borrowables=borrowables,
+        state=BorrowableState.from_rows([r[:6] for r in rows]),
+        exchange_rate=np.array(columns[6], dtype=object),
+        strategy_balance=np.array(columns[7], dtype=object),
+        strategy_underlying=_resolve(strategy_underlying, "estimatedUnderlying") if strategy is not None else None,
+    )
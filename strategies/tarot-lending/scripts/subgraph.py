@@ -0,0 +1,123 @@
+"""Tarot borrowables registry synced from the subgraph into `scripts/borrowables/`.
+
+Borrowables are paged with an `id_gt` cursor so lists longer than a subgraph
+page are never truncated, every underlying is fetched concurrently over one
+pooled session, and each page is merged into the on-disk cache as it arrives.
+Cache files keep the historical `[{"id": ...}]` layout; their mtime is the sync
+time, so runs within `ttl` seconds do not touch the network at all.
+"""
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+SUBGRAPH_URL = "https://api.thegraph.com/subgraphs/name/tarot-finance/tarot"
+CACHE_DIR = "scripts/borrowables"
+
+# The Graph caps `first` at 1000.
+PAGE_SIZE = 1000
+CACHE_TTL = 6 * 60 * 60
+MAX_WORKERS = 8
+
+QUERY = """
+query borrowables($underlying: String!, $lastId: String!, $first: Int!) {
+    borrowables(first: $first, orderBy: id, orderDirection: asc, where: {underlying: $underlying, id_gt: $lastId}) {
+        id
+    }
+}
+"""
+
+
+class BorrowablesRegistry:
+    def __init__(
+        self,
+        url=SUBGRAPH_URL,
+        cache_dir=CACHE_DIR,
+        ttl=CACHE_TTL,
+        page_size=PAGE_SIZE,
+        max_workers=MAX_WORKERS,
+    ):
+        self.url = url
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.page_size = page_size
+        self.max_workers = max_workers
+
+        retries = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 502, 503, 504], allowed_methods=None)
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers, max_retries=retries)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def path(self, underlying):
+        return os.path.join(self.cache_dir, f"borrowables-{underlying.lower()}.json")
+
+    def is_fresh(self, underlying):
+        try:
+            return time.time() - os.path.getmtime(self.path(underlying)) < self.ttl
+        except FileNotFoundError:
+            return False
+
+    def load(self, underlying):
+        try:
+            with open(self.path(underlying)) as f:
+                return [b["id"] for b in json.load(f)]
+        except FileNotFoundError:
+            return []
+
+    def pages(self, underlying):
+        last_id = ""
+        while True:
+            variables = {"underlying": underlying.lower(), "lastId": last_id, "first": self.page_size}
+            response = self.session.post(self.url, json={"query": QUERY, "variables": variables}, timeout=30)
+            response.raise_for_status()
+
+            body = response.json()
+            if body.get("errors"):
+                raise RuntimeError(f"subgraph: {body['errors']}")
+
+            page = [b["id"] for b in body["data"]["borrowables"]]
+            if page:
+                yield page
+            if len(page) < self.page_size:
+                return
+
+            last_id = page[-1]
+
+    def sync(self, underlying, force=False):
+        """Returns the borrowables of `underlying`, hitting the subgraph only when the cache is stale."""
+        if not force and self.is_fresh(underlying):
+            return self.load(underlying)
+
+        known = set(self.load(underlying))
+        for page in self.pages(underlying):
+            if not known.issuperset(page):
+                known.update(page)
+                self._write(underlying, known)
+
+        # nothing new still counts as a sync for the TTL
+        if os.path.exists(self.path(underlying)):
+            os.utime(self.path(underlying))
+        else:
+            self._write(underlying, known)
+
+        return sorted(known)
+
+    def sync_all(self, underlyings, force=False):
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = executor.map(lambda u: self.sync(u, force), underlyings)
+            return dict(zip(underlyings, results))
+
+    def _write(self, underlying, ids):
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        # write then rename so readers never see a half-written file
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump([{"id": i} for i in sorted(ids)], f, indent=4)
+        os.replace(tmp, self.path(underlying))
@@ -0,0 +1,36 @@
+"""Wall-clock timings of keeper stages, safe to record from worker threads."""
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+
+class StageTimer:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._timings = defaultdict(dict)
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, label, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self._timings[label][name] = self._timings[label].get(name, 0) + elapsed
+
+    def timings(self):
+        with self._lock:
+            return {label: dict(stages) for label, stages in self._timings.items()}
+
+    def report(self):
+        timings = self.timings()
+        stages = list(dict.fromkeys(name for stages in timings.values() for name in stages))
+
+        print(f"{'':<24}" + "".join(f"{name:>12}" for name in stages) + f"{'total':>12}")
+        for label, values in timings.items():
+            row = "".join(f"{values[name]:>11.3f}s" if name in values else f"{'-':>12}" for name in stages)
+            print(f"{label:<24}{row}{sum(values.values()):>11.3f}s")
+        print(f"wall clock: {time.perf_counter() - self._started:.3f}s")
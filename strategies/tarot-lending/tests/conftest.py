@@ -0,0 +1,34 @@
+import pytest
+
+from brownie import MockBorrowable, BorrowableHelpers, multicall
+
+
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
+
+@pytest.fixture(scope="session", autouse=True)
+def multicall_contract(accounts):
+    # deployed before any isolation snapshot so block-pinned reads can reach it
+    yield multicall.deploy({"from": accounts[0]})
+
+
+@pytest.fixture
+def deployer(accounts):
+    yield accounts[0]
+
+
+@pytest.fixture
+def helpers(deployer):
+    yield deployer.deploy(BorrowableHelpers)
+
+
+@pytest.fixture
+def create_borrowable(deployer):
+    def create_borrowable(total_borrows, total_balance, kink_ur, kink_br, reserve_factor):
+        borrowable = deployer.deploy(MockBorrowable)
+        borrowable.setState(total_borrows, total_balance, kink_ur, kink_br, reserve_factor)
+        return borrowable
+
+    yield create_borrowable
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from scripts.allocator import ALLOCATION_PRECISION, blended_rate, optimize, single_best
+from scripts.benchmark_allocator import synthetic_snapshot
+from scripts.kink import next_supply_rate
+
+
+@pytest.mark.parametrize("n", [1, 15, 100])
+def test_allocation_passes_check_allocations(n):
+    allocation = optimize(synthetic_snapshot(n, seed=n))
+
+    assert sum(allocation.weights) == ALLOCATION_PRECISION
+    assert all(w > 0 for w in allocation.weights)
+    assert len(set(allocation.borrowables)) == len(allocation.borrowables)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_allocation_beats_single_best(seed):
+    snapshot = synthetic_snapshot(30, seed=seed)
+
+    assert optimize(snapshot).supply_rate >= single_best(snapshot).supply_rate * (1 - 1e-9)
+
+
+def test_marginal_rates_are_equalised():
+    snapshot = synthetic_snapshot(50, seed=7)
+    allocation = optimize(snapshot, steps=2000)
+    state = snapshot.state.take([snapshot.index(b) for b in allocation.borrowables]).astype(np.float64)
+
+    # marginal return of one more step in each borrowable we allocated to
+    step = snapshot.strategy_underlying / 2000
+    amounts = np.array(allocation.amounts, dtype=np.float64)
+    now = next_supply_rate(state, amounts)[0] * amounts
+    more = next_supply_rate(state, amounts + step)[0] * (amounts + step)
+    marginal = (more - now) / step
+
+    assert marginal.max() / marginal.min() < 1.05
+
+
+def test_blended_rate_of_single_position():
+    snapshot = synthetic_snapshot(3)
+    allocation = single_best(snapshot)
+    index = snapshot.index(allocation.borrowables[0])
+
+    rate = blended_rate(snapshot.state.take([index]), allocation.amounts)
+    assert rate == pytest.approx(allocation.supply_rate)
+
+
+def test_fails_nothing_to_allocate():
+    with pytest.raises(ValueError):
+        optimize(synthetic_snapshot(3), total=0)
@@ -0,0 +1,17 @@
+from scripts.benchmark import STRATEGY_FUNDS, deploy_fleet, run
+
+
+def test_fleet_strategy_holds_funds_in_first_borrowable(deployer):
+    token, strategy, borrowables = deploy_fleet(3, deployer)
+
+    assert strategy.borrowableBalance(borrowables[0]) == STRATEGY_FUNDS
+    assert strategy.estimatedUnderlying() == STRATEGY_FUNDS
+    assert token.balanceOf(borrowables[0]) == STRATEGY_FUNDS
+
+
+def test_records_every_stage(deployer, tmp_path):
+    result = run(5, deployer, str(tmp_path))
+
+    assert list(result["stages"]) == ["sync", "read", "evaluate", "apply"]
+    assert result["stages"]["read"]["rpc"] > 0
+    assert result["totals"]["gas_used"] == result["stages"]["apply"]["gas_used"]
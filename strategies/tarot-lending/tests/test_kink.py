@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+import brownie
+
+from scripts.kink import BorrowableState, next_borrow_rate, next_supply_rate
+
+STATES = [
+    # (totalBorrows, totalBalance, kinkUtilizationRate, kinkBorrowRate, reserveFactor)
+    (400_000 * 10**18, 600_000 * 10**18, 7 * 10**17, 3_170_979_198, 10**17),
+    (950_000 * 10**18, 50_000 * 10**18, 8 * 10**17, 6_341_958_396, 10**17),
+    (123_456_789, 987_654_321, 75 * 10**16, 1_585_489_599, 15 * 10**16),
+    (10**18, 0, 7 * 10**17, 3_170_979_198, 0),
+    (0, 0, 7 * 10**17, 3_170_979_198, 10**17),
+]
+
+AMOUNTS = [0, 1, 10**6, 10**18, 250_000 * 10**18]
+
+
+def snapshot(borrowables):
+    return BorrowableState.from_rows(
+        [
+            (
+                b.totalBorrows(),
+                b.totalBalance(),
+                b.kinkUtilizationRate(),
+                b.kinkBorrowRate(),
+                b.KINK_MULTIPLIER(),
+                b.reserveFactor(),
+            )
+            for b in borrowables
+        ]
+    )
+
+
+def test_next_supply_rate_matches_contract(helpers, create_borrowable):
+    borrowables = [create_borrowable(*s) for s in STATES]
+    state = snapshot(borrowables)
+
+    supply, borrow, utilization = next_supply_rate(state, np.array(AMOUNTS, dtype=object)[None, :])
+    assert supply.shape == (len(STATES), len(AMOUNTS))
+
+    for i, b in enumerate(borrowables):
+        for j, amount in enumerate(AMOUNTS):
+            expected = helpers.getNextSupplyRate.call(b, amount, 0)
+            assert (supply[i, j], borrow[i, j], utilization[i, j]) == tuple(expected)
+
+
+def test_withdraw_matches_contract(helpers, create_borrowable):
+    borrowables = [create_borrowable(*s) for s in STATES[:3]]
+    state = snapshot(borrowables)
+
+    withdraw = np.array([s[1] // 3 for s in STATES[:3]], dtype=object)
+    supply, borrow, utilization = next_supply_rate(state, 0, withdraw)
+
+    for i, b in enumerate(borrowables):
+        expected = helpers.getNextSupplyRate.call(b, 0, withdraw[i])
+        assert (supply[i], borrow[i], utilization[i]) == tuple(expected)
+
+
+def test_current_borrow_rate_matches_contract(helpers, create_borrowable):
+    borrowables = [create_borrowable(*s) for s in STATES]
+    borrow, utilization = next_borrow_rate(snapshot(borrowables))
+
+    for i, b in enumerate(borrowables):
+        assert (borrow[i], utilization[i]) == tuple(helpers.getCurrentBorrowRate.call(b))
+
+
+def test_fails_deposit_and_withdraw(helpers, create_borrowable):
+    borrowable = create_borrowable(*STATES[0])
+
+    with brownie.reverts("BH: INVLD_DELTA"):
+        helpers.getNextSupplyRate.call(borrowable, 1, 1)
+
+    with pytest.raises(ValueError, match="BH: INVLD_DELTA"):
+        next_supply_rate(snapshot([borrowable]), 1, 1)
+
+
+def test_float_path_is_close(create_borrowable):
+    state = snapshot([create_borrowable(*s) for s in STATES])
+    amounts = np.array(AMOUNTS, dtype=object)[None, :]
+
+    exact = next_supply_rate(state, amounts)[0].astype(float)
+    approx = next_supply_rate(state.astype(float), amounts.astype(float))[0]
+
+    assert np.allclose(exact, approx, rtol=1e-6, atol=1)
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+from auxo_keeper.rate_store import DAY, RateStore
+
+COLUMNS = ("supply_rate", "utilization")
+A = "0x00000000000000000000000000000000000000aa"
+B = "0x00000000000000000000000000000000000000bb"
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = RateStore(str(tmp_path / "rates"), COLUMNS)
+    for day in range(30):
+        store.append(day, day * DAY, [A, B], supply_rate=[day, 100 + day], utilization=[0.5, 0.9])
+    yield store
+
+
+def test_appends_rows_per_key(store):
+    assert len(store) == 60
+
+    times, values = store.series(A.upper(), "supply_rate")
+    assert list(times) == [day * DAY for day in range(30)]
+    assert list(values) == list(range(30))
+
+
+def test_reopens_existing_store(store):
+    reopened = RateStore(store.path, COLUMNS)
+
+    assert len(reopened) == 60
+    assert reopened.latest("supply_rate") == {A: 29.0, B: 129.0}
+
+
+def test_rejects_schema_change(store):
+    with pytest.raises(ValueError):
+        RateStore(store.path, ("supply_rate",))
+
+
+def test_rejects_out_of_order_rows(store):
+    with pytest.raises(ValueError):
+        store.append(0, 0, [A], supply_rate=[0], utilization=[0])
+
+
+def test_windowed_queries(store):
+    times, values = store.series(B, "supply_rate", start=10 * DAY, end=20 * DAY)
+    assert list(values) == list(range(110, 120))
+
+    times, means = store.rolling_mean(A, "supply_rate", 3 * DAY, start=10 * DAY)
+    assert times[0] == 10 * DAY
+    assert np.allclose(means, np.arange(10, 30) - 1)
+
+    assert np.allclose(store.percentiles(A, "supply_rate", [0, 50, 100], start=20 * DAY), [20, 24.5, 29])
+
+
+def test_ignores_interrupted_append(store):
+    # a crash between column writes leaves a partial row in the first columns only
+    with open(store._column_path("block"), "ab") as f:
+        f.write(np.uint64(99).tobytes())
+
+    assert len(store) == 60
+
+    store.append(30, 30 * DAY, [A], supply_rate=[30], utilization=[0.5])
+    assert len(store) == 61
+    assert store.latest("supply_rate")[A] == 30.0
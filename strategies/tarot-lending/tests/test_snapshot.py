@@ -0,0 +1,38 @@
+from brownie import chain
+
+from scripts.snapshot import take_snapshot
+
+
+def test_snapshot_matches_direct_reads(create_borrowable):
+    borrowables = [
+        create_borrowable(i * 10**18, (100 - i) * 10**18, 7 * 10**17, 3_170_979_198 + i, 10**17)
+        for i in range(1, 40)
+    ]
+
+    snapshot = take_snapshot([b.address for b in borrowables], batch_size=16)
+
+    assert len(snapshot) == len(borrowables)
+    assert snapshot.strategy_underlying is None
+
+    for i, b in enumerate(borrowables):
+        assert snapshot.index(b.address) == i
+        assert snapshot.state.total_borrows[i] == b.totalBorrows()
+        assert snapshot.state.total_balance[i] == b.totalBalance()
+        assert snapshot.state.kink_borrow_rate[i] == b.kinkBorrowRate()
+        assert snapshot.state.kink_multiplier[i] == b.KINK_MULTIPLIER()
+        assert snapshot.exchange_rate[i] == b.exchangeRateLast()
+        assert snapshot.strategy_balance[i] == 0
+
+
+def test_snapshot_is_pinned_to_block(create_borrowable):
+    borrowable = create_borrowable(10**18, 9 * 10**18, 7 * 10**17, 3_170_979_198, 10**17)
+    block_number = chain.height
+
+    borrowable.setState(5 * 10**18, 5 * 10**18, 7 * 10**17, 3_170_979_198, 10**17)
+
+    pinned = take_snapshot([borrowable.address], block_number=block_number)
+    latest = take_snapshot([borrowable.address])
+
+    assert pinned.block_number == block_number
+    assert pinned.state.total_borrows[0] == 10**18
+    assert latest.state.total_borrows[0] == 5 * 10**18
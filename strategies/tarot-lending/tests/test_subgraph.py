@@ -0,0 +1,109 @@
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from scripts.subgraph import BorrowablesRegistry
+
+BORROWABLES = {
+    "0xaaaa": [f"0x{i:040x}" for i in range(25)],
+    "0xbbbb": [f"0x{i:040x}" for i in range(100, 103)],
+    "0xcccc": [],
+}
+
+
+class StubSubgraph(BaseHTTPRequestHandler):
+    requests = []
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        variables = body["variables"]
+        self.requests.append(variables)
+
+        ids = sorted(i for i in BORROWABLES[variables["underlying"]] if i > variables["lastId"])
+        payload = json.dumps({"data": {"borrowables": [{"id": i} for i in ids[: variables["first"]]]}}).encode()
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def subgraph():
+    StubSubgraph.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubSubgraph)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield f"http://127.0.0.1:{server.server_address[1]}", StubSubgraph.requests
+
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def registry(subgraph, tmp_path):
+    url, _ = subgraph
+    yield BorrowablesRegistry(url=url, cache_dir=str(tmp_path), page_size=10)
+
+
+def test_sync_pages_past_page_size(registry, subgraph):
+    _, requests = subgraph
+
+    assert registry.sync("0xaaaa") == BORROWABLES["0xaaaa"]
+    assert [r["lastId"] for r in requests] == ["", BORROWABLES["0xaaaa"][9], BORROWABLES["0xaaaa"][19]]
+    assert registry.load("0xaaaa") == BORROWABLES["0xaaaa"]
+
+
+def test_sync_keeps_cache_layout(registry):
+    registry.sync("0xbbbb")
+
+    with open(registry.path("0xbbbb")) as f:
+        assert json.load(f) == [{"id": i} for i in BORROWABLES["0xbbbb"]]
+
+
+def test_fresh_cache_skips_network(registry, subgraph):
+    _, requests = subgraph
+
+    registry.sync("0xbbbb")
+    count = len(requests)
+
+    assert registry.sync("0xbbbb") == BORROWABLES["0xbbbb"]
+    assert len(requests) == count
+
+    registry.sync("0xbbbb", force=True)
+    assert len(requests) == count + 1
+
+
+def test_stale_cache_is_refreshed(registry, subgraph):
+    _, requests = subgraph
+
+    registry.sync("0xbbbb")
+    stale = os.path.getmtime(registry.path("0xbbbb")) - registry.ttl - 1
+    os.utime(registry.path("0xbbbb"), (stale, stale))
+
+    registry.sync("0xbbbb")
+    assert len(requests) == 2
+    assert registry.is_fresh("0xbbbb")
+
+
+def test_sync_merges_into_existing_cache(registry):
+    with open(registry.path("0xbbbb"), "w") as f:
+        json.dump([{"id": "0x" + "f" * 40}], f)
+
+    assert registry.sync("0xbbbb", force=True) == BORROWABLES["0xbbbb"] + ["0x" + "f" * 40]
+
+
+def test_sync_all_underlyings(registry):
+    result = registry.sync_all(list(BORROWABLES))
+
+    assert result == BORROWABLES
+    assert registry.load("0xcccc") == []
+    assert registry.is_fresh("0xcccc")
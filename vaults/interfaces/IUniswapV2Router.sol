@@ -0,0 +1,8 @@
+// SPDX-License-Identifier: AGPL-3.0-only
+pragma solidity ^0.8.10;
+
+/// @title IUniswapV2Router
+/// @notice Quote method of UniswapV2-like routers, used by the keeper to price gas in underlying.
+interface IUniswapV2Router {
+    function getAmountsOut(uint256 amountIn, address[] calldata path) external view returns (uint256[] memory amounts);
+}
@@ -0,0 +1,257 @@
+"""Batch-burn execution planner.
+
+`execBatchBurn` reverts unless `lastHarvest + harvestDelay` has passed and the
+pending round, `totalShares` at `exchangeRate()` with the burning fee included,
+fits in `totalFloat()`. The planner reads the round and the withdrawal queue
+at one block, computes the exact underlying the round needs at the rate it
+will execute at (no locked profit left by then) and covers the shortfall with
+the fewest transactions: a strategy whose float covers its part takes one
+`withdrawFromStrategy`, one that has to free invested funds first takes a
+`withdrawUnderlying` before it.
+
+    brownie run scripts/batch_burn --network ftm-main    # plan, record and post every pending round
+"""
+from dataclasses import dataclass
+from typing import List, Tuple
+
+from brownie import multicall, web3
+
+from scripts.fixed_point import WAD, fdiv, fmul
+from scripts.vault_snapshot import _resolve
+
+
+@dataclass(frozen=True)
+class QueuedStrategy:
+    address: str
+    trusted: bool
+    balance: int  # what the vault accounts for, the most `withdrawFromStrategy` can take
+    float: int  # underlying the strategy holds uninvested
+
+
+@dataclass(frozen=True)
+class BurnState:
+    block_number: int
+    timestamp: int
+    vault: str
+    base_unit: int
+    round: int
+    total_shares: int
+    total_supply: int
+    total_float: int
+    total_strategy_holdings: int
+    burning_fee_percent: int
+    last_harvest: int
+    harvest_delay: int
+    queue: Tuple[QueuedStrategy, ...]
+
+    @property
+    def executable_at(self):
+        return self.last_harvest + self.harvest_delay
+
+    @property
+    def exchange_rate(self):
+        """`exchangeRate()` once the locked profit is released, withdrawals do not move it."""
+        if self.total_supply == 0:
+            return self.base_unit
+        return fdiv(self.total_strategy_holdings + self.total_float, self.total_supply, self.base_unit)
+
+    @property
+    def required(self):
+        """Float `execBatchBurn` needs, the burning fee is paid out of it."""
+        return fmul(self.total_shares, self.exchange_rate, self.base_unit)
+
+    @property
+    def fees(self):
+        return fmul(self.required, self.burning_fee_percent, WAD)
+
+    @property
+    def shortfall(self):
+        return max(self.required - self.total_float, 0)
+
+
+@dataclass(frozen=True)
+class Withdrawal:
+    strategy: str
+    amount: int
+    underlying: int  # freed with `withdrawUnderlying` first, 0 when the strategy float covers `amount`
+
+    @property
+    def transactions(self):
+        return 2 if self.underlying else 1
+
+
+@dataclass
+class BurnPlan:
+    state: BurnState
+    withdrawals: List[Withdrawal]
+    reason: str
+
+    @property
+    def executable(self):
+        return self.reason == "execute"
+
+    @property
+    def transactions(self):
+        return sum(w.transactions for w in self.withdrawals) + self.executable
+
+
+def read_burn_states(vaults, registry, block_number=None):
+    """Reads the pending round and withdrawal queue of every vault at `block_number`."""
+    block_number = block_number if block_number is not None else web3.eth.block_number
+    timestamp = web3.eth.get_block(block_number).timestamp
+    contracts = [registry.contract(v, "Vault") for v in vaults]
+
+    with multicall(block_identifier=block_number):
+        reads = [
+            (
+                v.baseUnit(),
+                v.batchBurnRound(),
+                v.totalSupply(),
+                v.totalFloat(),
+                v.totalStrategyHoldings(),
+                v.burningFeePercent(),
+                v.lastHarvest(),
+                v.harvestDelay(),
+                v.getWithdrawalQueue(),
+            )
+            for v in contracts
+        ]
+
+    reads = [[_resolve(r, v.address) for r in vault_reads] for v, vault_reads in zip(contracts, reads)]
+    queues = [[registry.contract(s, "BaseStrategy") for s in r[-1]] for r in reads]
+
+    # the round and the strategies are only known after the first batch
+    with multicall(block_identifier=block_number):
+        rounds = [v.batchBurns(r[1]) for v, r in zip(contracts, reads)]
+        strategies = [[(v.getStrategyData(s), s.float()) for s in queue] for v, queue in zip(contracts, queues)]
+
+    states = []
+    for v, r, burn, queue, strategy_reads in zip(contracts, reads, rounds, queues, strategies):
+        base_unit, round_, total_supply, total_float, holdings, fee, last_harvest, harvest_delay, _ = r
+        total_shares, _ = _resolve(burn, v.address)
+
+        queued = []
+        for s, (data, strategy_float) in zip(queue, strategy_reads):
+            trusted, balance = _resolve(data, s.address)
+            strategy_float = int(_resolve(strategy_float, s.address))
+            queued.append(QueuedStrategy(s.address, bool(trusted), int(balance), strategy_float))
+
+        states.append(
+            BurnState(
+                block_number=block_number,
+                timestamp=timestamp,
+                vault=v.address,
+                base_unit=int(base_unit),
+                round=int(round_),
+                total_shares=int(total_shares),
+                total_supply=int(total_supply),
+                total_float=int(total_float),
+                total_strategy_holdings=int(holdings),
+                burning_fee_percent=int(fee),
+                last_harvest=int(last_harvest),
+                harvest_delay=int(harvest_delay),
+                queue=tuple(queued),
+            )
+        )
+
+    return states
+
+
+def plan_withdrawals(shortfall, queue):
+    """Fewest-transaction withdrawals covering `shortfall`, in withdrawal queue order.
+
+    Every strategy is skipped, withdrawn from its float (1 transaction) or freed
+    and withdrawn (2 transactions). A knapsack over (transactions, freed
+    strategies) finds the cheapest choice that covers the shortfall, preferring
+    fewer `withdrawUnderlying` calls, then earlier strategies.
+    """
+    if shortfall <= 0:
+        return []
+
+    options = []
+    for s in queue:
+        if not s.trusted or s.balance == 0:
+            continue
+        options.append((s, [(1, 0, min(s.float, s.balance)), (2, 1, s.balance)]))
+
+    # best[(transactions, freed)] is the most underlying they can withdraw, with the choices that do it
+    best = {(0, 0): (0, [])}
+    for s, choices in options:
+        step = dict(best)
+        for (cost, freed), (covered, picked) in best.items():
+            for extra, frees, amount in choices:
+                key = (cost + extra, freed + frees)
+                current = step.get(key)
+                if amount and (current is None or covered + amount > current[0]):
+                    step[key] = (covered + amount, picked + [(s, amount)])
+        best = step
+
+    for key in sorted(best):
+        covered, picked = best[key]
+        if covered >= shortfall:
+            break
+    else:
+        raise ValueError(f"batch burn: withdrawal queue holds less than the {shortfall} shortfall")
+
+    withdrawals, remaining = [], shortfall
+    for s, limit in picked:
+        amount = min(limit, remaining)
+        withdrawals.append(Withdrawal(s.address, amount, max(amount - s.float, 0)))
+        remaining -= amount
+        if remaining == 0:
+            break
+
+    return withdrawals
+
+
+def plan_batch_burn(state):
+    if state.total_shares == 0:
+        return BurnPlan(state, [], "nothing to burn")
+
+    try:
+        withdrawals = plan_withdrawals(state.shortfall, state.queue)
+    except ValueError:
+        return BurnPlan(state, [], "not enough underlying")
+
+    if state.timestamp < state.executable_at:
+        return BurnPlan(state, withdrawals, "harvest delay")
+    return BurnPlan(state, withdrawals, "execute")
+
+
+def execute_burn_plan(plan, account, registry, recorder):
+    """Sends the withdrawals and `execBatchBurn`, grouped by vault so they stay in order."""
+    vault = registry.contract(plan.state.vault, "Vault", owner=account)
+
+    for w in plan.withdrawals:
+        if w.underlying:
+            strategy = registry.contract(w.strategy, "BaseStrategy", owner=account)
+            recorder.send(vault.address, strategy.withdrawUnderlying, w.underlying)
+        recorder.send(vault.address, vault.withdrawFromStrategy, w.strategy, w.amount)
+
+    recorder.send(vault.address, vault.execBatchBurn)
+
+
+def main():
+    from ape_safe import ApeSafe
+    from auxo_keeper.multisend import CallRecorder, pack, post_multisends
+
+    from scripts.abi_registry import ContractRegistry
+    from scripts.harvest import vaults
+
+    safe = ApeSafe("0x309DCdBE77d9D73805e96662503B08FEe229597A")
+    registry = ContractRegistry()
+    recorder = CallRecorder()
+
+    for state in read_burn_states([v["vault"] for v in vaults], registry):
+        plan = plan_batch_burn(state)
+        base = state.base_unit
+        print(
+            f"{state.vault} round {state.round}: {state.total_shares / base:.4f} shares, "
+            f"{state.required / base:.4f} required ({state.fees / base:.4f} fees), "
+            f"{state.shortfall / base:.4f} short, {len(plan.withdrawals)} withdrawals, {plan.reason}"
+        )
+        if plan.executable:
+            execute_burn_plan(plan, safe.account, registry, recorder)
+
+    if recorder.calls:
+        post_multisends(safe, pack(recorder.calls))
@@ -0,0 +1,62 @@
+"""Harvest keeper benchmark against fleets of vaults and mock strategies on a local chain.
+
+Every vault starts with part of its float in its strategies and some profit on
+top, so `harvest_all` harvests and deposits exactly as `harvest.py` does on the
+real vaults. RPC requests, gas and wall time are recorded per stage and written
+to `reports/benchmark-harvest-<commit>.json`.
+
+    brownie run scripts/benchmark                     # default fleet sizes
+    brownie run scripts/benchmark main 10x2 20x4      # <vaults>x<strategies per vault>
+"""
+import os
+import tempfile
+from types import SimpleNamespace
+
+from auxo_keeper.simulation import CostReport, save_benchmark
+from brownie import MockToken, accounts, multicall
+
+import scripts.harvest as harvest
+from scripts.abi_registry import ContractRegistry
+from scripts.mock_vaults import deploy_auth, deploy_vault
+
+# (vaults, strategies per vault)
+SIZES = [(1, 1), (5, 2), (10, 4)]
+
+
+def run(n_vaults, n_strategies, gov, directory):
+    token = gov.deploy(MockToken, "Mock Token", "MCK")
+    auth = deploy_auth(gov)
+
+    fleet = [deploy_vault(gov, token, auth, n_strategies) for _ in range(n_vaults)]
+    # keep the benchmark away from the pinned registry
+    registry = ContractRegistry(os.path.join(directory, "registry.json"))
+
+    report = CostReport(f"harvest-{n_vaults}x{n_strategies}")
+    # there is no router on a local chain to price gas in underlying
+    harvest.harvest_all(SimpleNamespace(account=gov), registry, report, gas_price=0, fleet=fleet)
+
+    return {
+        "vaults": n_vaults,
+        "strategies": n_strategies,
+        "stages": report.by_stage(),
+        "totals": report.totals(),
+    }
+
+
+def main(*sizes):
+    sizes = [tuple(int(v) for v in s.split("x")) for s in sizes] or SIZES
+    gov = accounts[0]
+    multicall.deploy({"from": gov})
+
+    results = []
+    for n_vaults, n_strategies in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            results.append(run(n_vaults, n_strategies, gov, directory))
+
+    print(f"{'fleet':>8} {'stage':<10}{'elapsed':>12}{'rpc':>6}{'gas':>12}")
+    for r in results:
+        fleet = f"{r['vaults']}x{r['strategies']}"
+        for name, stage in r["stages"].items():
+            print(f"{fleet:>8} {name:<10}{stage['elapsed'] * 1e3:>10.2f}ms{stage['rpc']:>6}{stage['gas_used']:>12}")
+
+    print(f"results written to {save_benchmark('harvest', results)}")
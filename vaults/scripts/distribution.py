@@ -0,0 +1,126 @@
+"""Float distribution across a vault's deposit strategies.
+
+The float left after reserving underlying for the pending batch burn is split
+into `chunks` equal parts and every part goes to the strategy with the highest
+marginal yield that still has capacity, picked from a heap. A strategy's yield
+is what it earned since the last harvest over its balance; deposits dilute it
+when its `depth` (the liquidity it earns on) is configured, so large floats
+spread over several strategies instead of piling into one.
+
+Per-strategy limits are optional and come from the vault entry of the keeper:
+
+    "strategy_limits": {"0x...": {"capacity": 2_000_000 * 10**6, "depth": 50_000_000 * 10**6}}
+"""
+import heapq
+from dataclasses import dataclass
+from typing import Optional
+
+from eth_utils import to_checksum_address
+
+from scripts.fixed_point import fmul
+
+CHUNKS = 1000
+
+
+@dataclass(frozen=True)
+class StrategyTerms:
+    address: str
+    rate: float
+    holdings: int
+    capacity: Optional[int] = None
+    depth: Optional[int] = None
+
+    @property
+    def room(self):
+        return None if self.capacity is None else max(self.capacity - self.holdings, 0)
+
+    def marginal_yield(self, added):
+        if self.depth is None:
+            return self.rate
+        return self.rate * (self.depth / (self.depth + added)) ** 2
+
+
+def burn_reserve(snapshot):
+    """Underlying `execBatchBurn` needs in float for the shares queued so far (`fmul` rounding)."""
+    return fmul(snapshot.pending_burn_shares, snapshot.exchange_rate, snapshot.base_unit)
+
+
+def estimate_rates(snapshot, strategies):
+    """Per second yield of every strategy since the vault's last harvest.
+
+    Strategies without a usable history get the mean rate of the others.
+    """
+    elapsed = snapshot.timestamp - snapshot.last_harvest
+    rates = {}
+    for s in strategies:
+        strategy = snapshot.strategies[s]
+        if elapsed > 0 and strategy.balance > 0:
+            rates[s] = strategy.profit / strategy.balance / elapsed
+
+    default = sum(rates.values()) / len(rates) if rates else 0.0
+    return {s: rates.get(s, default) for s in strategies}
+
+
+def strategy_terms(snapshot, strategies, limits=None):
+    limits = {to_checksum_address(s): l for s, l in (limits or {}).items()}
+    strategies = [to_checksum_address(s) for s in strategies]
+    rates = estimate_rates(snapshot, strategies)
+
+    return [
+        StrategyTerms(
+            address=s,
+            rate=rates[s],
+            holdings=snapshot.strategies[s].balance,
+            capacity=limits.get(s, {}).get("capacity"),
+            depth=limits.get(s, {}).get("depth"),
+        )
+        for s in strategies
+    ]
+
+
+def distribute(amount, terms, chunks=CHUNKS):
+    """Greedy chunked split of `amount` across `terms`, returns the amount per strategy."""
+    allocated = [0] * len(terms)
+    if amount <= 0 or not terms:
+        return allocated
+
+    chunk = max(amount // chunks, 1)
+    remaining = amount
+
+    # ties (e.g. strategies without history) go to the strategy holding the least
+    heap = [(-t.marginal_yield(0), t.holdings, i) for i, t in enumerate(terms) if t.room != 0]
+    heapq.heapify(heap)
+
+    while remaining and heap:
+        _, _, i = heapq.heappop(heap)
+        t = terms[i]
+
+        # the last chunk takes the rounding remainder
+        size = remaining if remaining < 2 * chunk else chunk
+        if t.room is not None:
+            size = min(size, t.room - allocated[i])
+
+        allocated[i] += size
+        remaining -= size
+
+        if t.room is None or allocated[i] < t.room:
+            heapq.heappush(heap, (-t.marginal_yield(allocated[i]), t.holdings + allocated[i], i))
+
+    return allocated
+
+
+def plan_distribution(snapshot, strategies, limits=None, chunks=CHUNKS):
+    """Splits the float across `strategies` by rate, returns `[(strategy, amount)]`.
+
+    Deposits are applied to `snapshot` as they are planned.
+    """
+    available = snapshot.total_float - burn_reserve(snapshot)
+    terms = strategy_terms(snapshot, strategies, limits)
+
+    deposits = []
+    for t, amount in zip(terms, distribute(available, terms, chunks)):
+        if amount > 0:
+            snapshot.deposit(t.address, amount)
+            deposits.append((t.address, amount))
+
+    return deposits
@@ -0,0 +1,216 @@
+"""Incremental index of `Vault` events in a local SQLite database.
+
+Logs of every indexed vault are fetched with `eth_getLogs` over block ranges,
+decoded with the Vault ABI and stored with a per-vault checkpoint, updated in
+the same transaction as the events of the range, so a restart resumes after
+the last range that was written. The range size adapts to the provider: it is
+halved when a query is rejected (too many results, range too large, timeout)
+and doubled again after every successful one up to `MAX_CHUNK`.
+
+    brownie run scripts/event_indexer --network ftm-main    # index the keeper vaults
+
+    index = EventIndex("data/events.sqlite", registry.abis["Vault"])
+    index.sync(vault_addresses)
+    index.events(vault, "Harvest", from_block=n)
+"""
+import json
+import os
+import sqlite3
+import threading
+from collections import Counter
+
+from brownie import web3
+from eth_utils import event_abi_to_log_topic, to_checksum_address
+
+DATABASE_PATH = "data/events.sqlite"
+
+EVENTS = [
+    "Deposit",
+    "EnterBatchBurn",
+    "ExitBatchBurn",
+    "ExecuteBatchBurn",
+    "Harvest",
+    "StrategyDeposit",
+    "StrategyWithdrawal",
+    # config updates
+    "AuthUpdated",
+    "HarvestFeePercentUpdated",
+    "BurningFeePercentUpdated",
+    "HarvestFeeReceiverUpdated",
+    "BurningFeeReceiverUpdated",
+    "HarvestWindowUpdated",
+    "HarvestDelayUpdated",
+    "HarvestDelayUpdateScheduled",
+    "WithdrawalQueueSet",
+    "StrategyTrusted",
+    "StrategyDistrusted",
+    "DepositLimitsUpdated",
+]
+
+INITIAL_CHUNK = 5_000
+MIN_CHUNK = 1
+MAX_CHUNK = 100_000
+
+# blocks left out of the index, Fantom finality is near instant
+CONFIRMATIONS = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    vault TEXT NOT NULL,
+    block_number INTEGER NOT NULL,
+    log_index INTEGER NOT NULL,
+    tx_hash TEXT NOT NULL,
+    event TEXT NOT NULL,
+    args TEXT NOT NULL,
+    PRIMARY KEY (block_number, log_index)
+);
+CREATE INDEX IF NOT EXISTS events_vault_event ON events (vault, event, block_number);
+CREATE TABLE IF NOT EXISTS checkpoints (
+    vault TEXT PRIMARY KEY,
+    block_number INTEGER NOT NULL
+);
+"""
+
+
+def _jsonable(value):
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    if isinstance(value, bytes):
+        return "0x" + value.hex()
+    return value
+
+
+class EventIndex:
+    def __init__(self, path, abi, events=EVENTS):
+        self.path = path
+        self.contract = web3.eth.contract(abi=abi)
+        self.chunk = INITIAL_CHUNK
+        self._lock = threading.Lock()
+
+        event_abis = [e for e in abi if e["type"] == "event" and e["name"] in events]
+        self.topics = {"0x" + event_abi_to_log_topic(e).hex(): e["name"] for e in event_abis}
+
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.executescript(SCHEMA)
+
+    def checkpoint(self, vault):
+        """Last block indexed for `vault`, None if it was never indexed."""
+        row = self.db.execute(
+            "SELECT block_number FROM checkpoints WHERE vault = ?", (to_checksum_address(vault),)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _get_logs(self, vaults, from_block, to_block):
+        return web3.eth.get_logs(
+            {
+                "address": vaults,
+                "fromBlock": from_block,
+                "toBlock": to_block,
+                "topics": [list(self.topics)],
+            }
+        )
+
+    def _decode(self, log):
+        name = self.topics["0x" + bytes(log["topics"][0]).hex()]
+        event = self.contract.events[name]().processLog(log)
+        args = {k: _jsonable(v) for k, v in event["args"].items()}
+        return (
+            to_checksum_address(log["address"]),
+            log["blockNumber"],
+            log["logIndex"],
+            "0x" + bytes(log["transactionHash"]).hex(),
+            name,
+            json.dumps(args),
+        )
+
+    def _write(self, vaults, to_block, logs):
+        with self.db:
+            self.db.executemany("INSERT OR REPLACE INTO events VALUES (?, ?, ?, ?, ?, ?)", map(self._decode, logs))
+            self.db.executemany(
+                "INSERT OR REPLACE INTO checkpoints VALUES (?, ?)", [(v, to_block) for v in vaults]
+            )
+
+    def sync(self, vaults, to_block=None, start_block=0):
+        """Indexes `vaults` up to `to_block`, returns the number of new events.
+
+        Vaults without a checkpoint are indexed from `start_block`, vaults behind
+        the others are caught up first so every range is queried for all of them.
+        """
+        vaults = [to_checksum_address(v) for v in vaults]
+        if to_block is None:
+            to_block = web3.eth.block_number - CONFIRMATIONS
+
+        with self._lock:
+            added = 0
+            while True:
+                behind = {}
+                for v in vaults:
+                    checkpoint = self.checkpoint(v)
+                    next_block = start_block if checkpoint is None else checkpoint + 1
+                    if next_block <= to_block:
+                        behind[v] = next_block
+                if not behind:
+                    return added
+
+                from_block = min(behind.values())
+                # stop where the next vault joins, its checkpoint is earlier than that
+                later = [b for b in behind.values() if b > from_block]
+                end = min([to_block, from_block + self.chunk - 1] + [b - 1 for b in later])
+                queried = [v for v, b in behind.items() if b == from_block]
+
+                try:
+                    logs = self._get_logs(queried, from_block, end)
+                except (ValueError, IOError):
+                    if end == from_block:
+                        raise
+                    self.chunk = max((end - from_block + 1) // 2, MIN_CHUNK)
+                    continue
+
+                self._write(queried, end, logs)
+                added += len(logs)
+                self.chunk = min(self.chunk * 2, MAX_CHUNK)
+
+    def events(self, vault=None, event=None, from_block=None, to_block=None):
+        """Indexed events in chain order, `args` decoded."""
+        query, params = "SELECT vault, block_number, log_index, tx_hash, event, args FROM events WHERE 1", []
+        if vault is not None:
+            query += " AND vault = ?"
+            params.append(to_checksum_address(vault))
+        if event is not None:
+            query += " AND event = ?"
+            params.append(event)
+        if from_block is not None:
+            query += " AND block_number >= ?"
+            params.append(from_block)
+        if to_block is not None:
+            query += " AND block_number <= ?"
+            params.append(to_block)
+
+        rows = self.db.execute(query + " ORDER BY block_number, log_index", params)
+        return [
+            {
+                "vault": vault,
+                "block_number": block_number,
+                "log_index": log_index,
+                "tx_hash": tx_hash,
+                "event": name,
+                "args": json.loads(args),
+            }
+            for vault, block_number, log_index, tx_hash, name, args in rows
+        ]
+
+    def close(self):
+        self.db.close()
+
+
+def main(start_block=0):
+    from scripts.abi_registry import ContractRegistry
+    from scripts.harvest import vaults
+
+    os.makedirs(os.path.dirname(DATABASE_PATH), exist_ok=True)
+    index = EventIndex(DATABASE_PATH, ContractRegistry().abis["Vault"])
+    added = index.sync([v["vault"] for v in vaults], start_block=int(start_block))
+
+    print(f"{added} new events, indexed up to block {index.checkpoint(vaults[0]['vault'])} (chunk {index.chunk})")
+    for v in vaults:
+        print(v["vault"], dict(Counter(e["event"] for e in index.events(v["vault"]))))
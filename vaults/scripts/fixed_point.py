@@ -0,0 +1,23 @@
+"""Python counterparts of `FixedPointMathLib.fmul` and `fdiv`, rounding and reverts included."""
+
+MAX_UINT256 = 2**256 - 1
+
+# fee percentages are fixed point numbers where WAD is 100%
+WAD = 10**18
+
+
+def fmul(x, y, base_unit):
+    z = x * y
+    if z > MAX_UINT256:
+        raise OverflowError("fmul: overflow")
+    # the assembly `div` returns zero for a zero base unit
+    return z // base_unit if base_unit else 0
+
+
+def fdiv(x, y, base_unit):
+    if y == 0:
+        raise ZeroDivisionError("fdiv: division by zero")
+    z = x * base_unit
+    if z > MAX_UINT256:
+        raise OverflowError("fdiv: overflow")
+    return z // y
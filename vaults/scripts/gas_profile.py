@@ -0,0 +1,215 @@
+"""Gas profile of the `Vault` entry points, compared against a stored baseline.
+
+Every entry point is called in fixed scenarios on a local chain (first and
+repeated deposits, batch burns with and without fee, strategy deposits and
+withdrawals, config setters, withdrawal queues of 1 to 20 strategies), and
+`harvest` is measured with a growing number of profitable strategies to fit its
+fixed and per-strategy cost. Test suite profiles are merged in when present:
+
+    GAS_PROFILE=reports brownie test --gas            # each worker dumps reports/gas-suite-<worker>.json
+
+Suite entries average successful calls only and move whenever tests change, so
+they are reported but never fail the run. Gas of a scenario above the baseline
+by more than the threshold is a regression and fails the run. The baseline is
+only written when `update` is passed, without one the run only reports. CI
+rewrites the baseline on main builds and compares every other build against
+the one of the last main build.
+
+    brownie run scripts/gas_profile                   # compare against gas-baseline.json
+    brownie run scripts/gas_profile main true         # write the baseline
+"""
+import glob
+import json
+import os
+
+import numpy as np
+from auxo_keeper.simulation import REPORTS_DIR, save_benchmark
+from brownie import MockStrategy, MockToken, Vault, accounts, web3
+
+from scripts.mock_vaults import deploy_auth
+
+BASELINE_PATH = "gas-baseline.json"
+THRESHOLD = 0.02
+
+HARVEST_STRATEGIES = [1, 2, 4, 8, 16]
+QUEUE_LENGTHS = [1, 5, 20]
+
+MAX_UINT256 = 2**256 - 1
+FUNDS = 1_000_000 * 10**18
+PROFIT = 1_000 * 10**18
+
+
+def deploy_vault(gov, token, auth):
+    vault = gov.deploy(Vault)
+    # fee receivers are set so the fee branches are measured once fees are on
+    vault.initialize(token, auth, gov, gov)
+    vault.setDepositLimits(MAX_UINT256, MAX_UINT256)
+    vault.triggerPause()
+    return vault
+
+
+def deploy_strategies(gov, token, vault, n):
+    strategies = []
+    for _ in range(n):
+        strategy = gov.deploy(MockStrategy)
+        strategy.initialize(vault, token, gov, gov, "MockStrategy")
+        vault.trustStrategy(strategy)
+        strategies.append(strategy)
+    return strategies
+
+
+def profile_entry_points(gov, users, token, auth):
+    """Gas of every entry point scenario, keyed `function[scenario]`."""
+    gas = {}
+
+    def record(name, scenario, tx):
+        gas[f"{name}[{scenario}]"] = tx.gas_used
+
+    vault = deploy_vault(gov, token, auth)
+    alice, bob = users
+    for u in users:
+        token.mint(u, FUNDS)
+        token.approve(vault, MAX_UINT256, {"from": u})
+
+    record("deposit", "first", vault.deposit(alice, FUNDS // 4, {"from": alice}))
+    record("deposit", "repeat", vault.deposit(alice, FUNDS // 4, {"from": alice}))
+    record("deposit", "new holder", vault.deposit(bob, FUNDS // 4, {"from": bob}))
+
+    record("enterBatchBurn", "first", vault.enterBatchBurn(10**18, {"from": alice}))
+    record("enterBatchBurn", "repeat", vault.enterBatchBurn(10**18, {"from": alice}))
+    record("enterBatchBurn", "second user", vault.enterBatchBurn(10**18, {"from": bob}))
+    record("execBatchBurn", "no fee", vault.execBatchBurn())
+    record("exitBatchBurn", "no fee", vault.exitBatchBurn({"from": alice}))
+
+    record("setBurningFeePercent", "", vault.setBurningFeePercent(10**16))
+    vault.enterBatchBurn(10**18, {"from": alice})
+    record("execBatchBurn", "fee", vault.execBatchBurn())
+    record("exitBatchBurn", "fee", vault.exitBatchBurn({"from": alice}))
+
+    strategy, other = deploy_strategies(gov, token, vault, 2)
+    record("depositIntoStrategy", "first", vault.depositIntoStrategy(strategy, 10**20))
+    record("depositIntoStrategy", "repeat", vault.depositIntoStrategy(strategy, 10**20))
+    record("withdrawFromStrategy", "partial", vault.withdrawFromStrategy(strategy, 10**20))
+    record("withdrawFromStrategy", "full", vault.withdrawFromStrategy(strategy, 10**20))
+
+    record("setDepositLimits", "", vault.setDepositLimits(MAX_UINT256 - 1, MAX_UINT256 - 1))
+    record("setBlocksPerYear", "", vault.setBlocksPerYear(31_536_000))
+    record("setHarvestFeePercent", "", vault.setHarvestFeePercent(10**17))
+    record("setHarvestDelay", "first", vault.setHarvestDelay(6 * 3600))
+    record("setHarvestDelay", "scheduled", vault.setHarvestDelay(12 * 3600))
+    record("setHarvestWindow", "", vault.setHarvestWindow(3600))
+    record("distrustStrategy", "", vault.distrustStrategy(other))
+    record("trustStrategy", "", vault.trustStrategy(other))
+    for n in QUEUE_LENGTHS:
+        record("setWithdrawalQueue", f"{n} strategies", vault.setWithdrawalQueue([strategy] * n))
+
+    return gas
+
+
+def harvest_scaling(gov, token, auth, counts=HARVEST_STRATEGIES):
+    """Gas of a fee-bearing, new-window `harvest` over `n` profitable strategies, for every `n`."""
+    points = []
+    for n in counts:
+        vault = deploy_vault(gov, token, auth)
+        vault.setHarvestFeePercent(10**17)
+        vault.setHarvestDelay(6 * 3600)
+        vault.setBlocksPerYear(31_536_000)
+
+        token.mint(gov, FUNDS)
+        token.approve(vault, FUNDS)
+        vault.deposit(gov, FUNDS)
+
+        strategies = deploy_strategies(gov, token, vault, n)
+        for s in strategies:
+            vault.depositIntoStrategy(s, FUNDS // (2 * n))
+            token.mint(s, PROFIT)
+
+        points.append((n, vault.harvest(strategies).gas_used))
+
+    return points
+
+
+def fit_scaling(points):
+    """Least squares `gas = base + per_strategy * n`."""
+    n, gas = np.array(points, dtype=float).T
+    per_strategy, base = np.polyfit(n, gas, 1)
+    return {"base": int(round(base)), "per_strategy": int(round(per_strategy))}
+
+
+def load_suite_profiles(directory=REPORTS_DIR):
+    """Merges the per-worker test suite dumps into one `Vault` profile, keyed `suite:function`.
+
+    Only successful calls are averaged, `avg` also counts the gas of reverts the
+    tests provoke. Dumps of brownie versions without `avg_success` are skipped.
+    """
+    merged = {}
+    for path in sorted(glob.glob(os.path.join(directory, "gas-suite-*.json"))):
+        with open(path) as f:
+            profile = json.load(f)
+        for name, values in profile.items():
+            if not name.startswith("Vault.") or "count_success" not in values:
+                continue
+            entry = merged.setdefault(name, {"total": 0, "count": 0})
+            entry["total"] += values["avg_success"] * values["count_success"]
+            entry["count"] += values["count_success"]
+
+    return {f"suite:{name.split('.', 1)[1]}": int(e["total"] // e["count"]) for name, e in merged.items() if e["count"]}
+
+
+def compare(current, baseline, threshold=THRESHOLD):
+    """One row per entry, `status` is regression, improvement, new, removed or ok."""
+    rows = []
+    for name in sorted(set(current) | set(baseline)):
+        now, before = current.get(name), baseline.get(name)
+        if before is None:
+            status, change = "new", None
+        elif now is None:
+            status, change = "removed", None
+        else:
+            change = (now - before) / before
+            status = "regression" if change > threshold else "improvement" if change < -threshold else "ok"
+        rows.append({"name": name, "baseline": before, "current": now, "change": change, "status": status})
+    return rows
+
+
+def main(update="false", threshold=THRESHOLD):
+    gov, users = accounts[0], accounts[1:3]
+    token = gov.deploy(MockToken, "Mock Token", "MCK")
+    auth = deploy_auth(gov)
+
+    profile = profile_entry_points(gov, users, token, auth)
+    points = harvest_scaling(gov, token, auth)
+    scaling = fit_scaling(points)
+    profile.update({f"harvest[{n} strategies]": gas for n, gas in points})
+    profile.update(load_suite_profiles())
+
+    baseline = {}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH) as f:
+            baseline = json.load(f)
+    rows = compare(profile, baseline, float(threshold))
+
+    print(f"{'entry point':<40}{'baseline':>12}{'current':>12}{'change':>9}  status")
+    for r in rows:
+        change = f"{r['change']:+.2%}" if r["change"] is not None else ""
+        print(f"{r['name']:<40}{r['baseline'] or '':>12}{r['current'] or '':>12}{change:>9}  {r['status']}")
+
+    limit = web3.eth.get_block("latest").gasLimit
+    print(
+        f"\nharvest: {scaling['base']} + {scaling['per_strategy']} per strategy, "
+        f"{(limit - scaling['base']) // scaling['per_strategy']} strategies fit in a {limit} gas block"
+    )
+    print(f"results written to {save_benchmark('gas', {'profile': profile, 'harvest': scaling, 'comparison': rows})}")
+
+    if update == "true":
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(profile, f, indent=4, sort_keys=True)
+        print(f"baseline written to {BASELINE_PATH}")
+        return
+    if not baseline:
+        print(f"no baseline at {BASELINE_PATH}, nothing to compare against")
+        return
+
+    regressions = [r["name"] for r in rows if r["status"] == "regression" and not r["name"].startswith("suite:")]
+    if regressions:
+        raise SystemExit(f"gas regressions over {float(threshold):.0%}: {', '.join(regressions)}")
@@ -1,5 +1,19 @@
-from brownie import Contract, interface
-from ape_safe import ApeSafe
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import List, Tuple
+
+from auxo_keeper.multisend import CallRecorder, build_multisends, pack, post_multisends
+from auxo_keeper.rate_store import DATA_DIR, RateStore
+from auxo_keeper.simulation import CostReport
+from brownie import web3
+
+from scripts.abi_registry import ContractRegistry
+from scripts.distribution import plan_distribution
+from scripts.scheduler import native_price, schedule
+from scripts.strategy_registry import StrategyRegistry, keeper_strategies
+from scripts.vault_snapshot import VaultSnapshot, take_vault_snapshots
 
 vaults = [
     {
@@ -36,45 +50,132 @@ vaults = [
 ]
 
 
-def deposit_underlying_if_any(vault, strategies, account):
-    total_float = vault.totalFloat()
-    share = int(total_float / len(strategies))
+@dataclass
+class HarvestPlan:
+    vault: str
+    snapshot: VaultSnapshot
+    harvest: List[str]
+    deposits: List[Tuple[str, int]]
 
-    if total_float > 0 and share > 0:
-        for s in strategies:
-            actual_float = vault.totalFloat()
-            amount = actual_float if share > actual_float else share
-            
-            print(amount)
 
-            vault.depositIntoStrategy(s, amount)
+def build_plan(v, registry, block_number=None, gas_price=0):
+    snapshot = take_vault_snapshots([v], registry, block_number)[0]
+    price = native_price(snapshot.underlying, snapshot.block_number) if gas_price else 0
+    decision = schedule(snapshot, v["harvest_strategies"], gas_price, price)
 
-            strategy = Contract.from_explorer(s, owner=account)
+    # harvesting does not move the float, deposits are planned on the snapshot
+    return HarvestPlan(
+        vault=snapshot.address,
+        snapshot=snapshot,
+        harvest=list(decision.strategies) if decision.harvest_now else [],
+        deposits=plan_distribution(snapshot, v["deposit_strategies"], v.get("strategy_limits")),
+    )
 
-            if strategy.name() != "BeethovenLPSingleSided USDC":
-                strategy.depositUnderlying(amount)
+
+def deposit_underlying_if_any(vault, deposits, account, registry, strategies, recorder):
+    for s, amount in deposits:
+        print(amount)
+
+        recorder.send(vault.address, vault.depositIntoStrategy, s, amount)
+
+        capabilities = strategies[s]
+        if capabilities.needs_deposit_underlying:
+            strategy = registry.contract(s, "BaseStrategy", owner=account)
+            recorder.send(vault.address, strategy.depositUnderlying, capabilities.deposit_underlying_argument(amount))
+
+
+def execute_plan(plan, account, registry, strategies, recorder, step=nullcontext):
+    vault = registry.contract(plan.vault, "Vault", owner=account)
+
+    # calls of a vault share a group, the multisend keeps the harvest before the deposits
+    with step(f"harvest {plan.vault[:10]}"):
+        recorder.send(vault.address, vault.harvest, plan.harvest)
+
+    with step(f"deposit {plan.vault[:10]}"):
+        deposit_underlying_if_any(vault, plan.deposits, account, registry, strategies, recorder)
+
+
+def record_returns(snapshots, path=os.path.join(DATA_DIR, "vaults")):
+    # the history is best effort, it never fails a run that has already posted
+    try:
+        rates = RateStore(path, ("estimated_return",))
+        block = web3.eth.get_block("latest")
+
+        # estimatedReturn is a percentage scaled by the vault's base unit
+        rates.append(
+            block.number,
+            block.timestamp,
+            [s.address for s in snapshots],
+            estimated_return=[s.estimated_return / s.base_unit for s in snapshots],
+        )
+    except (OSError, ValueError) as e:
+        print(f"returns not recorded: {e}")
+
+
+def harvest_all(safe, registry, report=None, gas_price=None, fleet=None):
+    step = report.step if report else nullcontext
+    fleet = vaults if fleet is None else fleet
+    gas_price = web3.eth.gas_price if gas_price is None else gas_price
+
+    # every vault is planned on the same block
+    block_number = web3.eth.block_number
+
+    # capabilities are cached per deployment, only new strategies are read
+    strategies = StrategyRegistry(registry)
+    with step("strategies"):
+        strategies.build(keeper_strategies(fleet))
+
+    def plan_vault(v):
+        with step(f"plan {v['vault'][:10]}"):
+            return build_plan(v, registry, block_number, gas_price)
+
+    # vaults are independent until the multisend, wall clock follows the slowest vault
+    with ThreadPoolExecutor(max_workers=len(fleet)) as executor:
+        plans = list(executor.map(plan_vault, fleet))
+
+    # transactions are recorded for the multisend, keep them serialized and in `fleet` order
+    recorder = CallRecorder()
+    for plan in plans:
+        execute_plan(plan, safe.account, registry, strategies, recorder, step)
+
+    # harvests update estimatedReturn, read it back in one batch
+    snapshots = [plan.snapshot for plan in plans]
+    if any(plan.harvest for plan in plans):
+        with step("snapshot"):
+            snapshots = take_vault_snapshots(fleet, registry)
+
+    for s in snapshots:
+        print(f"(decimals: {s.decimals}) apr for {s.name} is {s.estimated_return / s.base_unit} %")
+
+    return recorder.calls, snapshots
 
 
 def main():
+    from ape_safe import ApeSafe
+
     safe = ApeSafe("0x309DCdBE77d9D73805e96662503B08FEe229597A")
+    registry = ContractRegistry()
 
-    aprs = []
+    calls, snapshots = harvest_all(safe, registry)
+    post_multisends(safe, pack(calls))
 
-    for v in vaults:
-        vault = Contract.from_explorer(v["vault"], owner=safe.account)
+    # only returns of posted runs go to the history, dry runs on a fork never do
+    record_returns(snapshots)
 
-        if vault.totalStrategyHoldings() > 0:
-            vault.harvest(v["harvest_strategies"])  # harvest before depositing
 
-        deposit_underlying_if_any(vault, v["deposit_strategies"], safe.account)
+def simulate():
+    """Dry run on a fork: runs the plan, previews the multisends and never posts them."""
+    from ape_safe import ApeSafe
 
-        aprs.append({"vault": vault.name(), "estimated": vault.estimatedReturn()})
+    safe = ApeSafe("0x309DCdBE77d9D73805e96662503B08FEe229597A")
+    registry = ContractRegistry()
+    report = CostReport("harvest")
 
-    for apr in aprs:
-        print(
-            f'(decimals: {vault.decimals()}) apr for {apr["vault"]} is {apr["estimated"] / (10 ** vault.decimals())} %'
-        )
+    calls, _ = harvest_all(safe, registry, report)
+
+    # previews after the first one run on top of it, like the posted multisends would
+    for i, safe_tx in enumerate(build_multisends(safe, pack(calls))):
+        report.preview_multisend(safe, safe_tx, label=f"multisend {i}", reset=i == 0)
 
-    safe_tx = safe.multisend_from_receipts()
-    safe.sign_with_frame(safe_tx)
-    safe.post_transaction(safe_tx)
+    report.print()
+    print(f"report written to {report.save()}")
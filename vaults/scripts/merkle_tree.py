@@ -0,0 +1,261 @@
+"""Merkle tree builder and proof index for `MerkleAuth` whitelists.
+
+`MerkleAuth.authorize` verifies `keccak256(abi.encodePacked(toAuthorize, role))`
+leaves with OpenZeppelin's `MerkleProof`, which hashes every pair in sorted
+order. The builder streams (address, role) rows from a CSV, sorts and
+de-duplicates the 21 byte packed leaves with an external merge sort and hashes
+the tree one level at a time through temporary files, so memory stays bounded
+by `chunk` rows whatever the size of the list. An odd node is carried to the
+next level unchanged.
+
+The index file keeps the sorted entries and every level of the tree:
+
+    header   magic, leaf count, root
+    entries  count x (address 20 bytes, role 1 byte), sorted
+    levels   leaves first, then every level up to the root, 32 bytes per node
+
+An address is found by binary search over the memory-mapped entries and its
+proof is one sibling read per level, both O(log n), without rebuilding anything.
+
+    brownie run scripts/merkle_tree main whitelist.csv                  # builds data/merkle.index
+    brownie run scripts/merkle_tree main whitelist.csv out.index 100000 # <csv> <index> <rows per sort run>
+"""
+import csv
+import heapq
+import mmap
+import os
+import random
+import shutil
+import struct
+import tempfile
+
+# the backend eth_utils.keccak wraps, without its input normalization
+from eth_hash.auto import keccak
+
+INDEX_PATH = "data/merkle.index"
+CHUNK = 500_000
+
+MAGIC = b"AUXOMRK1"
+HEADER = struct.Struct(">8sQ32s")
+ENTRY_SIZE = 21
+NODE_SIZE = 32
+BUFFER = 1 << 20
+
+
+def leaf(address, role):
+    return keccak(_pack(address, role))
+
+
+def hash_pair(a, b):
+    return keccak(a + b if a <= b else b + a)
+
+
+def verify(proof, root, node):
+    """`MerkleProof.verify` in Python."""
+    for sibling in proof:
+        node = hash_pair(node, sibling)
+    return node == root
+
+
+def _pack(address, role):
+    address = bytes.fromhex(address[2:] if address.startswith(("0x", "0X")) else address)
+    if len(address) != 20 or not 0 <= int(role) < 256:
+        raise ValueError(f"merkle tree: bad entry {address.hex()}, {role}")
+    return address + bytes([int(role)])
+
+
+def _level_sizes(count):
+    sizes = [count]
+    while sizes[-1] > 1:
+        sizes.append((sizes[-1] + 1) // 2)
+    return sizes
+
+
+def _read_records(path, size):
+    with open(path, "rb", buffering=BUFFER) as f:
+        while True:
+            record = f.read(size)
+            if not record:
+                return
+            yield record
+
+
+def _sorted_runs(csv_path, directory, chunk):
+    """Writes sorted runs of packed entries, returns their paths."""
+    runs, rows = [], []
+
+    def flush():
+        path = os.path.join(directory, f"run-{len(runs)}")
+        with open(path, "wb", buffering=BUFFER) as f:
+            f.writelines(sorted(set(rows)))
+        runs.append(path)
+        rows.clear()
+
+    with open(csv_path, newline="") as f:
+        for line, row in enumerate(csv.reader(f), 1):
+            if not any(cell.strip() for cell in row):
+                continue
+            try:
+                rows.append(_pack(row[0].strip(), row[1].strip()))
+            except (ValueError, IndexError) as e:
+                # only the first line may be a header, a bad row anywhere else would silently lose an entry
+                if line == 1:
+                    continue
+                raise ValueError(f"merkle tree: bad row {line} of {csv_path}: {row}") from e
+            if len(rows) >= chunk:
+                flush()
+    if rows or not runs:
+        flush()
+    return runs
+
+
+def _write_leaves(runs, entries_path, level_path):
+    """Merges the runs into the entries and the leaves, returns the entry count."""
+    count, last = 0, None
+    with open(entries_path, "wb", buffering=BUFFER) as entries, open(level_path, "wb", buffering=BUFFER) as level:
+        for record in heapq.merge(*(_read_records(r, ENTRY_SIZE) for r in runs)):
+            if record == last:
+                continue
+            entries.write(record)
+            level.write(keccak(record))
+            count, last = count + 1, record
+    return count
+
+
+def _write_level(source, target):
+    with open(target, "wb", buffering=BUFFER) as out:
+        pair = []
+        for node in _read_records(source, NODE_SIZE):
+            pair.append(node)
+            if len(pair) == 2:
+                out.write(hash_pair(*pair))
+                pair.clear()
+        # the odd node goes up unchanged
+        out.writelines(pair)
+
+
+def build(csv_path, index_path=INDEX_PATH, chunk=CHUNK):
+    """Builds the tree of the CSV whitelist into `index_path`, returns the root."""
+    with tempfile.TemporaryDirectory() as directory:
+        runs = _sorted_runs(csv_path, directory, chunk)
+        entries = os.path.join(directory, "entries")
+        levels = [os.path.join(directory, "level-0")]
+        count = _write_leaves(runs, entries, levels[0])
+        if count == 0:
+            raise ValueError(f"merkle tree: no entries in {csv_path}")
+        for r in runs:
+            os.remove(r)
+
+        for _ in _level_sizes(count)[1:]:
+            levels.append(os.path.join(directory, f"level-{len(levels)}"))
+            _write_level(levels[-2], levels[-1])
+        with open(levels[-1], "rb") as f:
+            root = f.read()
+
+        # written next to the target and renamed, a reader never sees a partial index
+        os.makedirs(os.path.dirname(index_path) or ".", exist_ok=True)
+        partial = index_path + ".partial"
+        with open(partial, "wb") as out:
+            out.write(HEADER.pack(MAGIC, count, root))
+            for path in [entries] + levels:
+                with open(path, "rb") as f:
+                    shutil.copyfileobj(f, out, BUFFER)
+        os.replace(partial, index_path)
+
+    return root
+
+
+class ProofIndex:
+    """Read-only view of an index file written by `build`."""
+
+    def __init__(self, path=INDEX_PATH):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self.count, self.root = HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            raise ValueError(f"merkle tree: {path} is not a proof index")
+
+        self._entries = HEADER.size
+        self._levels = []
+        offset = self._entries + self.count * ENTRY_SIZE
+        for size in _level_sizes(self.count):
+            self._levels.append((offset, size))
+            offset += size * NODE_SIZE
+
+    def __len__(self):
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._map.close()
+
+    def entry(self, i):
+        start = self._entries + i * ENTRY_SIZE
+        record = self._map[start : start + ENTRY_SIZE]
+        return "0x" + record[:20].hex(), record[20]
+
+    def _find(self, record):
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = self._entries + mid * ENTRY_SIZE
+            if self._map[start : start + len(record)] < record:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def roles(self, address):
+        """Roles whitelisted for `address`."""
+        prefix = _pack(address, 0)[:20]
+        i, roles = self._find(prefix), []
+        while i < self.count:
+            start = self._entries + i * ENTRY_SIZE
+            if self._map[start : start + 20] != prefix:
+                break
+            roles.append(self._map[start + 20])
+            i += 1
+        return roles
+
+    def position(self, address, role):
+        record = _pack(address, role)
+        i = self._find(record)
+        start = self._entries + i * ENTRY_SIZE
+        if i == self.count or self._map[start : start + ENTRY_SIZE] != record:
+            raise KeyError(f"{address} is not whitelisted for role {role}")
+        return i
+
+    def node(self, level, i):
+        offset, _ = self._levels[level]
+        start = offset + i * NODE_SIZE
+        return self._map[start : start + NODE_SIZE]
+
+    def proof(self, address, role):
+        """The `authorize` proof of `address` and `role`, raises KeyError if not whitelisted."""
+        i, proof = self.position(address, role), []
+        for level, (_, size) in enumerate(self._levels[:-1]):
+            sibling = i ^ 1
+            if sibling < size:
+                proof.append(self.node(level, sibling))
+            i //= 2
+        return proof
+
+
+def main(csv_path, index_path=INDEX_PATH, chunk=CHUNK, samples=1000):
+    root = build(csv_path, index_path, int(chunk))
+
+    with ProofIndex(index_path) as index:
+        checked = random.sample(range(len(index)), min(int(samples), len(index)))
+        for i in checked:
+            address, role = index.entry(i)
+            assert verify(index.proof(address, role), root, leaf(address, role)), address
+        depth = len(index.proof(*index.entry(0)))
+        print(f"{len(index)} entries, root 0x{root.hex()}, proofs of up to {depth} nodes, {len(checked)} checked")
+    print(f"index written to {index_path}")
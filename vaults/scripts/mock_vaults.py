@@ -0,0 +1,44 @@
+"""Vaults and mock strategies deployed on a local chain.
+
+Used by the benchmarks, the gas profiler and the keeper tests. Only depends on
+the contracts of this project, never on the keeper scripts.
+"""
+from brownie import ZERO_ADDRESS, MockStrategy, MultiRolesAuthority, Vault
+
+MAX_UINT256 = 2**256 - 1
+VAULT_FUNDS = 1_000_000 * 10**18
+PROFIT = 1_000 * 10**18
+
+
+def deploy_auth(gov):
+    auth = gov.deploy(MultiRolesAuthority, gov, ZERO_ADDRESS)
+
+    # permissions are not what is measured, open every vault method
+    for signature in Vault.signatures.values():
+        auth.setPublicCapability(signature, True)
+
+    return auth
+
+
+def deploy_vault(gov, token, auth, strategies):
+    vault = gov.deploy(Vault)
+    vault.initialize(token, auth, ZERO_ADDRESS, ZERO_ADDRESS)
+    vault.setDepositLimits(MAX_UINT256, MAX_UINT256)
+    vault.triggerPause()
+
+    token.mint(gov, VAULT_FUNDS)
+    token.approve(vault, VAULT_FUNDS)
+    vault.deposit(gov, VAULT_FUNDS)
+
+    deployed = []
+    for _ in range(strategies):
+        strategy = gov.deploy(MockStrategy)
+        strategy.initialize(vault, token, gov, gov, "MockStrategy")
+        vault.trustStrategy(strategy)
+
+        # half the float is already invested and has made a profit since
+        vault.depositIntoStrategy(strategy, VAULT_FUNDS // (2 * strategies))
+        token.mint(strategy, PROFIT)
+        deployed.append(strategy.address)
+
+    return {"vault": vault.address, "harvest_strategies": deployed, "deposit_strategies": deployed}
@@ -0,0 +1,239 @@
+"""Monte Carlo simulator for tuning vault harvest and fee parameters.
+
+Every scenario is one vault with a single strategy, simulated hour by hour with
+the accounting rules of `Vault.sol` (see `vault_model.py`) on float64 NumPy
+arrays, one element per scenario, so thousands of scenarios advance together.
+Scenarios draw their own deposit and batch-burn flows, strategy return path
+and keeper lag. The keeper harvests the strategy when a new window opens (after
+`harvestDelay` plus its lag) and again every hour the window stays open, invests
+the float when harvesting and executes the pending batch burn as soon as
+`execBatchBurn` allows it.
+
+Per scenario the sweep reports:
+
+    volatility  annualized standard deviation of hourly share price log returns
+    dilution    share of the profit captured by deposits made while profit was
+                locked (the new shares get part of the profit still unlocking)
+    fees        harvest and burning fees over the horizon, over the initial TVL
+
+Parameter sets are spread over a process pool, each worker simulating a block
+of scenarios of one set.
+
+    brownie run scripts/monte_carlo                            # default grid, 10k scenarios per set
+    brownie run scripts/monte_carlo main 100000 2160           # <scenarios per set> <hours>
+"""
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+
+import numpy as np
+
+HOUR = 60 * 60
+HOURS_PER_YEAR = 24 * 365
+
+# hours simulated per scenario, and scenarios per worker task
+STEPS = 24 * 90
+BLOCK = 2_000
+
+PERCENTILES = (5, 50, 95)
+
+
+@dataclass(frozen=True)
+class VaultParams:
+    harvest_delay: int  # seconds
+    harvest_window: int  # seconds
+    harvest_fee_percent: float  # 1.0 is 100%
+    burning_fee_percent: float
+
+
+@dataclass(frozen=True)
+class Market:
+    strategy_apr: float = 0.08
+    strategy_volatility: float = 0.05  # annualized
+    deposit_rate: float = 0.002  # hourly deposits as a share of TVL, mean
+    burn_rate: float = 0.002  # hourly burn requests as a share of supply, mean
+    flow_dispersion: float = 1.0  # lognormal sigma of the flows
+    keeper_lag: float = 2.0  # mean hours between a new window opening and the harvest
+    invested: float = 0.9  # share of the TVL in the strategy at start
+
+
+DEFAULT_GRID = {
+    "harvest_delay": [6 * HOUR, 12 * HOUR, 24 * HOUR],
+    "harvest_window": [0, HOUR, 3 * HOUR],
+    "harvest_fee_percent": [0.0, 0.1],
+    "burning_fee_percent": [0.0, 0.005],
+}
+
+
+def grid(**values):
+    """Every combination of the parameter values, windows longer than the delay are left out."""
+    keys = list(DEFAULT_GRID)
+    combos = itertools.product(*(values.get(k, DEFAULT_GRID[k]) for k in keys))
+    params = [VaultParams(**dict(zip(keys, c))) for c in combos]
+    return [p for p in params if p.harvest_window <= p.harvest_delay]
+
+
+def simulate(params, market, n, steps=STEPS, seed=None):
+    """Simulates `n` scenarios of `params`, returns per scenario metrics."""
+    rng = np.random.default_rng(seed)
+    dt = 1 / HOURS_PER_YEAR
+
+    tvl = 1.0
+    float_ = np.full(n, tvl * (1 - market.invested))
+    value = np.full(n, tvl * market.invested)  # what the strategy holds
+    balance = value.copy()  # what the vault recorded for it
+    holdings = value.copy()
+    supply = np.full(n, tvl)
+    pending = np.zeros(n)
+
+    max_locked = np.zeros(n)
+    last_harvest = np.full(n, -float(params.harvest_delay))
+    window_start = last_harvest.copy()
+    lag = rng.exponential(market.keeper_lag * HOUR, n)
+
+    fees = np.zeros(n)
+    profit_total = np.zeros(n)
+    dilution = np.zeros(n)
+    log_returns = np.empty((steps, n))
+
+    def locked(now):
+        if params.harvest_delay == 0:
+            return np.zeros(n)
+        elapsed = np.clip(now - last_harvest, 0, params.harvest_delay)
+        return max_locked * (1 - elapsed / params.harvest_delay)
+
+    def rate(now):
+        return (holdings - locked(now) + float_) / supply
+
+    previous = rate(0.0)
+    drift = (market.strategy_apr - market.strategy_volatility**2 / 2) * dt
+    shock = market.strategy_volatility * np.sqrt(dt)
+    flow = -market.flow_dispersion**2 / 2
+
+    for step in range(steps):
+        now = float((step + 1) * HOUR)
+        value *= np.exp(drift + shock * rng.standard_normal(n))
+
+        # deposits buy shares at the current rate, part of the locked profit goes with them
+        current = rate(now)
+        deposits = market.deposit_rate * supply * current * rng.lognormal(flow, market.flow_dispersion, n)
+        shares = deposits / current
+        dilution += shares / (supply + shares) * locked(now)
+        supply += shares
+        float_ += deposits
+
+        # burn requests move shares to the vault, they are still part of the supply
+        pending += market.burn_rate * (supply - pending) * rng.lognormal(flow, market.flow_dispersion, n)
+
+        # harvests, a new window after the delay and the keeper lag, or again inside an open window
+        new_window = now >= last_harvest + params.harvest_delay + lag
+        in_window = (now < last_harvest + params.harvest_delay) & (now <= window_start + params.harvest_window)
+        harvest = new_window | (in_window & (value > balance))
+
+        profit = np.where(harvest, np.maximum(value - balance, 0), 0)
+        harvest_fees = profit * params.harvest_fee_percent
+        fee_shares = harvest_fees / rate(now)
+
+        max_locked = np.where(harvest, locked(now) + profit - harvest_fees, max_locked)
+        holdings = np.where(harvest, value, holdings)
+        balance = np.where(harvest, value, balance)
+        window_start = np.where(new_window, now, window_start)
+        last_harvest = np.where(harvest, now, last_harvest)
+        lag = np.where(new_window, rng.exponential(market.keeper_lag * HOUR, n), lag)
+        supply += fee_shares
+        fees += harvest_fees
+        profit_total += profit
+
+        # the float is invested at every harvest
+        invest = np.where(harvest, float_, 0)
+        float_ -= invest
+        value += invest
+        balance += invest
+        holdings += invest
+
+        # batch burns execute once the locked profit is released, the strategy covers the shortfall
+        burn = (now >= last_harvest + params.harvest_delay) & (pending > 0)
+        amount = np.where(burn, pending * rate(now), 0)
+        shortfall = np.maximum(amount - float_, 0)
+        value -= shortfall
+        balance -= shortfall
+        holdings -= shortfall
+        float_ += shortfall - amount
+        supply -= np.where(burn, pending, 0)
+        fees += amount * params.burning_fee_percent
+        pending = np.where(burn, 0, pending)
+
+        current = rate(now)
+        log_returns[step] = np.log(current / previous)
+        previous = current
+
+    return {
+        "volatility": log_returns.std(axis=0) * np.sqrt(HOURS_PER_YEAR),
+        "dilution": np.divide(dilution, profit_total, out=np.zeros(n), where=profit_total > 0),
+        "fees": fees / tvl,
+    }
+
+
+def _summarize(metrics):
+    return {
+        name: {f"p{p}": float(v) for p, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))}
+        for name, values in metrics.items()
+    }
+
+
+def _simulate_block(args):
+    index, params, market, n, steps, seed = args
+    return index, simulate(params, market, n, steps, seed)
+
+
+def sweep(params, scenarios, market=Market(), steps=STEPS, block=BLOCK, workers=None, seed=0):
+    """Runs `scenarios` scenarios of every parameter set over a process pool.
+
+    Returns one `{"params", "metrics"}` entry per set, metrics as percentiles.
+    Results only depend on `seed`, not on the number of workers.
+    """
+    tasks = []
+    seeds = np.random.SeedSequence(seed).spawn(len(params))
+    for i, (p, s) in enumerate(zip(params, seeds)):
+        sizes = [block] * (scenarios // block) + ([scenarios % block] if scenarios % block else [])
+        tasks += [(i, p, market, n, steps, child) for n, child in zip(sizes, s.spawn(len(sizes)))]
+
+    blocks = [[] for _ in params]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for i, metrics in executor.map(_simulate_block, tasks):
+            blocks[i].append(metrics)
+
+    return [
+        {
+            "params": asdict(p),
+            "metrics": _summarize({name: np.concatenate([b[name] for b in bs]) for name in bs[0]}),
+        }
+        for p, bs in zip(params, blocks)
+    ]
+
+
+def main(scenarios=10_000, steps=STEPS, directory="reports"):
+    params = grid()
+    start = time.perf_counter()
+    results = sweep(params, int(scenarios), steps=int(steps))
+    elapsed = time.perf_counter() - start
+
+    print(f"{'delay':>6}{'window':>7}{'hfee':>6}{'bfee':>7}  {'volatility p50/p95':>20}{'dilution p50/p95':>20}{'fees p50':>10}")
+    for r in results:
+        p, m = r["params"], r["metrics"]
+        print(
+            f"{p['harvest_delay'] // HOUR:>5}h{p['harvest_window'] // HOUR:>6}h"
+            f"{p['harvest_fee_percent']:>6.2f}{p['burning_fee_percent']:>7.3f}"
+            f"  {m['volatility']['p50']:>9.4f}/{m['volatility']['p95']:<10.4f}"
+            f"{m['dilution']['p50']:>9.4f}/{m['dilution']['p95']:<10.4f}{m['fees']['p50']:>10.5f}"
+        )
+    print(f"{len(params)} parameter sets x {scenarios} scenarios in {elapsed:.1f}s")
+
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"monte-carlo-{int(time.time())}.json")
+    with open(path, "w") as f:
+        json.dump({"scenarios": int(scenarios), "steps": int(steps), "market": asdict(Market()), "results": results}, f, indent=4)
+    print(f"results written to {path}")
@@ -0,0 +1,133 @@
+"""Parallel test runner for every brownie project in the repository.
+
+Each project's suite runs with pytest-xdist. Brownie starts one ganache per
+worker (the development port plus the worker id), so workers get their own
+chain, accounts and deployments. `--dist loadscope` keeps a test module on one
+worker, so the module-scoped fixtures are deployed once per module and the
+`fn_isolation` snapshots stay valid. Projects run one after another, because two
+concurrent projects would start their workers on the same ports. The JUnit
+reports of all projects are merged into one. brownie 1.19 and older only
+distribute a suite when every test uses `module_isolation` (directly or through
+`fn_isolation`), otherwise the workers collect nothing, so every test directory
+has an autouse isolation fixture.
+
+`--compare` runs every project serially first, then on the workers, and prints
+the wall times and speedup, also to the GitHub job summary. It doubles the run
+time, so CI only compares in the scaling workflow (weekly and on demand).
+
+    python scripts/parallel_test.py                     # every project, one worker per core
+    python scripts/parallel_test.py -n 4 vaults         # only vaults, 4 chains
+    python scripts/parallel_test.py -n 0 vaults         # serial, one chain
+    python scripts/parallel_test.py --compare vaults    # serial, then parallel, with timings
+    python scripts/parallel_test.py -- -k batch_burn    # arguments after -- go to pytest
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+import xml.etree.ElementTree as ET
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+REPORTS = os.path.join(ROOT, "vaults", "reports", "tests")
+
+
+def projects():
+    """Brownie projects with a test suite, relative to the repository root."""
+    found = []
+    for parent in (".", "strategies"):
+        for name in sorted(os.listdir(os.path.join(ROOT, parent))):
+            path = os.path.normpath(os.path.join(parent, name))
+            if os.path.isfile(os.path.join(ROOT, path, "brownie-config.yaml")) and os.path.isdir(
+                os.path.join(ROOT, path, "tests")
+            ):
+                found.append(path)
+    return found
+
+
+def build_command(workers, report, pytest_args):
+    distribute = ["-n", str(workers), "--dist", "loadscope"] if workers else []
+    return ["brownie", "test"] + distribute + [f"--junitxml={report}"] + pytest_args
+
+
+def run_project(project, workers, pytest_args, suffix=""):
+    report = os.path.join(REPORTS, project.replace(os.sep, "-") + suffix + ".xml")
+    command = build_command(workers, report, pytest_args)
+
+    start = time.perf_counter()
+    code = subprocess.call(command, cwd=os.path.join(ROOT, project))
+    return report, code, time.perf_counter() - start
+
+
+def merge_reports(reports, path):
+    """Merges JUnit reports into one `<testsuites>` document, returns the totals."""
+    merged = ET.Element("testsuites")
+    totals = dict.fromkeys(("tests", "failures", "errors", "skipped"), 0)
+    totals["time"] = 0.0
+
+    for project, report in reports:
+        if not os.path.exists(report):
+            continue
+        root = ET.parse(report).getroot()
+        for suite in [root] if root.tag == "testsuite" else root.findall("testsuite"):
+            suite.set("name", project)
+            merged.append(suite)
+            for key in totals:
+                totals[key] += type(totals[key])(suite.get(key, 0))
+
+    for key, value in totals.items():
+        merged.set(key, str(value))
+    ET.ElementTree(merged).write(path, encoding="utf-8", xml_declaration=True)
+    return totals
+
+
+def print_speedup(results, serial, workers):
+    lines = [f"| project | serial | {workers} workers | speedup |", "| --- | ---: | ---: | ---: |"]
+    for project, _, _, elapsed in results:
+        lines.append(f"| {project} | {serial[project]:.1f}s | {elapsed:.1f}s | {serial[project] / elapsed:.2f}x |")
+
+    print("\n" + "\n".join(lines))
+    summary = os.environ.get("GITHUB_STEP_SUMMARY")
+    if summary:
+        with open(summary, "a") as f:
+            f.write("\n".join(lines) + "\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("-n", "--workers", default="auto", help="chains per project, 'auto' is one per core, 0 is serial")
+    parser.add_argument("--compare", action="store_true", help="run every project serially first and report the speedup")
+    parser.add_argument("projects", nargs="*", help="projects to test, all of them by default")
+    argv = sys.argv[1:] if argv is None else argv
+    split = argv.index("--") if "--" in argv else len(argv)
+    args = parser.parse_args(argv[:split])
+    pytest_args = argv[split + 1 :]
+
+    workers = os.cpu_count() if args.workers == "auto" else int(args.workers)
+    selected = [os.path.normpath(p) for p in args.projects] or projects()
+    os.makedirs(REPORTS, exist_ok=True)
+
+    results, serial = [], {}
+    for project in selected:
+        if args.compare:
+            print(f"==> {project}: serial", flush=True)
+            serial[project] = run_project(project, 0, pytest_args, suffix="-serial")[2]
+        print(f"==> {project}: {workers} workers", flush=True)
+        results.append((project,) + run_project(project, workers, pytest_args))
+
+    totals = merge_reports([(p, r) for p, r, _, _ in results], os.path.join(REPORTS, "junit.xml"))
+
+    print()
+    for project, _, code, elapsed in results:
+        print(f"{project:<32}{'passed' if code == 0 else f'failed ({code})':<16}{elapsed:>8.1f}s")
+    print(
+        f"{totals['tests']} tests, {totals['failures']} failures, {totals['errors']} errors, "
+        f"{totals['skipped']} skipped, merged report in {os.path.relpath(REPORTS, ROOT)}/junit.xml"
+    )
+    if serial:
+        print_speedup(results, serial, workers)
+    return max((code for _, _, code, _ in results), default=0)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
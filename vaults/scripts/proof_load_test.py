@@ -0,0 +1,81 @@
+"""Load test of the proof server.
+
+Worker processes keep one HTTP connection each and request proofs of addresses
+drawn from the index, `hot` of them from a small hot set so the cache hit rate
+is close to what a whitelist launch looks like. Reports throughput and latency
+percentiles, the server should sustain thousands of requests per second on one
+core.
+
+    brownie run scripts/proof_server main <merkle auth>          # in another shell
+    brownie run scripts/proof_load_test                           # 20000 requests over 8 connections
+    brownie run scripts/proof_load_test main http://127.0.0.1:8080 data/merkle.index 100000 16
+"""
+import http.client
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlsplit
+
+import numpy as np
+from auxo_keeper.simulation import save_benchmark
+
+from scripts.merkle_tree import INDEX_PATH, ProofIndex
+from scripts.proof_server import PORT
+
+HOT_SET = 1_000
+
+
+def _worker(task):
+    url, addresses = task
+    parts = urlsplit(url)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port)
+    latencies, errors = [], 0
+    # wall clock, the only clock comparable across the worker processes
+    started = time.time()
+    for address in addresses:
+        start = time.perf_counter()
+        conn.request("GET", f"/proof/{address}")
+        response = conn.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - start)
+        errors += response.status != 200
+    finished = time.time()
+    conn.close()
+    return latencies, errors, started, finished
+
+
+def sample_addresses(index, n, hot=0.8, seed=0):
+    """`n` whitelisted addresses, a `hot` share of them from the first `HOT_SET` picks."""
+    rng = random.Random(seed)
+    hot_set = [index.entry(rng.randrange(len(index)))[0] for _ in range(min(HOT_SET, len(index)))]
+    return [rng.choice(hot_set) if rng.random() < hot else index.entry(rng.randrange(len(index)))[0] for _ in range(n)]
+
+
+def load_test(url, addresses, connections):
+    tasks = [(url, addresses[i::connections]) for i in range(connections)]
+    with ProcessPoolExecutor(max_workers=connections) as executor:
+        results = list(executor.map(_worker, tasks))
+    # from the first request to the last response, pool startup and teardown are left out
+    elapsed = max(r[3] for r in results) - min(r[2] for r in results)
+
+    latencies = np.concatenate([r[0] for r in results]) * 1000
+    return {
+        "requests": len(latencies),
+        "errors": sum(r[1] for r in results),
+        "seconds": elapsed,
+        "requests_per_second": len(latencies) / elapsed,
+        "latency_ms": {f"p{q}": float(np.percentile(latencies, q)) for q in (50, 95, 99)},
+    }
+
+
+def main(url=f"http://127.0.0.1:{PORT}", index_path=INDEX_PATH, requests=20_000, connections=8, hot=0.8):
+    with ProofIndex(index_path) as index:
+        addresses = sample_addresses(index, int(requests), float(hot))
+    results = load_test(url, addresses, int(connections))
+
+    print(
+        f"{results['requests']} requests, {results['errors']} errors in {results['seconds']:.1f}s: "
+        f"{results['requests_per_second']:.0f} req/s, latency ms "
+        + " ".join(f"{k} {v:.2f}" for k, v in results["latency_ms"].items())
+    )
+    print(f"results written to {save_benchmark('proof-load-test', results)}")
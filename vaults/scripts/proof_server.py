@@ -0,0 +1,211 @@
+"""HTTP service returning `MerkleAuth.authorize` calldata from a proof index.
+
+Proofs are read from the memory-mapped index written by `scripts/merkle_tree`
+and the encoded responses of hot addresses are kept in an LRU cache. A watcher
+thread polls `merkleRoot()` and the index file: once the file on disk has the
+root set on chain, a new index and an empty cache are swapped in with a single
+reference assignment, so a request is answered from one tree, never a mix. The
+old index is left to the garbage collector rather than closed under requests
+still reading it. While the chain root and the served root differ, proofs would
+revert and requests get a 503.
+
+    GET /proof/<address>           every whitelisted role of the address
+    GET /proof/<address>/<role>    one role
+    GET /health                    served root, entry count, cache stats
+
+    brownie run scripts/proof_server main <merkle auth> --network ftm-main       # serves data/merkle.index on :8080
+    brownie run scripts/proof_server main <merkle auth> data/merkle.index 9000
+"""
+import functools
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from eth_hash.auto import keccak
+
+from scripts.merkle_tree import INDEX_PATH, ProofIndex
+
+PORT = 8080
+CACHE_SIZE = 100_000
+POLL_INTERVAL = 5
+
+AUTHORIZE_SELECTOR = keccak(b"authorize(address,uint8,bytes32[])")[:4]
+
+
+def authorize_calldata(address, role, proof):
+    """ABI encoded `authorize(address, uint8, bytes32[])` call."""
+    head = bytes(12) + bytes.fromhex(address[2:]) + role.to_bytes(32, "big") + (3 * 32).to_bytes(32, "big")
+    return AUTHORIZE_SELECTOR + head + len(proof).to_bytes(32, "big") + b"".join(proof)
+
+
+class _Tree:
+    """An index and the cache of responses built from it, swapped together."""
+
+    def __init__(self, index, cache_size):
+        self.index = index
+        self.root = "0x" + index.root.hex()
+        self.lookup = functools.lru_cache(maxsize=cache_size)(self._lookup)
+
+    def _lookup(self, address, role):
+        roles = self.index.roles(address) if role is None else [role]
+        proofs = []
+        for r in roles:
+            try:
+                proof = self.index.proof(address, r)
+            except KeyError:
+                return None
+            proofs.append(
+                {
+                    "role": r,
+                    "proof": ["0x" + p.hex() for p in proof],
+                    "calldata": "0x" + authorize_calldata(address, r, proof).hex(),
+                }
+            )
+        if not proofs:
+            return None
+        return json.dumps({"address": address, "root": self.root, "proofs": proofs}).encode()
+
+
+class ProofService:
+    def __init__(self, path=INDEX_PATH, cache_size=CACHE_SIZE):
+        self.path = path
+        self.cache_size = cache_size
+        self.chain_root = None
+        self._file = self._stat()
+        self._candidate = None
+        self.tree = _Tree(ProofIndex(path), cache_size)
+
+    def _stat(self):
+        stat = os.stat(self.path)
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    @property
+    def stale(self):
+        return self.chain_root is not None and self.chain_root != self.tree.index.root
+
+    def lookup(self, address, role=None):
+        """Encoded response for `address` (and `role`), None if it is not whitelisted."""
+        address = address.lower()
+        if not address.startswith("0x") or len(address) != 42:
+            raise ValueError(f"proof server: bad address {address}")
+        int(address, 16)
+        return self.tree.lookup(address, role)
+
+    def refresh(self, chain_root=None):
+        """Swaps to the index on disk if it changed and has `chain_root`, returns whether it swapped.
+
+        Called from a single watcher thread. `chain_root` None swaps to any new index.
+        """
+        if chain_root is not None:
+            self.chain_root = chain_root
+        file = self._stat()
+        if file != self._file:
+            self._file = file
+            # candidates are never served, a replaced or unneeded one can be closed right away
+            if self._candidate is not None:
+                self._candidate.close()
+            candidate = ProofIndex(self.path)
+            if candidate.root == self.tree.index.root:
+                candidate.close()
+                candidate = None
+            self._candidate = candidate
+
+        candidate = self._candidate
+        if candidate is None or (self.chain_root is not None and candidate.root != self.chain_root):
+            return False
+        self.tree = _Tree(candidate, self.cache_size)
+        self._candidate = None
+        return True
+
+    def health(self):
+        tree = self.tree
+        info = tree.lookup.cache_info()
+        return {
+            "root": tree.root,
+            "entries": len(tree.index),
+            "stale": self.stale,
+            "chain_root": None if self.chain_root is None else "0x" + self.chain_root.hex(),
+            "cache": {"hits": info.hits, "misses": info.misses, "size": info.currsize, "max_size": info.maxsize},
+        }
+
+
+class ProofHandler(BaseHTTPRequestHandler):
+    # keep-alive, the load is many small requests. Headers and body are buffered and flushed
+    # once per request, as two writes they stall on the client's delayed ACK
+    protocol_version = "HTTP/1.1"
+    wbufsize = -1
+
+    def do_GET(self):
+        service = self.server.service
+        parts = urlsplit(self.path).path.strip("/").split("/")
+
+        if parts == ["health"]:
+            return self._send(200, json.dumps(service.health()).encode())
+        if parts[0] != "proof" or len(parts) not in (2, 3):
+            return self._error(404, "not found")
+        if service.stale:
+            return self._error(503, "index root does not match the chain root")
+        try:
+            role = int(parts[2]) if len(parts) == 3 else None
+            body = service.lookup(parts[1], role)
+        except ValueError as e:
+            return self._error(400, str(e))
+        if body is None:
+            return self._error(404, "not whitelisted")
+        self._send(200, body)
+
+    def _error(self, status, message):
+        self._send(status, json.dumps({"error": message}).encode())
+
+    def _send(self, status, body):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(service, host="127.0.0.1", port=PORT):
+    """The server of `service`, not yet started, `port` 0 picks a free port."""
+    server = ThreadingHTTPServer((host, port), ProofHandler)
+    server.daemon_threads = True
+    server.service = service
+    return server
+
+
+def watch(service, chain_root, stop, interval=POLL_INTERVAL):
+    """Refreshes `service` against `chain_root()` every `interval` seconds until `stop` is set."""
+    while not stop.wait(interval):
+        try:
+            if service.refresh(chain_root()):
+                print(f"swapped to root {service.tree.root}")
+        except Exception as e:
+            # a failed poll keeps the current tree, the next one retries
+            print(f"refresh failed: {e!r}")
+
+
+def main(merkle_auth, index_path=INDEX_PATH, port=PORT, cache_size=CACHE_SIZE):
+    from brownie import MerkleAuth
+
+    contract = MerkleAuth.at(merkle_auth)
+    service = ProofService(index_path, int(cache_size))
+    service.refresh(bytes(contract.merkleRoot()))
+    if service.stale:
+        print(f"index root {service.tree.root} does not match the chain root, waiting for a matching index")
+
+    stop = threading.Event()
+    threading.Thread(target=watch, args=(service, lambda: bytes(contract.merkleRoot()), stop), daemon=True).start()
+    server = serve(service, port=int(port))
+    print(f"serving {len(service.tree.index)} entries on http://127.0.0.1:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        server.server_close()
@@ -0,0 +1,167 @@
+"""Harvest scheduling from the vaults' harvest window state.
+
+`Vault.harvest` succeeds when a new window can start (`lastHarvest + harvestDelay`
+has passed) or while the current window is open (`lastHarvestWindowStart +
+harvestWindow`), anything else reverts with `harvest::BAD_HARVEST_TIME`. The
+scheduler derives the next valid slot of every vault from its snapshot and
+queues a harvest when the slot is open and either a strategy has a loss to
+register or the profit the harvest would register is worth more than its gas.
+
+    brownie run scripts/scheduler --network ftm-main    # fleet schedule and next run
+"""
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+
+from brownie import interface, web3
+from brownie.exceptions import VirtualMachineError
+from eth_utils import to_checksum_address
+
+WFTM = "0x21be370d5312f44cb42ce377bc9b8a0cef1a4c83"
+SPOOKY_ROUTER = "0xF491e7B69E4244ad4002BC14e878a34207E38c29"
+
+# `Vault.harvest` gas, a fixed part plus one `estimatedUnderlying` call and storage update per strategy
+HARVEST_GAS = 100_000
+HARVEST_GAS_PER_STRATEGY = 50_000
+
+# the harvest lands a few blocks after the snapshot, don't aim at the last seconds of a window
+SLOT_MARGIN = 60
+
+
+@dataclass(frozen=True)
+class HarvestSlot:
+    opens: int
+    closes: Optional[int]  # None when a new window starts, it stays open until harvested
+    new_window: bool
+
+
+@dataclass(frozen=True)
+class HarvestDecision:
+    vault: str
+    slot: HarvestSlot
+    strategies: Tuple[str, ...]
+    profit: int
+    loss: int
+    gas_cost: int
+    harvest_now: bool
+
+    @property
+    def reason(self):
+        if self.harvest_now:
+            return "harvest"
+        if not self.strategies:
+            return "no profit"
+        if not self.loss and self.profit <= self.gas_cost:
+            return "profit below gas"
+        return "window closed"
+
+
+def next_slot(snapshot, margin=SLOT_MARGIN):
+    """Earliest time from `snapshot.timestamp` on at which `harvest` does not revert."""
+    now = snapshot.timestamp
+    new_window_at = snapshot.last_harvest + snapshot.harvest_delay
+    window_closes = snapshot.last_harvest_window_start + snapshot.harvest_window
+
+    if now >= new_window_at:
+        return HarvestSlot(opens=now, closes=None, new_window=True)
+    if now + margin <= window_closes:
+        return HarvestSlot(opens=now, closes=window_closes, new_window=False)
+    return HarvestSlot(opens=new_window_at, closes=None, new_window=True)
+
+
+def harvest_gas(strategies):
+    return HARVEST_GAS + HARVEST_GAS_PER_STRATEGY * strategies
+
+
+def native_price(underlying, block_number=None, router=SPOOKY_ROUTER):
+    """Underlying units one native token (1e18 wei) is worth at `block_number`.
+
+    None when the router has no direct WFTM pair for `underlying`, the gas check
+    is skipped for that vault rather than failing the whole run.
+    """
+    if underlying.lower() == WFTM:
+        return 10**18
+    try:
+        return interface.IUniswapV2Router(router).getAmountsOut(
+            10**18, [to_checksum_address(WFTM), underlying], block_identifier=block_number
+        )[-1]
+    except (ValueError, VirtualMachineError) as e:
+        print(f"no WFTM price for {underlying}, harvesting without a gas check: {e}")
+        return None
+
+
+def schedule(snapshot, strategies, gas_price, price):
+    """Decides whether to harvest `strategies` of `snapshot`'s vault now.
+
+    Every strategy with a profit or a loss to register is harvested. A loss is
+    always worth harvesting: until it is, `totalStrategyHoldings` and the
+    exchange rate overstate the vault and users burning shares exit at the
+    expense of the others. Otherwise the profit has to be worth more than the
+    gas (`gas_price` in wei, `price` from `native_price`, None skips the check).
+    """
+    slot = next_slot(snapshot)
+
+    changed = tuple(
+        s
+        for s in map(to_checksum_address, strategies)
+        if snapshot.strategies[s].profit > 0 or snapshot.strategies[s].loss > 0
+    )
+    profit = sum(snapshot.strategies[s].profit for s in changed)
+    loss = sum(snapshot.strategies[s].loss for s in changed)
+    gas_cost = harvest_gas(len(changed)) * gas_price * (price or 0) // 10**18
+
+    return HarvestDecision(
+        vault=snapshot.address,
+        slot=slot,
+        strategies=changed,
+        profit=profit,
+        loss=loss,
+        gas_cost=gas_cost,
+        harvest_now=bool(changed) and slot.opens <= snapshot.timestamp and (loss > 0 or profit > gas_cost),
+    )
+
+
+def next_run(decisions, now):
+    """When the keeper should run next: now if a harvest is due, else when the next slot opens."""
+    if any(d.harvest_now for d in decisions):
+        return now
+    pending = [d.slot.opens for d in decisions if d.strategies and d.slot.opens > now]
+    return min(pending) if pending else None
+
+
+def _format(timestamp):
+    if timestamp is None:
+        return "-"
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime("%Y-%m-%d %H:%M")
+
+
+def main():
+    from scripts.abi_registry import ContractRegistry
+    from scripts.harvest import vaults
+    from scripts.vault_snapshot import take_vault_snapshots
+
+    snapshots = take_vault_snapshots(vaults, ContractRegistry())
+    gas_price = web3.eth.gas_price
+
+    decisions = [
+        schedule(s, v["harvest_strategies"], gas_price, native_price(s.underlying, s.block_number))
+        for v, s in zip(vaults, snapshots)
+    ]
+
+    print(f"{'vault':<28}{'opens':>18}{'closes':>18}{'profit':>14}{'gas':>12}  action")
+    for s, d in zip(snapshots, decisions):
+        print(
+            f"{s.name[:27]:<28}{_format(d.slot.opens):>18}{_format(d.slot.closes):>18}"
+            f"{d.profit / s.base_unit:>14.4f}{d.gas_cost / s.base_unit:>12.4f}  {d.reason}"
+        )
+
+    now = snapshots[0].timestamp
+    run_at = next_run(decisions, now)
+    if run_at is None:
+        print("nothing to harvest")
+        return
+
+    # cron fields of the next run, UTC
+    at = datetime.fromtimestamp(run_at, timezone.utc)
+    print(f"next run: {_format(run_at)} UTC")
+    print(f"cron: {at.minute} {at.hour} {at.day} {at.month} * brownie run scripts/harvest")
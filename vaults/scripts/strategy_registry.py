@@ -0,0 +1,181 @@
+"""Cached capabilities of the strategies managed by the keeper.
+
+Keepers used to decide per deposit whether a strategy needs `depositUnderlying`
+by comparing its on-chain `name()` to hard-coded strings. Capabilities (type,
+how deposits are invested, underlying and vault) are now built once per
+deployment and stored next to the registry file. The type comes from the
+contract the `ContractRegistry` pinned for the address, then from functions
+only its ABI has, then from `name()`, which is read in the same multicall as
+`underlying` and `vault`. An entry is rebuilt only when the registry pins new
+code for its address.
+
+    brownie run scripts/strategy_registry --network ftm-main    # rebuild and print
+"""
+import json
+import os
+import tempfile
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+from brownie import multicall
+from eth_utils import to_checksum_address
+
+# strategy contracts of this repo, by contract name
+KINDS = {
+    "TarotLenderStrategy": "Tarot",
+    "BeetsStrategy": "Beets",
+    "HundredFinanceStrategy": "HundredFinance",
+    "BalancerV2Strategy": "BalancerV2",
+    "MockStrategy": "Mock",
+}
+
+# functions only one kind of strategy has, for ABIs pinned from the explorer
+ABI_MARKERS = {
+    "borrowableBalance": "Tarot",
+    "setMasterchef": "Beets",
+    "cTokenBalance": "HundredFinance",
+    "sellBal": "BalancerV2",
+}
+
+# lower case `name()` fragments of deployed strategies
+NAME_MARKERS = {
+    "tarot": "Tarot",
+    "beets": "Beets",
+    "beethoven": "Beets",
+    "hundred": "HundredFinance",
+    "balancer": "BalancerV2",
+}
+
+# kinds that put deposits to work on their own
+AUTO_INVESTS = set()
+
+# kinds whose `depositUnderlying` joins a pool and takes the minimum underlying
+# deposited, not an amount, the rest take the amount to invest
+MIN_DEPOSITED = {"Beets", "BalancerV2"}
+DEPOSIT_SLIPPAGE_BPS = 100
+
+# strategies deployed from outside this repo, their code cannot be matched to a kind
+OVERRIDES = {
+    # BeethovenLPSingleSided USDC
+    "0x7ee2de6C955aB59d9bBF7691590b871cd324aD93": {"kind": "Beets", "auto_invests": True},
+}
+
+
+@dataclass(frozen=True)
+class StrategyCapabilities:
+    address: str
+    name: str
+    kind: Optional[str]
+    auto_invests: bool
+    min_deposited: bool
+    underlying: str
+    vault: str
+    code_hash: str
+
+    @property
+    def needs_deposit_underlying(self):
+        return not self.auto_invests
+
+    def deposit_underlying_argument(self, amount):
+        """`depositUnderlying` argument once `amount` was deposited into the strategy."""
+        if self.min_deposited:
+            return amount * (10_000 - DEPOSIT_SLIPPAGE_BPS) // 10_000
+        return amount
+
+
+def strategy_kind(contract_name, abi, name):
+    """Kind of a strategy from its pinned contract name, its ABI or its `name()`."""
+    if contract_name in KINDS:
+        return KINDS[contract_name]
+    functions = {item.get("name") for item in abi or [] if item.get("type") == "function"}
+    for function, kind in ABI_MARKERS.items():
+        if function in functions:
+            return kind
+    for fragment, kind in NAME_MARKERS.items():
+        if fragment in name.lower():
+            return kind
+    return None
+
+
+class StrategyRegistry:
+    def __init__(self, registry, path=None, overrides=OVERRIDES):
+        self.registry = registry
+        self.path = path or os.path.join(os.path.dirname(registry.path), "strategies.json")
+        self.overrides = {to_checksum_address(a): o for a, o in overrides.items()}
+        self.strategies = {}
+
+        try:
+            with open(self.path) as f:
+                self.strategies = {a: StrategyCapabilities(**c) for a, c in json.load(f).items()}
+        except (FileNotFoundError, TypeError):
+            # missing, or written with other fields, everything is read again
+            self.strategies = {}
+
+    def save(self):
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump({a: asdict(c) for a, c in self.strategies.items()}, f)
+        os.replace(tmp, self.path)
+
+    def _stale(self, address):
+        cached = self.strategies.get(address)
+        pinned = self.registry.contracts.get(address)
+        return cached is None or pinned is None or cached.code_hash != pinned["codeHash"]
+
+    def build(self, addresses, refresh=False):
+        """Reads the capabilities of `addresses` that are not cached (all of them with `refresh`)."""
+        addresses = list(dict.fromkeys(to_checksum_address(a) for a in addresses))
+        missing = [a for a in addresses if refresh or self._stale(a)]
+        if not missing:
+            return
+
+        contracts = [self.registry.contract(a, "BaseStrategy") for a in missing]
+        with multicall:
+            reads = [(s.name(), s.underlying(), s.vault()) for s in contracts]
+
+        for s, (name, underlying, vault) in zip(contracts, reads):
+            entry = self.registry.contracts[s.address]
+            override = self.overrides.get(s.address, {})
+            kind = override.get("kind") or strategy_kind(entry["name"], self.registry.abis.get(entry["name"]), str(name))
+
+            self.strategies[s.address] = StrategyCapabilities(
+                address=s.address,
+                name=str(name),
+                kind=kind,
+                auto_invests=override.get("auto_invests", kind in AUTO_INVESTS),
+                min_deposited=kind in MIN_DEPOSITED,
+                underlying=str(underlying),
+                vault=str(vault),
+                code_hash=entry["codeHash"],
+            )
+
+        self.save()
+
+    def __getitem__(self, address):
+        address = to_checksum_address(address)
+        self.build([address])
+        return self.strategies[address]
+
+
+def keeper_strategies(vaults):
+    strategies = []
+    for v in vaults:
+        strategies += [*v["harvest_strategies"], *v["deposit_strategies"]]
+    return list(dict.fromkeys(map(to_checksum_address, strategies)))
+
+
+def main():
+    from scripts.abi_registry import ContractRegistry
+    from scripts.harvest import vaults
+
+    strategies = StrategyRegistry(ContractRegistry())
+    strategies.build(keeper_strategies(vaults), refresh=True)
+
+    print(f"{'strategy':<44}{'name':<32}{'kind':<16}{'auto':<6}{'min':<6}vault")
+    for c in strategies.strategies.values():
+        print(
+            f"{c.address:<44}{c.name[:31]:<32}{str(c.kind):<16}{str(c.auto_invests):<6}{str(c.min_deposited):<6}{c.vault}"
+        )
@@ -0,0 +1,427 @@
+"""Integer-exact Python model of `Vault.sol` accounting.
+
+`VaultModel` mirrors the storage of a vault and replays its state changing
+calls with the same `FixedPointMathLib` rounding, the same order of checks and
+the same revert strings, so keepers can predict the outcome of a call and
+tests can run millions of steps without a chain. Strategies behave like
+`MockStrategy`: their estimated underlying is the underlying they hold.
+
+Not modelled: auth (every caller is authorized), underlying allowances
+(always sufficient) and events. Block time is set with `advance`.
+
+    vault = VaultModel(decimals=18)
+    vault.mint_underlying("alice", 10**18)
+    vault.deposit("alice", "alice", 10**18)
+    vault.advance(seconds=60, blocks=1)
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from scripts.fixed_point import MAX_UINT256, WAD, fdiv, fmul
+
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+MAX_STRATEGIES = 20
+
+# revert messages brownie reports for solidity panics and bare reverts
+OVERFLOW = "Integer overflow"
+DIVISION_BY_ZERO = "Division or modulo by zero"
+BARE_REVERT = None
+
+
+class VaultRevert(Exception):
+    def __init__(self, message=BARE_REVERT):
+        super().__init__(message)
+        self.message = message
+
+
+def _require(condition, message=BARE_REVERT):
+    if not condition:
+        raise VaultRevert(message)
+
+
+def _add(x, y):
+    _require(x + y <= MAX_UINT256, OVERFLOW)
+    return x + y
+
+
+def _sub(x, y):
+    _require(x >= y, OVERFLOW)
+    return x - y
+
+
+def _fmul(x, y, base_unit):
+    try:
+        return fmul(x, y, base_unit)
+    except OverflowError:
+        raise VaultRevert()
+
+
+def _fdiv(x, y, base_unit):
+    try:
+        return fdiv(x, y, base_unit)
+    except (OverflowError, ZeroDivisionError):
+        raise VaultRevert()
+
+
+def _cast(x, bits):
+    _require(x < 2**bits)
+    return x
+
+
+@dataclass
+class StrategyData:
+    trusted: bool = False
+    balance: int = 0
+
+
+@dataclass
+class BatchBurn:
+    total_shares: int = 0
+    amount_per_share: int = 0
+
+
+@dataclass
+class BatchBurnReceipt:
+    round: int = 0
+    shares: int = 0
+
+
+@dataclass
+class VaultModel:
+    decimals: int = 18
+    timestamp: int = 0
+    block_number: int = 0
+
+    paused: bool = True
+    blocks_per_year: int = 0
+    harvest_fee_percent: int = 0
+    harvest_fee_receiver: str = ZERO_ADDRESS
+    burning_fee_percent: int = 0
+    burning_fee_receiver: str = ZERO_ADDRESS
+    harvest_window: int = 0
+    harvest_delay: int = 0
+    next_harvest_delay: int = 0
+    total_strategy_holdings: int = 0
+    last_harvest_exchange_rate: int = 0
+    last_harvest_interval_in_blocks: int = 0
+    last_harvest_window_start_block: int = 0
+    last_harvest_window_start: int = 0
+    last_harvest: int = 0
+    max_locked_profit: int = 0
+    withdrawal_queue: List[str] = field(default_factory=list)
+    batch_burn_round: int = 1
+    batch_burn_balance: int = 0
+    user_deposit_limit: int = 0
+    vault_deposit_limit: int = 0
+    estimated_return: int = 0
+
+    strategies: Dict[str, StrategyData] = field(default_factory=dict)
+    batch_burns: Dict[int, BatchBurn] = field(default_factory=dict)
+    receipts: Dict[str, BatchBurnReceipt] = field(default_factory=dict)
+
+    # share token
+    balances: Dict[str, int] = field(default_factory=dict)
+    total_supply: int = 0
+
+    # underlying token, the vault's own balance is under `VAULT`
+    underlying: Dict[str, int] = field(default_factory=dict)
+
+    VAULT = "vault"
+
+    @property
+    def base_unit(self):
+        return 10**self.decimals
+
+    def advance(self, seconds=0, blocks=0):
+        self.timestamp += seconds
+        self.block_number += blocks
+
+    def mint_underlying(self, account, amount):
+        self.underlying[account] = self.underlying.get(account, 0) + amount
+
+    def balance_of(self, account):
+        return self.balances.get(account, 0)
+
+    def underlying_of(self, account):
+        return self.underlying.get(account, 0)
+
+    def strategy(self, address):
+        return self.strategies.setdefault(address, StrategyData())
+
+    def batch_burn(self, round_):
+        return self.batch_burns.setdefault(round_, BatchBurn())
+
+    # ERC20 internals, OpenZeppelin checks and messages
+
+    def _transfer_shares(self, sender, to, amount):
+        _require(self.balance_of(sender) >= amount, "ERC20: transfer amount exceeds balance")
+        self.balances[sender] = self.balance_of(sender) - amount
+        self.balances[to] = self.balance_of(to) + amount
+
+    def _mint(self, to, amount):
+        _require(to != ZERO_ADDRESS, "ERC20: mint to the zero address")
+        self.total_supply = _add(self.total_supply, amount)
+        self.balances[to] = self.balance_of(to) + amount
+
+    def _burn(self, account, amount):
+        _require(self.balance_of(account) >= amount, "ERC20: burn amount exceeds balance")
+        self.balances[account] = self.balance_of(account) - amount
+        self.total_supply -= amount
+
+    def _transfer_underlying(self, sender, to, amount):
+        _require(to != ZERO_ADDRESS, "ERC20: transfer to the zero address")
+        _require(self.underlying_of(sender) >= amount, "ERC20: transfer amount exceeds balance")
+        self.underlying[sender] = self.underlying_of(sender) - amount
+        self.underlying[to] = self.underlying_of(to) + amount
+
+    # views
+
+    def total_float(self):
+        return _sub(self.underlying_of(self.VAULT), self.batch_burn_balance)
+
+    def locked_profit(self):
+        if self.timestamp >= self.last_harvest + self.harvest_delay:
+            return 0
+        elapsed = self.timestamp - self.last_harvest
+        return self.max_locked_profit - (self.max_locked_profit * elapsed) // self.harvest_delay
+
+    def total_underlying(self):
+        return _add(_sub(self.total_strategy_holdings, self.locked_profit()), self.total_float())
+
+    def exchange_rate(self):
+        if self.total_supply == 0:
+            return self.base_unit
+        return _fdiv(self.total_underlying(), self.total_supply, self.base_unit)
+
+    def calculate_shares(self, underlying_amount):
+        return _fdiv(underlying_amount, self.exchange_rate(), self.base_unit)
+
+    def calculate_underlying(self, shares):
+        return _fmul(shares, self.exchange_rate(), self.base_unit)
+
+    def estimated_underlying(self, strategy):
+        # `MockStrategy.estimatedUnderlying` is its float
+        return self.underlying_of(strategy)
+
+    # configuration
+
+    def trigger_pause(self):
+        self.paused = not self.paused
+
+    def set_deposit_limits(self, user, vault):
+        self.user_deposit_limit = user
+        self.vault_deposit_limit = vault
+
+    def set_blocks_per_year(self, blocks):
+        self.blocks_per_year = blocks
+
+    def set_harvest_fee_percent(self, percent):
+        _require(percent <= WAD, "setHarvestFeePercent::FEE_TOO_HIGH")
+        self.harvest_fee_percent = percent
+
+    def set_burning_fee_percent(self, percent):
+        _require(percent <= WAD, "setBatchedBurningFeePercent::FEE_TOO_HIGH")
+        self.burning_fee_percent = percent
+
+    def set_harvest_fee_receiver(self, receiver):
+        self.harvest_fee_receiver = receiver
+
+    def set_burning_fee_receiver(self, receiver):
+        self.burning_fee_receiver = receiver
+
+    def set_harvest_window(self, window):
+        _require(window <= self.harvest_delay, "setHarvestWindow::WINDOW_TOO_LONG")
+        self.harvest_window = window
+
+    def set_harvest_delay(self, delay):
+        _require(delay != 0, "setHarvestDelay::DELAY_CANNOT_BE_ZERO")
+        _require(delay <= 365 * 24 * 60 * 60, "setHarvestDelay::DELAY_TOO_LONG")
+        if self.harvest_delay == 0:
+            self.harvest_delay = delay
+        else:
+            self.next_harvest_delay = delay
+
+    def set_withdrawal_queue(self, queue):
+        _require(len(queue) <= MAX_STRATEGIES, "setWithdrawalQueue::QUEUE_TOO_BIG")
+        self.withdrawal_queue = list(queue)
+
+    def trust_strategy(self, strategy):
+        self.strategy(strategy).trusted = True
+
+    def distrust_strategy(self, strategy):
+        self.strategy(strategy).trusted = False
+
+    # deposit and batch burns
+
+    def transfer(self, sender, to, shares):
+        self._transfer_shares(sender, to, shares)
+
+    def deposit(self, sender, to, underlying_amount):
+        shares = self.calculate_shares(underlying_amount)
+
+        _require(not self.paused, "Pausable: paused")
+        user_underlying = _add(self.calculate_underlying(self.balance_of(to)), underlying_amount)
+        vault_underlying = _add(self.total_underlying(), underlying_amount)
+        _require(user_underlying <= self.user_deposit_limit, "_deposit::USER_DEPOSIT_LIMITS_REACHED")
+        _require(vault_underlying <= self.vault_deposit_limit, "_deposit::VAULT_DEPOSIT_LIMITS_REACHED")
+        _require(to != ZERO_ADDRESS, "ERC20: mint to the zero address")
+        _require(self.underlying_of(sender) >= underlying_amount, "ERC20: transfer amount exceeds balance")
+
+        self._mint(to, shares)
+        self._transfer_underlying(sender, self.VAULT, underlying_amount)
+        return shares
+
+    def enter_batch_burn(self, sender, shares):
+        round_ = self.batch_burn_round
+        receipt = self.receipts.get(sender, BatchBurnReceipt())
+
+        if receipt.round != 0:
+            _require(receipt.round == round_, "enterBatchBurn::DIFFERENT_ROUNDS")
+        total_shares = _add(self.batch_burn(round_).total_shares, shares)
+        user_shares = shares if receipt.round == 0 else _add(receipt.shares, shares)
+        _require(self.balance_of(sender) >= shares, "ERC20: transfer amount exceeds balance")
+
+        self.receipts[sender] = BatchBurnReceipt(round_, user_shares)
+        self.batch_burn(round_).total_shares = total_shares
+        self._transfer_shares(sender, self.VAULT, shares)
+
+    def exit_batch_burn(self, sender):
+        receipt = self.receipts.get(sender, BatchBurnReceipt())
+
+        _require(receipt.round != 0, "exitBatchBurn::NO_DEPOSITS")
+        _require(receipt.round < self.batch_burn_round, "exitBatchBurn::ROUND_NOT_EXECUTED")
+
+        underlying_amount = _fmul(receipt.shares, self.batch_burn(receipt.round).amount_per_share, self.base_unit)
+        balance = _sub(self.batch_burn_balance, underlying_amount)
+        _require(self.underlying_of(self.VAULT) >= underlying_amount, "ERC20: transfer amount exceeds balance")
+
+        self.receipts[sender] = BatchBurnReceipt()
+        self.batch_burn_balance = balance
+        self._transfer_underlying(self.VAULT, sender, underlying_amount)
+        return underlying_amount
+
+    def exec_batch_burn(self):
+        _require(self.timestamp >= self.last_harvest + self.harvest_delay, "batchBurn::LATEST_HARVEST_NOT_EXPIRED")
+
+        round_ = self.batch_burn_round
+        total_shares = self.batch_burn(round_).total_shares
+        _require(total_shares != 0, "batchBurn::TOTAL_SHARES_CANNOT_BE_ZERO")
+
+        underlying_amount = _fmul(total_shares, self.exchange_rate(), self.base_unit)
+        _require(underlying_amount <= self.total_float(), "batchBurn::NOT_ENOUGH_UNDERLYING")
+        _require(self.balance_of(self.VAULT) >= total_shares, "ERC20: burn amount exceeds balance")
+
+        fees = 0
+        if self.burning_fee_percent != 0:
+            fees = _fmul(underlying_amount, self.burning_fee_percent, WAD)
+            _require(self.burning_fee_receiver != ZERO_ADDRESS, "ERC20: transfer to the zero address")
+        amount_per_share = _fdiv(underlying_amount - fees, total_shares, self.base_unit)
+
+        self.batch_burn_round += 1
+        self._burn(self.VAULT, total_shares)
+        if fees:
+            self._transfer_underlying(self.VAULT, self.burning_fee_receiver, fees)
+        self.batch_burn(round_).amount_per_share = amount_per_share
+        self.batch_burn_balance = _add(self.batch_burn_balance, underlying_amount - fees)
+        return underlying_amount - fees
+
+    # harvest
+
+    def _estimated_returns(self, invested, profit, interval):
+        if invested == 0 or profit == 0:
+            return 0
+        rate = _fdiv(profit, invested, self.base_unit)
+        _require(interval != 0, DIVISION_BY_ZERO)
+        per_year = self.blocks_per_year // interval
+        _require(rate * per_year * 100 <= MAX_UINT256, OVERFLOW)
+        return rate * per_year * 100
+
+    def harvest(self, strategies):
+        new_window = self.timestamp >= self.last_harvest + self.harvest_delay
+        if not new_window:
+            _require(
+                self.timestamp <= self.last_harvest_window_start + self.harvest_window, "harvest::BAD_HARVEST_TIME"
+            )
+
+        # everything below runs on a copy of the touched state, written back once nothing can revert
+        exchange_rate = self.exchange_rate() if new_window else None
+        balances = {}
+        holdings = self.total_strategy_holdings
+        profit = 0
+        for s in strategies:
+            _require(self.strategies.get(s, StrategyData()).trusted, "harvest::UNTRUSTED_STRATEGY")
+            last = balances.get(s, self.strategies[s].balance)
+            current = self.estimated_underlying(s)
+            balances[s] = _cast(current, 248)
+            holdings = _sub(_add(holdings, current), last)
+            profit = _add(profit, current - last if current > last else 0)
+
+        interval = (
+            self.block_number - self.last_harvest_window_start_block
+            if new_window
+            else self.last_harvest_interval_in_blocks
+        )
+
+        fees = _fmul(profit, self.harvest_fee_percent, WAD)
+        fee_shares = 0
+        if fees != 0 and self.harvest_fee_receiver != ZERO_ADDRESS:
+            # minted at the rate before the new holdings are recorded
+            fee_shares = _fdiv(fees, self.exchange_rate(), self.base_unit)
+
+        max_locked_profit = _cast(_sub(_add(self.locked_profit(), profit), fees), 128)
+        estimated_return = self._estimated_returns(_sub(holdings, max_locked_profit), max_locked_profit, interval)
+
+        if new_window:
+            self.last_harvest_exchange_rate = exchange_rate
+            self.last_harvest_interval_in_blocks = interval
+            self.last_harvest_window_start_block = self.block_number
+            self.last_harvest_window_start = self.timestamp
+        for s, balance in balances.items():
+            self.strategies[s].balance = balance
+        if fee_shares:
+            self._mint(self.harvest_fee_receiver, fee_shares)
+
+        self.max_locked_profit = max_locked_profit
+        self.estimated_return = estimated_return
+        self.total_strategy_holdings = holdings
+        self.last_harvest = self.timestamp
+
+        if self.next_harvest_delay != 0:
+            self.harvest_delay = self.next_harvest_delay
+            self.next_harvest_delay = 0
+
+    # strategies
+
+    def deposit_into_strategy(self, strategy, underlying_amount):
+        _require(self.strategies.get(strategy, StrategyData()).trusted, "depositIntoStrategy::UNTRUSTED_STRATEGY")
+        _require(underlying_amount != 0, "depositIntoStrategy::AMOUNT_CANNOT_BE_ZERO")
+
+        holdings = _add(self.total_strategy_holdings, underlying_amount)
+        balance = self.strategies[strategy].balance + _cast(underlying_amount, 248)
+        _require(balance < 2**248, OVERFLOW)
+        _require(self.underlying_of(self.VAULT) >= underlying_amount, "ERC20: transfer amount exceeds balance")
+
+        self.total_strategy_holdings = holdings
+        self.strategies[strategy].balance = balance
+        self._transfer_underlying(self.VAULT, strategy, underlying_amount)
+
+    def withdraw_from_strategy(self, strategy, underlying_amount):
+        _require(self.strategies.get(strategy, StrategyData()).trusted, "withdrawFromStrategy::UNTRUSTED_STRATEGY")
+        _require(underlying_amount != 0, "withdrawFromStrategy::AMOUNT_CANNOT_BE_ZERO")
+
+        balance = _sub(self.strategies[strategy].balance, _cast(underlying_amount, 248))
+        holdings = _sub(self.total_strategy_holdings, underlying_amount)
+        # `BaseStrategy.withdraw` returns an error code when its float is short
+        _require(self.underlying_of(strategy) >= underlying_amount, "withdrawFromStrategy::REDEEM_FAILED")
+
+        self.strategies[strategy].balance = balance
+        self.total_strategy_holdings = holdings
+        self._transfer_underlying(strategy, self.VAULT, underlying_amount)
+
+    def simulate_profit(self, strategy, amount):
+        self.mint_underlying(strategy, amount)
+
+    def simulate_loss(self, strategy, amount):
+        _require(self.underlying_of(strategy) >= amount, "ERC20: transfer amount exceeds balance")
+        self.underlying[strategy] -= amount
@@ -0,0 +1,178 @@
+"""Block-pinned snapshot of the vaults managed by the keeper, read through multicall.
+
+Every vault read the keeper needs (float, holdings, decimals, name, estimated
+return, withdrawal queue, harvest timing and the data and estimated underlying
+of each strategy) is packed into
+`tryAggregate` batches executed at one block. Planning then runs on the
+in-memory state, and planned deposits are applied to it locally (see
+`VaultSnapshot.deposit`) instead of reading the vault again.
+"""
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+from brownie import multicall, web3
+from eth_utils import to_checksum_address
+
+# Calls aggregated into a single `eth_call`, keeps payloads under provider limits.
+BATCH_SIZE = 240
+
+
+@dataclass
+class StrategySnapshot:
+    address: str
+    trusted: bool
+    balance: int
+    estimated_underlying: int
+
+    @property
+    def profit(self):
+        """Profit the next harvest would register, losses count as zero like in `Vault.harvest`."""
+        return max(self.estimated_underlying - self.balance, 0)
+
+    @property
+    def loss(self):
+        """Loss the next harvest would register, until then the vault's holdings overstate it."""
+        return max(self.balance - self.estimated_underlying, 0)
+
+
+@dataclass
+class VaultSnapshot:
+    block_number: int
+    timestamp: int
+    address: str
+    underlying: str
+    name: str
+    decimals: int
+    total_float: int
+    total_strategy_holdings: int
+    estimated_return: int
+    withdrawal_queue: Tuple[str, ...]
+    exchange_rate: int
+    pending_burn_shares: int
+    last_harvest: int
+    last_harvest_window_start: int
+    harvest_delay: int
+    harvest_window: int
+    strategies: Dict[str, StrategySnapshot]
+
+    @property
+    def base_unit(self):
+        return 10**self.decimals
+
+    def deposit(self, strategy, amount):
+        """Mirrors `Vault.depositIntoStrategy` accounting."""
+        if amount > self.total_float:
+            raise ValueError(f"snapshot: {amount} exceeds float {self.total_float}")
+
+        self.total_float -= amount
+        self.total_strategy_holdings += amount
+        strategy = self.strategies[to_checksum_address(strategy)]
+        strategy.balance += amount
+        strategy.estimated_underlying += amount
+
+
+def _resolve(value, what):
+    # failed calls in a `tryAggregate` batch resolve to None
+    if getattr(value, "__wrapped__", value) is None:
+        raise ValueError(f"snapshot: call reverted ({what})")
+    return value
+
+
+def _read_vault(vault):
+    return (
+        vault.underlying(),
+        vault.name(),
+        vault.decimals(),
+        vault.totalFloat(),
+        vault.totalStrategyHoldings(),
+        vault.estimatedReturn(),
+        vault.getWithdrawalQueue(),
+        vault.exchangeRate(),
+        # shares entered in the current batch burn round sit in the vault
+        vault.balanceOf(vault),
+        vault.lastHarvest(),
+        vault.lastHarvestWindowStart(),
+        vault.harvestDelay(),
+        vault.harvestWindow(),
+    )
+
+
+def take_vault_snapshots(vaults, registry, block_number=None, batch_size=BATCH_SIZE, multicall_address=None):
+    """Reads every vault of `vaults` (the `harvest.vaults` layout) at `block_number`."""
+    block_number = block_number if block_number is not None else web3.eth.block_number
+    timestamp = web3.eth.get_block(block_number).timestamp
+
+    contracts = []
+    for v in vaults:
+        strategies = list(dict.fromkeys(v["harvest_strategies"] + v["deposit_strategies"]))
+        contracts.append(
+            (
+                registry.contract(v["vault"], "Vault"),
+                [registry.contract(s, "BaseStrategy") for s in strategies],
+            )
+        )
+
+    with multicall(address=multicall_address, block_identifier=block_number):
+        pending, queued = [], 0
+        for vault, strategies in contracts:
+            reads = _read_vault(vault)
+            strategy_reads = [(vault.getStrategyData(s), s.estimatedUnderlying()) for s in strategies]
+            pending.append((reads, strategy_reads))
+
+            queued += len(reads) + 2 * len(strategy_reads)
+            if queued >= batch_size:
+                multicall.flush()
+                queued = 0
+
+    snapshots = []
+    for (vault, strategies), (reads, strategy_reads) in zip(contracts, pending):
+        (
+            underlying,
+            name,
+            decimals,
+            total_float,
+            holdings,
+            estimated_return,
+            queue,
+            exchange_rate,
+            pending_burn_shares,
+            last_harvest,
+            last_harvest_window_start,
+            harvest_delay,
+            harvest_window,
+        ) = (_resolve(r, vault.address) for r in reads)
+
+        strategy_snapshots = {}
+        for s, (data, estimated_underlying) in zip(strategies, strategy_reads):
+            trusted, balance = _resolve(data, s.address)
+            strategy_snapshots[s.address] = StrategySnapshot(
+                address=s.address,
+                trusted=bool(trusted),
+                balance=int(balance),
+                estimated_underlying=int(_resolve(estimated_underlying, s.address)),
+            )
+
+        snapshots.append(
+            VaultSnapshot(
+                block_number=block_number,
+                timestamp=timestamp,
+                address=vault.address,
+                underlying=str(underlying),
+                name=str(name),
+                decimals=int(decimals),
+                total_float=int(total_float),
+                total_strategy_holdings=int(holdings),
+                estimated_return=int(estimated_return),
+                withdrawal_queue=tuple(str(s) for s in queue),
+                exchange_rate=int(exchange_rate),
+                pending_burn_shares=int(pending_burn_shares),
+                last_harvest=int(last_harvest),
+                last_harvest_window_start=int(last_harvest_window_start),
+                harvest_delay=int(harvest_delay),
+                harvest_window=int(harvest_window),
+                strategies=strategy_snapshots,
+            )
+        )
+
+    return snapshots
+
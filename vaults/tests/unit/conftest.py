@@ -1,3 +1,6 @@
+import json
+import os
+
 import pytest
 
 from brownie import (
@@ -7,6 +10,7 @@ from brownie import (
     MultiRolesAuthority,
     Vault,
     VaultFactory,
+    history,
 )
 
 
@@ -46,22 +50,34 @@ def set_capabilities_for_auth(auth, role, capabilities):
         auth.setRoleCapability(role, Vault.signatures[c], True)
 
 
-@pytest.fixture
+def pytest_sessionfinish(session):
+    # `GAS_PROFILE=reports brownie test --gas` leaves each worker's profile for scripts/gas_profile.py
+    directory = os.environ.get("GAS_PROFILE")
+    if not directory or not history.gas_profile:
+        return
+
+    os.makedirs(directory, exist_ok=True)
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "main")
+    with open(os.path.join(directory, f"gas-suite-{worker}.json"), "w") as f:
+        json.dump(history.gas_profile, f, indent=4)
+
+
+@pytest.fixture(scope="module")
 def gov(accounts):
     yield accounts[0]
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def keeper(accounts):
     yield accounts[1]
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def misc_accounts(accounts):
     yield accounts[2:5]
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def create_token(gov):
     def create_token(name="Mock Token", symbol="MCK"):
         token = gov.deploy(MockToken, name, symbol)
@@ -76,7 +92,7 @@ def token(create_token):
     yield create_token()
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def create_auth(gov, keeper):
     def create_auth():
         auth = gov.deploy(MultiRolesAuthority, gov, ZERO_ADDRESS)
@@ -100,7 +116,7 @@ def auth(create_auth):
     yield create_auth()
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def create_vault_implementation(gov):
     def create_vault_implementation():
         return gov.deploy(Vault)
@@ -113,11 +129,11 @@ def vault_implementation(create_vault_implementation):
     yield create_vault_implementation()
 
 
-@pytest.fixture
-def create_factory(gov, vault_implementation):
+@pytest.fixture(scope="module")
+def create_factory(gov, create_vault_implementation):
     def create_factory():
         factory = gov.deploy(VaultFactory)
-        factory.setImplementation(vault_implementation)
+        factory.setImplementation(create_vault_implementation())
         return factory
 
     yield create_factory
@@ -157,14 +173,3 @@ def create_strategy(gov, keeper, token, vault):
 def strategy(create_strategy):
     yield create_strategy()
 
-
-@pytest.fixture
-def create_factory(gov):
-    def create_factory():
-        return gov.deploy(VaultFactory)
-    
-    yield create_factory
-
-@pytest.fixture
-def factory(create_factory):
-    yield create_factory()
\ No newline at end of file
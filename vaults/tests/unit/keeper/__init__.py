@@ -0,0 +1 @@
+# python doing things
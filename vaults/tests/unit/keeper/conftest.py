@@ -0,0 +1,15 @@
+import pytest
+
+from brownie import multicall
+
+
+# xdist workers of brownie <= 1.19 drop the whole suite if any test skips module_isolation
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
+
+@pytest.fixture(scope="session", autouse=True)
+def multicall_contract(accounts):
+    # deployed up front so block-pinned reads can reach it
+    yield multicall.deploy({"from": accounts[0]})
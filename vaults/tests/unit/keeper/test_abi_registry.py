@@ -0,0 +1,89 @@
+import json
+
+import pytest
+from auxo_keeper.abi_registry import REGISTRY_VERSION
+from brownie import ZERO_ADDRESS, Contract, MockStrategy, Vault, VaultFactory
+
+from scripts.abi_registry import ContractRegistry
+
+
+@pytest.fixture
+def registry_path(tmp_path):
+    yield str(tmp_path / "registry.json")
+
+
+@pytest.fixture
+def proxied_vault(gov, token, auth):
+    factory = gov.deploy(VaultFactory)
+    factory.setImplementation(gov.deploy(Vault))
+    tx = factory.deployVault(token, auth, ZERO_ADDRESS, ZERO_ADDRESS, {"from": gov})
+    yield Vault.at(tx.return_value)
+
+
+def test_seeds_from_build_artifacts(registry_path):
+    registry = ContractRegistry(registry_path)
+
+    assert "Vault" in registry.abis
+    assert "MockStrategy" in registry.code_hashes.values()
+
+    with open(registry_path) as f:
+        assert json.load(f)["version"] == REGISTRY_VERSION
+
+
+def test_resolves_by_code_hash(registry_path, gov):
+    strategy = gov.deploy(MockStrategy)
+    contract = ContractRegistry(registry_path).contract(strategy.address)
+
+    assert contract._name == "MockStrategy"
+    assert contract.abi == MockStrategy.abi
+
+
+def test_resolves_eip1967_proxy(registry_path, proxied_vault, token):
+    contract = ContractRegistry(registry_path).contract(proxied_vault.address)
+
+    assert contract._name == "Vault"
+    assert contract.underlying() == token
+
+
+def test_pins_addresses_across_runs(registry_path, proxied_vault, monkeypatch):
+    ContractRegistry(registry_path).contract(proxied_vault.address)
+
+    # a pinned address never goes back to the explorer
+    monkeypatch.setattr(Contract, "from_explorer", lambda *args, **kwargs: pytest.fail("explorer hit"))
+    registry = ContractRegistry(registry_path)
+
+    assert registry.contracts[proxied_vault.address]["name"] == "Vault"
+    assert registry.contracts[proxied_vault.address]["codeHash"] is not None
+    assert registry.contract(proxied_vault.address)._name == "Vault"
+
+
+def test_repins_changed_code(registry_path, proxied_vault, gov):
+    ContractRegistry(registry_path).contract(proxied_vault.address)
+    with open(registry_path) as f:
+        data = json.load(f)
+    data["contracts"][proxied_vault.address] = {"name": "MockStrategy", "codeHash": "0x" + "00" * 32}
+    with open(registry_path, "w") as f:
+        json.dump(data, f)
+
+    registry = ContractRegistry(registry_path)
+
+    assert registry.contract(proxied_vault.address)._name == "Vault"
+    assert registry.contracts[proxied_vault.address]["codeHash"] != "0x" + "00" * 32
+
+
+def test_name_hint_for_unknown_code(registry_path, monkeypatch, gov):
+    vault = gov.deploy(Vault)
+    registry = ContractRegistry(registry_path)
+    registry.code_hashes = {}
+
+    monkeypatch.setattr(Contract, "from_explorer", lambda *args, **kwargs: pytest.fail("explorer hit"))
+    assert registry.contract(vault.address, "Vault")._name == "Vault"
+
+
+def test_fails_without_code(registry_path):
+    registry = ContractRegistry(registry_path)
+
+    with pytest.raises(ValueError, match="no code"):
+        registry.contract("0x000000000000000000000000000000000000dEaD", "Vault")
+
+    assert registry.contracts == {}
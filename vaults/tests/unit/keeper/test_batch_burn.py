@@ -0,0 +1,78 @@
+import pytest
+from auxo_keeper.multisend import CallRecorder
+from brownie import Vault, chain
+
+from scripts.abi_registry import ContractRegistry
+from scripts.batch_burn import QueuedStrategy, execute_burn_plan, plan_batch_burn, plan_withdrawals, read_burn_states
+from scripts.mock_vaults import deploy_auth, deploy_vault
+from scripts.fixed_point import fmul
+
+
+@pytest.fixture
+def registry(tmp_path):
+    yield ContractRegistry(str(tmp_path / "registry.json"))
+
+
+@pytest.fixture
+def vault(gov, token):
+    v = deploy_vault(gov, token, deploy_auth(gov), 3)
+    vault = Vault.at(v["vault"])
+    vault.setWithdrawalQueue(v["deposit_strategies"], {"from": gov})
+    yield vault
+
+
+def test_single_withdrawals_first():
+    queue = [QueuedStrategy("a", True, 100, 100), QueuedStrategy("b", True, 500, 10)]
+
+    assert [(w.strategy, w.amount, w.transactions) for w in plan_withdrawals(90, queue)] == [("a", 90, 1)]
+    assert [(w.strategy, w.amount, w.underlying) for w in plan_withdrawals(105, queue)] == [("a", 100, 0), ("b", 5, 0)]
+
+
+def test_fewest_transactions():
+    queue = [QueuedStrategy("a", True, 100, 100), QueuedStrategy("b", True, 500, 10)]
+
+    # one freed withdrawal from `b` beats `a` plus a freed withdrawal from `b`
+    (withdrawal,) = plan_withdrawals(300, queue)
+    assert (withdrawal.strategy, withdrawal.amount, withdrawal.underlying) == ("b", 300, 290)
+
+
+def test_untrusted_strategies_are_skipped():
+    queue = [QueuedStrategy("a", False, 1000, 1000), QueuedStrategy("b", True, 100, 100)]
+
+    assert [w.strategy for w in plan_withdrawals(50, queue)] == ["b"]
+    with pytest.raises(ValueError, match="shortfall"):
+        plan_withdrawals(500, queue)
+
+
+def test_plan_executes_round(vault, gov, registry):
+    # more than the float, less than everything
+    vault.enterBatchBurn(vault.balanceOf(gov) * 4 // 5, {"from": gov})
+
+    state = read_burn_states([vault.address], registry)[0]
+    plan = plan_batch_burn(state)
+
+    assert state.required == fmul(state.total_shares, vault.exchangeRate(), state.base_unit)
+    assert state.shortfall > 0
+    assert plan.executable
+    assert len(plan.withdrawals) == 2
+
+    round_ = vault.batchBurnRound()
+    recorder = CallRecorder()
+    execute_burn_plan(plan, gov, registry, recorder)
+
+    assert [c.receipt.fn_name for c in recorder.calls] == ["withdrawFromStrategy"] * 2 + ["execBatchBurn"]
+    assert vault.batchBurnRound() == round_ + 1
+    assert vault.batchBurns(round_)["totalShares"] == state.total_shares
+
+
+def test_waits_for_harvest_delay(vault, gov, registry):
+    vault.setHarvestDelay(6 * 60 * 60, {"from": gov})
+    vault.harvest([], {"from": gov})
+    vault.enterBatchBurn(10**18, {"from": gov})
+
+    plan = plan_batch_burn(read_burn_states([vault.address], registry)[0])
+    assert (plan.executable, plan.reason, plan.withdrawals) == (False, "harvest delay", [])
+
+    chain.sleep(vault.harvestDelay())
+    chain.mine()
+    assert plan_batch_burn(read_burn_states([vault.address], registry)[0]).executable
@@ -0,0 +1,15 @@
+import scripts.harvest as harvest
+from scripts.benchmark import run
+
+
+def test_records_every_stage(gov, tmp_path):
+    production = list(harvest.vaults)
+    result = run(2, 2, gov, str(tmp_path))
+
+    # the benchmark fleet never leaks into the keeper module
+    assert harvest.vaults == production
+
+    assert list(result["stages"]) == ["plan", "harvest", "deposit", "snapshot"]
+    assert result["stages"]["harvest"]["calls"] == 2
+    assert result["stages"]["deposit"]["calls"] == 4
+    assert result["totals"]["gas_used"] == sum(s["gas_used"] for s in result["stages"].values())
@@ -0,0 +1,57 @@
+from brownie import Vault
+
+from scripts.abi_registry import ContractRegistry
+from scripts.mock_vaults import deploy_auth, deploy_vault
+from scripts.distribution import StrategyTerms, burn_reserve, distribute, plan_distribution
+from scripts.vault_snapshot import take_vault_snapshots
+
+
+def terms(*rates, **kwargs):
+    return [StrategyTerms(address=f"0x{i:040x}", rate=r, holdings=0, **kwargs) for i, r in enumerate(rates)]
+
+
+def test_everything_to_the_best_rate():
+    assert distribute(10**18, terms(1e-9, 3e-9, 2e-9)) == [0, 10**18, 0]
+
+
+def test_ties_are_split_evenly():
+    assert distribute(3 * 10**18, terms(0, 0, 0), chunks=300) == [10**18] * 3
+
+
+def test_capacity_overflows_to_next_best():
+    best, second = terms(3e-9, 2e-9)
+    best = StrategyTerms(best.address, best.rate, holdings=10**18, capacity=3 * 10**18)
+
+    assert distribute(5 * 10**18, [best, second]) == [2 * 10**18, 3 * 10**18]
+
+
+def test_depth_dilutes_marginal_yield():
+    deep, shallow = terms(2e-9, 3e-9, depth=10**18)
+    allocated = distribute(10 * 10**18, [deep, shallow])
+
+    assert sum(allocated) == 10 * 10**18
+    assert 0 < allocated[1] < allocated[0] * 2
+    # marginal yields end up roughly equalised
+    assert abs(deep.marginal_yield(allocated[0]) / shallow.marginal_yield(allocated[1]) - 1) < 0.01
+
+
+def test_all_of_the_amount_is_allocated():
+    assert sum(distribute(10**18 + 7, terms(1e-9, 1e-9, 1e-9), chunks=13)) == 10**18 + 7
+
+
+def test_keeps_reserve_for_pending_batch_burn(gov, token, tmp_path):
+    registry = ContractRegistry(str(tmp_path / "registry.json"))
+    v = deploy_vault(gov, token, deploy_auth(gov), 2)
+    vault = Vault.at(v["vault"])
+    vault.enterBatchBurn(vault.balanceOf(gov) // 10, {"from": gov})
+
+    snapshot = take_vault_snapshots([v], registry)[0]
+    reserve = burn_reserve(snapshot)
+    assert reserve > 0
+
+    deposits = plan_distribution(snapshot, v["deposit_strategies"])
+    for s, amount in deposits:
+        vault.depositIntoStrategy(s, amount, {"from": gov})
+
+    assert vault.totalFloat() == reserve
+    vault.execBatchBurn({"from": gov})
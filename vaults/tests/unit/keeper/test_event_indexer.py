@@ -0,0 +1,68 @@
+import pytest
+from brownie import Vault, chain, web3
+
+from scripts.mock_vaults import deploy_auth, deploy_vault
+from scripts.event_indexer import EventIndex
+
+
+@pytest.fixture
+def fleet(gov, token):
+    auth = deploy_auth(gov)
+    yield [deploy_vault(gov, token, auth, n) for n in (1, 2)]
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = EventIndex(str(tmp_path / "events.sqlite"), Vault.abi)
+    yield index
+    index.close()
+
+
+def test_indexes_vault_events(index, fleet, gov):
+    vault = fleet[1]["vault"]
+    index.sync([v["vault"] for v in fleet], to_block=chain.height)
+
+    deposits = index.events(vault, "StrategyDeposit")
+    assert [e["args"]["strategy"] for e in deposits] == fleet[1]["deposit_strategies"]
+    assert index.events(vault, "Deposit")[0]["args"]["to"] == gov
+    assert index.events(vault, "DepositLimitsUpdated")
+    assert index.checkpoint(vault) == chain.height
+
+
+def test_resumes_from_checkpoint(index, fleet, gov):
+    vaults = [v["vault"] for v in fleet]
+    index.sync(vaults, to_block=chain.height)
+    before = len(index.events())
+
+    Vault.at(vaults[0]).harvest(fleet[0]["harvest_strategies"], {"from": gov})
+
+    # a new process picks up after the checkpoint, nothing is indexed twice
+    resumed = EventIndex(index.path, Vault.abi)
+    assert resumed.sync(vaults, to_block=chain.height) == 1
+    assert len(resumed.events()) == before + 1
+    assert resumed.events(event="Harvest")[0]["args"]["strategies"] == fleet[0]["harvest_strategies"]
+    resumed.close()
+
+
+def test_chunk_adapts_to_provider_limit(index, fleet, monkeypatch):
+    vaults = [v["vault"] for v in fleet]
+    get_logs = web3.eth.get_logs
+    ranges = []
+
+    def limited(params):
+        ranges.append(params["toBlock"] - params["fromBlock"] + 1)
+        if ranges[-1] > 4:
+            raise ValueError({"code": -32005, "message": "query returned more than 10000 results"})
+        return get_logs(params)
+
+    monkeypatch.setattr(web3.eth, "get_logs", limited)
+    index.sync(vaults, to_block=chain.height)
+
+    expected = EventIndex(":memory:", Vault.abi)
+    monkeypatch.setattr(web3.eth, "get_logs", get_logs)
+    expected.sync(vaults, to_block=chain.height)
+
+    # the whole range was covered by queries the provider accepted
+    assert index.events() == expected.events()
+    assert sum(r for r in ranges if r <= 4) == chain.height + 1
+    expected.close()
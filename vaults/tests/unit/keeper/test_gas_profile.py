@@ -0,0 +1,56 @@
+import json
+
+from brownie import MockToken
+
+from scripts.mock_vaults import deploy_auth
+from scripts.gas_profile import compare, fit_scaling, harvest_scaling, load_suite_profiles, profile_entry_points
+
+
+def test_profiles_every_entry_point(gov, misc_accounts):
+    token = gov.deploy(MockToken, "Mock Token", "MCK")
+    profile = profile_entry_points(gov, misc_accounts[:2], token, deploy_auth(gov))
+
+    functions = {name.split("[")[0] for name in profile}
+    assert {"deposit", "enterBatchBurn", "execBatchBurn", "exitBatchBurn", "depositIntoStrategy"} <= functions
+    assert {"withdrawFromStrategy", "setWithdrawalQueue", "setHarvestDelay"} <= functions
+    assert profile["execBatchBurn[fee]"] > profile["execBatchBurn[no fee]"]
+    assert profile["setWithdrawalQueue[20 strategies]"] > profile["setWithdrawalQueue[1 strategies]"]
+
+
+def test_harvest_gas_grows_with_strategies(gov):
+    token = gov.deploy(MockToken, "Mock Token", "MCK")
+    points = harvest_scaling(gov, token, deploy_auth(gov), counts=[1, 2, 3])
+
+    gas = [g for _, g in points]
+    assert gas == sorted(gas)
+    assert fit_scaling(points)["per_strategy"] > 0
+
+
+def test_fit_scaling_is_exact_on_a_line():
+    assert fit_scaling([(1, 150_000), (2, 180_000), (4, 240_000)]) == {"base": 120_000, "per_strategy": 30_000}
+
+
+def test_compare_flags_over_threshold():
+    baseline = {"deposit[first]": 100_000, "harvest[1 strategies]": 200_000, "gone": 1}
+    current = {"deposit[first]": 101_000, "harvest[1 strategies]": 210_000, "added": 1}
+
+    rows = {r["name"]: r["status"] for r in compare(current, baseline, threshold=0.02)}
+
+    assert rows == {"deposit[first]": "ok", "harvest[1 strategies]": "regression", "gone": "removed", "added": "new"}
+
+
+def test_merges_worker_profiles(tmp_path):
+    workers = [
+        {
+            "Vault.deposit": {"avg": 90, "high": 120, "low": 30, "count": 3, "avg_success": 100, "count_success": 2},
+            "MockToken.mint": {"avg": 1, "high": 1, "low": 1, "count": 1, "avg_success": 1, "count_success": 1},
+        },
+        {"Vault.deposit": {"avg": 130, "high": 130, "low": 130, "count": 1, "avg_success": 130, "count_success": 1}},
+        # brownie without success stats, reverts can not be told apart
+        {"Vault.deposit": {"avg": 500, "high": 500, "low": 500, "count": 1}},
+    ]
+    for i, profile in enumerate(workers):
+        with open(tmp_path / f"gas-suite-gw{i}.json", "w") as f:
+            json.dump(profile, f)
+
+    assert load_suite_profiles(str(tmp_path)) == {"suite:deposit": 110}
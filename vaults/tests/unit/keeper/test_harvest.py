@@ -0,0 +1,50 @@
+from types import SimpleNamespace
+
+import pytest
+from auxo_keeper.rate_store import RateStore
+from brownie import history
+
+import scripts.harvest as harvest
+from scripts.abi_registry import ContractRegistry
+from scripts.mock_vaults import deploy_auth, deploy_vault
+
+
+@pytest.fixture
+def fleet(gov, token):
+    auth = deploy_auth(gov)
+    yield [deploy_vault(gov, token, auth, n) for n in (2, 1, 3)]
+
+
+def test_plans_are_merged_in_vaults_order(fleet, gov, tmp_path):
+    registry = ContractRegistry(str(tmp_path / "registry.json"))
+    first_tx = len(history)
+
+    harvest.harvest_all(SimpleNamespace(account=gov), registry, gas_price=0, fleet=fleet)
+
+    expected = []
+    for v in fleet:
+        expected += [(v["vault"], "harvest")] + [(v["vault"], "depositIntoStrategy")] * len(v["deposit_strategies"])
+
+    assert [(tx.receiver, tx.fn_name) for tx in history[first_tx:]] == expected
+
+
+def test_plan_is_built_from_snapshot(fleet, tmp_path):
+    registry = ContractRegistry(str(tmp_path / "registry.json"))
+    plan = harvest.build_plan(fleet[2], registry)
+
+    assert plan.harvest == fleet[2]["harvest_strategies"]
+    assert [s for s, _ in plan.deposits] == fleet[2]["deposit_strategies"]
+    assert plan.snapshot.total_float < 3
+
+
+def test_returns_history_never_fails_a_run(tmp_path, capsys):
+    vault = "0x662556422AD3493fCAAc47767E8212f8C4E24513"
+    path = str(tmp_path / "vaults")
+    store = RateStore(path, ("estimated_return",))
+    # a row from the future, the next append is out of order
+    store.append(0, 2**62, [vault], estimated_return=[1.0])
+
+    harvest.record_returns([SimpleNamespace(address=vault, estimated_return=5 * 10**18, base_unit=10**18)], path)
+
+    assert len(store) == 1
+    assert "returns not recorded" in capsys.readouterr().out
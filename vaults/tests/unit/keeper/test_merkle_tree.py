@@ -0,0 +1,96 @@
+import random
+
+import brownie
+import pytest
+from brownie import ZERO_ADDRESS, MerkleAuth, MultiRolesAuthority
+
+from scripts.merkle_tree import ProofIndex, build, leaf, verify
+
+
+def write_whitelist(path, rows):
+    with open(path, "w") as f:
+        f.write("address,role\n")
+        for address, role in rows:
+            f.write(f"{address},{role}\n")
+    return str(path)
+
+
+@pytest.fixture
+def whitelist(tmp_path):
+    rng = random.Random(42)
+    rows = [("0x" + bytes(rng.getrandbits(8) for _ in range(20)).hex(), rng.randrange(4)) for _ in range(301)]
+    # duplicates are whitelisted once
+    return rows, write_whitelist(tmp_path / "whitelist.csv", rows + rows[:5])
+
+
+def test_every_proof_verifies(whitelist, tmp_path):
+    rows, path = whitelist
+    # a small sort run forces the external merge
+    root = build(path, str(tmp_path / "whitelist.index"), chunk=37)
+
+    with ProofIndex(str(tmp_path / "whitelist.index")) as index:
+        assert len(index) == len(set(rows))
+        assert index.root == root
+        for address, role in rows:
+            assert verify(index.proof(address, role), root, leaf(address, role))
+            assert role in index.roles(address)
+
+
+def test_root_does_not_depend_on_row_order(whitelist, tmp_path):
+    rows, path = whitelist
+    shuffled = write_whitelist(tmp_path / "shuffled.csv", random.Random(1).sample(rows, len(rows)))
+
+    assert build(path, str(tmp_path / "a.index")) == build(shuffled, str(tmp_path / "b.index"), chunk=10)
+
+
+def test_unknown_entries(whitelist, tmp_path):
+    rows, path = whitelist
+    build(path, str(tmp_path / "whitelist.index"))
+    address, _ = rows[0]
+
+    with ProofIndex(str(tmp_path / "whitelist.index")) as index:
+        assert index.roles(ZERO_ADDRESS) == []
+        with pytest.raises(KeyError):
+            index.proof(address, 255)
+
+
+def test_single_entry(tmp_path):
+    path = write_whitelist(tmp_path / "one.csv", [("0x" + "11" * 20, 0)])
+
+    assert build(path, str(tmp_path / "one.index")) == leaf("0x" + "11" * 20, 0)
+    with ProofIndex(str(tmp_path / "one.index")) as index:
+        assert index.proof("0x" + "11" * 20, 0) == []
+
+
+def test_reads_bare_hex_and_rejects_bad_rows(whitelist, tmp_path):
+    rows, path = whitelist
+    bare = tmp_path / "bare.csv"
+    # no header, bare hex and blank lines
+    bare.write_text("".join(f"{address[2:].upper()},{role}\n\n" for address, role in rows))
+
+    assert build(str(bare), str(tmp_path / "bare.index")) == build(path, str(tmp_path / "whitelist.index"))
+
+    bad = tmp_path / "bad.csv"
+    bad.write_text(f"address,role\n{rows[0][0]},{rows[0][1]}\n{rows[1][0][:-2]},{rows[1][1]}\n")
+    with pytest.raises(ValueError, match="row 3"):
+        build(str(bad), str(tmp_path / "bad.index"))
+
+
+def test_proofs_authorize_on_chain(gov, accounts, tmp_path):
+    rows = [(a.address, i % 3) for i, a in enumerate(accounts[1:8])]
+    root = build(write_whitelist(tmp_path / "whitelist.csv", rows), str(tmp_path / "whitelist.index"))
+
+    authority = gov.deploy(MultiRolesAuthority, gov, ZERO_ADDRESS)
+    merkle_auth = gov.deploy(MerkleAuth, gov, authority)
+    authority.setPublicCapability(MerkleAuth.signatures["setMerkleRoot"], True)
+    merkle_auth.setMerkleRoot(root)
+
+    with ProofIndex(str(tmp_path / "whitelist.index")) as index:
+        for address, role in rows:
+            merkle_auth.authorize(address, role, index.proof(address, role), {"from": gov})
+            assert merkle_auth.doesUserHaveRole(address, role)
+
+        # a proof is only valid for its own role
+        address, role = rows[0]
+        with brownie.reverts("authorizeDepositor::MERKLE_PROOF_INVALID"):
+            merkle_auth.authorize(address, role + 1, index.proof(address, role), {"from": gov})
@@ -0,0 +1,36 @@
+import numpy as np
+
+from scripts.monte_carlo import HOUR, Market, VaultParams, grid, simulate, sweep
+
+STEPS = 24 * 7
+
+
+def test_no_fees_without_fee_percents():
+    metrics = simulate(VaultParams(6 * HOUR, HOUR, 0.0, 0.0), Market(), 100, STEPS, seed=1)
+
+    assert (metrics["fees"] == 0).all()
+    assert (metrics["dilution"] > 0).all()
+
+
+def test_no_dilution_without_harvest_delay():
+    metrics = simulate(VaultParams(0, 0, 0.1, 0.0), Market(), 100, STEPS, seed=1)
+
+    assert (metrics["dilution"] == 0).all()
+    assert (metrics["fees"] > 0).all()
+
+
+def test_longer_delay_dilutes_more():
+    short = simulate(VaultParams(HOUR, 0, 0.0, 0.0), Market(), 200, STEPS, seed=1)
+    long = simulate(VaultParams(24 * HOUR, 0, 0.0, 0.0), Market(), 200, STEPS, seed=1)
+
+    assert np.median(long["dilution"]) > np.median(short["dilution"])
+
+
+def test_sweep_is_independent_of_workers():
+    params = grid(harvest_delay=[6 * HOUR], harvest_window=[HOUR], burning_fee_percent=[0.005])
+
+    results = sweep(params, 250, steps=STEPS, block=100, workers=2)
+
+    assert results == sweep(params, 250, steps=STEPS, block=100, workers=1)
+    assert [r["params"]["harvest_fee_percent"] for r in results] == [0.0, 0.1]
+    assert results[1]["metrics"]["fees"]["p50"] > results[0]["metrics"]["fees"]["p50"] > 0
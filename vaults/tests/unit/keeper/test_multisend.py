@@ -0,0 +1,74 @@
+from types import SimpleNamespace
+
+from auxo_keeper.multisend import MULTISEND_GAS, MULTISEND_GAS_PER_CALL, CallRecorder, PlannedCall, pack
+from brownie import history
+
+import scripts.harvest as harvest
+from scripts.abi_registry import ContractRegistry
+from scripts.mock_vaults import deploy_auth, deploy_vault
+
+
+def planned(group, gas, name=""):
+    return PlannedCall(group, SimpleNamespace(gas_used=gas - MULTISEND_GAS_PER_CALL, fn_name=name))
+
+
+def test_groups_stay_together_and_in_order():
+    calls = [
+        planned("a", 100, "harvest"),
+        planned("b", 300, "harvest"),
+        planned("a", 100, "deposit"),
+        planned("b", 300, "deposit"),
+    ]
+
+    (batch,) = pack(calls, gas_ceiling=MULTISEND_GAS + 1_000)
+
+    # the larger group goes first, calls of a group keep their order
+    assert [(c.group, c.receipt.fn_name) for c in batch] == [
+        ("b", "harvest"),
+        ("b", "deposit"),
+        ("a", "harvest"),
+        ("a", "deposit"),
+    ]
+
+
+def test_fewest_batches_under_ceiling():
+    gas = [600, 500, 400, 300, 200]
+    calls = [planned(str(i), g) for i, g in enumerate(gas)]
+
+    batches = pack(calls, gas_ceiling=MULTISEND_GAS + 1_000)
+
+    assert len(batches) == 2
+    assert all(sum(c.gas for c in b) <= 1_000 for b in batches)
+    assert sorted(c.group for b in batches for c in b) == sorted(str(i) for i in range(len(gas)))
+
+
+def test_oversized_group_is_split_in_order():
+    calls = [planned("a", 400, str(i)) for i in range(5)] + [planned("b", 100)]
+
+    batches = pack(calls, gas_ceiling=MULTISEND_GAS + 1_000)
+
+    assert [[c.receipt.fn_name for c in b] for b in batches] == [[""], ["0", "1"], ["2", "3"], ["4"]]
+
+
+def test_noops_are_skipped(gov, token, tmp_path):
+    auth = deploy_auth(gov)
+    fleet = [deploy_vault(gov, token, auth, 1)]
+
+    registry = ContractRegistry(str(tmp_path / "registry.json"))
+    account = SimpleNamespace(account=gov)
+    harvest.harvest_all(account, registry, gas_price=0, fleet=fleet)
+
+    # nothing left to harvest or deposit on the second run
+    first_tx = len(history)
+    calls, _ = harvest.harvest_all(account, registry, gas_price=0, fleet=fleet)
+
+    assert calls == []
+    assert len(history) == first_tx
+
+
+def test_recorder_passes_tx_params(gov, token):
+    recorder = CallRecorder()
+    recorder.send(token.address, token.approve, gov, 0, {"from": gov})
+
+    assert [c.receipt.fn_name for c in recorder.calls] == ["approve"]
+    assert recorder.calls[0].receipt.sender == gov
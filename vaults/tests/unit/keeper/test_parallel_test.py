@@ -0,0 +1,38 @@
+import xml.etree.ElementTree as ET
+
+from scripts.parallel_test import merge_reports, projects, build_command
+
+
+def write_report(path, tests, failures, time):
+    suite = ET.Element("testsuite", tests=str(tests), failures=str(failures), errors="0", skipped="0", time=str(time))
+    ET.SubElement(suite, "testcase", name="test_a")
+    ET.ElementTree(suite).write(path)
+
+
+def test_finds_projects_with_tests():
+    found = projects()
+
+    assert "vaults" in found
+    assert "strategies/tarot-lending" in found
+    assert "strategies/beets" not in found
+
+
+def test_merges_reports(tmp_path):
+    write_report(tmp_path / "a.xml", 3, 1, 1.5)
+    write_report(tmp_path / "b.xml", 2, 0, 2.0)
+    merged = tmp_path / "junit.xml"
+
+    totals = merge_reports(
+        [("vaults", str(tmp_path / "a.xml")), ("tarot", str(tmp_path / "b.xml")), ("gone", str(tmp_path / "c.xml"))],
+        str(merged),
+    )
+
+    assert totals == {"tests": 5, "failures": 1, "errors": 0, "skipped": 0, "time": 3.5}
+    root = ET.parse(merged).getroot()
+    assert [s.get("name") for s in root] == ["vaults", "tarot"]
+    assert root.get("tests") == "5"
+
+
+def test_serial_runs_without_xdist():
+    assert build_command(0, "r.xml", ["-k", "a"]) == ["brownie", "test", "--junitxml=r.xml", "-k", "a"]
+    assert build_command(4, "r.xml", [])[2:6] == ["-n", "4", "--dist", "loadscope"]
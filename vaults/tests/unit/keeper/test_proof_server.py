@@ -0,0 +1,119 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from scripts.merkle_tree import build, leaf, verify
+from scripts.proof_server import AUTHORIZE_SELECTOR, ProofService, serve
+
+ALICE = "0x" + "11" * 20
+BOB = "0x" + "22" * 20
+CAROL = "0x" + "33" * 20
+
+
+def build_index(tmp_path, rows):
+    path = tmp_path / "whitelist.csv"
+    path.write_text("address,role\n" + "".join(f"{a},{r}\n" for a, r in rows))
+    return build(str(path), str(tmp_path / "whitelist.index"))
+
+
+@pytest.fixture
+def server(tmp_path):
+    build_index(tmp_path, [(ALICE, 0), (ALICE, 2), (BOB, 1)])
+    service = ProofService(str(tmp_path / "whitelist.index"), cache_size=16)
+    server = serve(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield service, f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def get(url):
+    try:
+        with urllib.request.urlopen(url) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_serves_authorize_calldata(server):
+    service, url = server
+    status, body = get(f"{url}/proof/{ALICE}")
+
+    assert status == 200
+    assert [p["role"] for p in body["proofs"]] == [0, 2]
+    for p in body["proofs"]:
+        proof = [bytes.fromhex(node[2:]) for node in p["proof"]]
+        assert verify(proof, service.tree.index.root, leaf(ALICE, p["role"]))
+
+        calldata = bytes.fromhex(p["calldata"][2:])
+        assert calldata[:4] == AUTHORIZE_SELECTOR
+        assert calldata[16:36].hex() == ALICE[2:]
+        assert int.from_bytes(calldata[36:68], "big") == p["role"]
+        assert int.from_bytes(calldata[100:132], "big") == len(proof)
+        assert calldata[132:] == b"".join(proof)
+
+    assert get(f"{url}/proof/{BOB}/1")[1]["proofs"][0]["role"] == 1
+    assert get(f"{url}/proof/{BOB}?source=launch")[0] == 200
+    assert get(f"{url}/proof/{ALICE}")[1] == body
+    assert get(f"{url}/health")[1]["cache"]["hits"] == 1
+
+
+def test_rejects_unknown_and_bad_requests(server):
+    _, url = server
+
+    assert get(f"{url}/proof/{CAROL}")[0] == 404
+    assert get(f"{url}/proof/{BOB}/0")[0] == 404
+    assert get(f"{url}/proof/0x1234")[0] == 400
+    assert get(f"{url}/proof/{BOB}/256")[0] == 400
+    assert get(f"{url}/nothing")[0] == 404
+
+
+def test_swaps_to_the_chain_root(server, tmp_path):
+    service, url = server
+    old_root = service.tree.index.root
+
+    # the new tree is written before the root is set on chain
+    new_root = build_index(tmp_path, [(CAROL, 0)])
+    assert not service.refresh(old_root)
+    assert get(f"{url}/proof/{ALICE}")[0] == 200
+
+    # the root is set, proofs of the old tree would revert until the swap
+    service.chain_root = new_root
+    assert get(f"{url}/proof/{ALICE}")[0] == 503
+
+    assert service.refresh(new_root)
+    assert get(f"{url}/proof/{ALICE}")[0] == 404
+    status, body = get(f"{url}/proof/{CAROL}")
+    assert status == 200 and body["root"] == "0x" + new_root.hex()
+    assert get(f"{url}/health")[1]["cache"]["hits"] == 0
+
+
+def test_closes_replaced_candidates(tmp_path):
+    build_index(tmp_path, [(ALICE, 0)])
+    service = ProofService(str(tmp_path / "whitelist.index"))
+
+    build_index(tmp_path, [(BOB, 0)])
+    assert not service.refresh(bytes(32))
+    replaced = service._candidate
+
+    build_index(tmp_path, [(CAROL, 0)])
+    assert not service.refresh()
+    with pytest.raises(ValueError):
+        replaced.entry(0)
+    assert service._candidate.entry(0)[0] == CAROL
+
+
+def test_swap_leaves_the_old_index_readable(tmp_path):
+    build_index(tmp_path, [(ALICE, 0)])
+    service = ProofService(str(tmp_path / "whitelist.index"))
+    old = service.tree
+
+    build_index(tmp_path, [(BOB, 0)])
+    assert service.refresh()
+
+    assert old.index.proof(ALICE, 0) == []
+    assert old.lookup(ALICE, None) is not None
+    assert service.lookup(ALICE) is None
@@ -0,0 +1,117 @@
+from brownie import chain
+
+from scripts.abi_registry import ContractRegistry
+from scripts.mock_vaults import PROFIT, deploy_auth, deploy_vault
+from scripts.scheduler import harvest_gas, next_run, next_slot, schedule
+from scripts.vault_snapshot import StrategySnapshot, VaultSnapshot, take_vault_snapshots
+
+HOUR = 60 * 60
+STRATEGY = "0x0000000000000000000000000000000000000001"
+
+
+def create_snapshot(now, last_harvest, window_start, delay=6 * HOUR, window=HOUR, profit=10**18):
+    return VaultSnapshot(
+        block_number=0,
+        timestamp=now,
+        address="0x0000000000000000000000000000000000000002",
+        underlying="0x0000000000000000000000000000000000000003",
+        name="Auxo Mock Vault",
+        decimals=18,
+        total_float=0,
+        total_strategy_holdings=10**21,
+        estimated_return=0,
+        withdrawal_queue=(),
+        exchange_rate=10**18,
+        pending_burn_shares=0,
+        last_harvest=last_harvest,
+        last_harvest_window_start=window_start,
+        harvest_delay=delay,
+        harvest_window=window,
+        strategies={STRATEGY: StrategySnapshot(STRATEGY, True, 10**21, 10**21 + profit)},
+    )
+
+
+def test_new_window_after_delay():
+    slot = next_slot(create_snapshot(now=10 * HOUR, last_harvest=2 * HOUR, window_start=2 * HOUR))
+
+    assert (slot.opens, slot.closes, slot.new_window) == (10 * HOUR, None, True)
+
+
+def test_open_window():
+    slot = next_slot(create_snapshot(now=10 * HOUR, last_harvest=10 * HOUR - 60, window_start=10 * HOUR - 600))
+
+    assert (slot.opens, slot.closes, slot.new_window) == (10 * HOUR, 11 * HOUR - 600, False)
+
+
+def test_closed_window_waits_for_delay():
+    slot = next_slot(create_snapshot(now=10 * HOUR, last_harvest=8 * HOUR, window_start=8 * HOUR))
+
+    assert (slot.opens, slot.closes, slot.new_window) == (14 * HOUR, None, True)
+
+
+def test_window_closing_within_margin_is_skipped():
+    slot = next_slot(create_snapshot(now=10 * HOUR, last_harvest=9 * HOUR, window_start=9 * HOUR + 30))
+
+    assert slot.opens == 15 * HOUR
+
+
+def test_profit_must_beat_gas():
+    snapshot = create_snapshot(now=10 * HOUR, last_harvest=0, window_start=0, profit=10**15)
+    gas_price = 10**15 // harvest_gas(1) + 1
+
+    assert not schedule(snapshot, [STRATEGY], gas_price, 10**18).harvest_now
+    assert schedule(snapshot, [STRATEGY], gas_price // 2, 10**18).harvest_now
+    # no price for the underlying, the gas check is skipped
+    assert schedule(snapshot, [STRATEGY], gas_price, None).harvest_now
+
+
+def test_skips_strategies_without_profit():
+    decision = schedule(create_snapshot(now=10 * HOUR, last_harvest=0, window_start=0, profit=0), [STRATEGY], 0, 0)
+
+    assert decision.strategies == ()
+    assert not decision.harvest_now
+    assert decision.reason == "no profit"
+
+
+def test_losses_are_always_harvested():
+    snapshot = create_snapshot(now=10 * HOUR, last_harvest=0, window_start=0, profit=-(10**18))
+
+    # whatever the gas costs, the vault must stop overstating its holdings
+    decision = schedule(snapshot, [STRATEGY], 10**12, 10**18)
+    assert decision.strategies == (STRATEGY,)
+    assert (decision.profit, decision.loss) == (0, 10**18)
+    assert decision.harvest_now
+
+    closed = create_snapshot(now=10 * HOUR, last_harvest=8 * HOUR, window_start=8 * HOUR, profit=-(10**18))
+    assert schedule(closed, [STRATEGY], 10**12, 10**18).reason == "window closed"
+
+
+def test_next_run():
+    due = schedule(create_snapshot(now=10 * HOUR, last_harvest=0, window_start=0), [STRATEGY], 0, 0)
+    waiting = schedule(create_snapshot(now=10 * HOUR, last_harvest=8 * HOUR, window_start=8 * HOUR), [STRATEGY], 0, 0)
+
+    assert next_run([due, waiting], 10 * HOUR) == 10 * HOUR
+    assert next_run([waiting], 10 * HOUR) == 14 * HOUR
+
+
+def test_harvest_scheduled_from_chain_never_reverts(gov, token, tmp_path):
+    registry = ContractRegistry(str(tmp_path / "registry.json"))
+    v = deploy_vault(gov, token, deploy_auth(gov), 2)
+    vault = registry.contract(v["vault"], "Vault", owner=gov)
+    vault.setHarvestDelay(6 * HOUR)
+    vault.setHarvestWindow(HOUR)
+
+    decision = schedule(take_vault_snapshots([v], registry)[0], v["harvest_strategies"], 0, 0)
+    assert decision.harvest_now
+    assert decision.profit == 2 * PROFIT
+    vault.harvest(decision.strategies)
+
+    # still in the window, but nothing left to harvest
+    decision = schedule(take_vault_snapshots([v], registry)[0], v["harvest_strategies"], 0, 0)
+    assert not decision.harvest_now
+
+    # after the window closes the next slot is the end of the delay
+    chain.sleep(2 * HOUR)
+    chain.mine()
+    decision = schedule(take_vault_snapshots([v], registry)[0], v["harvest_strategies"], 0, 0)
+    assert decision.slot.opens == vault.lastHarvest() + 6 * HOUR
@@ -0,0 +1,36 @@
+import json
+
+from auxo_keeper.simulation import CostReport
+
+
+def test_step_records_calls(gov, keeper, token):
+    report = CostReport("test")
+
+    with report.step("transfer"):
+        token.transfer(keeper, 10, {"from": gov})
+
+    with report.step("read"):
+        token.balanceOf(keeper)
+
+    transfer, read = report.steps
+
+    assert [c["function"] for c in transfer["calls"]] == ["transfer"]
+    assert transfer["gas_used"] > 0
+    assert transfer["rpc"] > 0
+
+    assert read["calls"] == []
+    assert read["gas_used"] == 0
+    assert read["rpc"] > 0
+
+
+def test_saves_report(gov, keeper, token, tmp_path):
+    report = CostReport("test")
+
+    with report.step("transfer"):
+        token.transfer(keeper, 10, {"from": gov})
+
+    with open(report.save(str(tmp_path))) as f:
+        data = json.load(f)
+
+    assert data["totals"]["calls"] == 1
+    assert data["totals"]["gas_used"] == report.steps[0]["gas_used"]
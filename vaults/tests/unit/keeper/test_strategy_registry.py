@@ -0,0 +1,78 @@
+import pytest
+
+from scripts.abi_registry import ContractRegistry
+from scripts.mock_vaults import deploy_auth, deploy_vault
+from scripts.strategy_registry import StrategyRegistry, strategy_kind
+
+
+@pytest.fixture
+def registry(tmp_path):
+    yield ContractRegistry(str(tmp_path / "registry.json"))
+
+
+@pytest.fixture
+def strategies(gov, token):
+    v = deploy_vault(gov, token, deploy_auth(gov), 2)
+    yield v["vault"], v["deposit_strategies"]
+
+
+def test_capabilities_from_code_and_chain(registry, strategies, token):
+    vault, addresses = strategies
+    capabilities = StrategyRegistry(registry)[addresses[0]]
+
+    assert capabilities.name == "MockStrategy"
+    assert capabilities.kind == "Mock"
+    assert capabilities.needs_deposit_underlying
+    assert capabilities.deposit_underlying_argument(10**18) == 10**18
+    assert capabilities.underlying == token.address
+    assert capabilities.vault == vault
+
+
+def test_cached_across_runs(registry, strategies, monkeypatch):
+    _, addresses = strategies
+    StrategyRegistry(registry).build(addresses)
+
+    # a cached strategy is never read again
+    monkeypatch.setattr(registry, "contract", lambda *args, **kwargs: pytest.fail("strategy read"))
+    cached = StrategyRegistry(registry)
+
+    assert [cached[a].kind for a in addresses] == ["Mock", "Mock"]
+
+
+def test_overrides(registry, strategies):
+    _, addresses = strategies
+    capabilities = StrategyRegistry(registry, overrides={addresses[1]: {"auto_invests": True}})
+
+    assert capabilities[addresses[0]].needs_deposit_underlying
+    assert not capabilities[addresses[1]].needs_deposit_underlying
+    assert capabilities[addresses[1]].kind == "Mock"
+
+
+def test_rebuilt_on_new_code(registry, strategies):
+    _, addresses = strategies
+    capabilities = StrategyRegistry(registry)
+    capabilities.build(addresses)
+
+    registry.contracts[addresses[0]] = {**registry.contracts[addresses[0]], "codeHash": "0x00"}
+
+    assert StrategyRegistry(registry)._stale(addresses[0])
+    assert not StrategyRegistry(registry)._stale(addresses[1])
+
+
+def test_kind_from_abi_or_name():
+    beets_abi = [{"type": "function", "name": "setMasterchef"}, {"type": "function", "name": "balancerVault"}]
+
+    assert strategy_kind("TarotLenderStrategy", None, "") == "Tarot"
+    assert strategy_kind("BeetsUsdcStrategy", beets_abi, "") == "Beets"
+    assert strategy_kind("Strategy", [{"type": "function", "name": "sellBal"}], "") == "BalancerV2"
+    assert strategy_kind("Strategy", [], "Hundred Finance USDC") == "HundredFinance"
+    assert strategy_kind("Strategy", [], "Auxo USDC") is None
+
+
+def test_pool_joins_take_a_minimum(registry, strategies):
+    _, addresses = strategies
+    capabilities = StrategyRegistry(registry, overrides={addresses[0]: {"kind": "Beets"}})[addresses[0]]
+
+    # `depositUnderlying(minDeposited)` reverts unless the join beats the minimum
+    assert capabilities.min_deposited
+    assert capabilities.deposit_underlying_argument(10**18) == 99 * 10**16
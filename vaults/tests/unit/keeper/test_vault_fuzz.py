@@ -0,0 +1,241 @@
+"""Differential fuzzing of `Vault` against `scripts.vault_model`.
+
+Hypothesis draws sequences of user, keeper and governance calls. Each call is
+sent to a deployed vault and replayed on the model at the block it was mined
+in: both sides must succeed or revert with the same message, and every public
+view must match after every step. The deployment happens once, brownie reverts
+the chain to it between sequences, and a failing sequence is shrunk by
+hypothesis before it is reported.
+"""
+import copy
+
+from brownie import MockStrategy, Vault, chain, history, multicall
+from brownie.exceptions import VirtualMachineError
+from brownie.test import strategy
+
+from scripts.vault_model import VaultModel, VaultRevert
+
+MAX_UINT256 = 2**256 - 1
+WAD = 10**18
+HOUR = 60 * 60
+DAY = 24 * HOUR
+
+
+class VaultStateMachine:
+    st_actor = strategy("uint8", max_value=2)
+    st_strategy = strategy("uint8", max_value=1)
+    st_strategies = strategy("uint8", max_value=7)
+    st_amount = strategy("uint256", max_value=10**21)
+    st_percent = strategy("uint8", max_value=110)
+    st_seconds = strategy("uint32", max_value=2 * DAY)
+    st_fee = strategy("uint256", max_value=WAD + WAD // 10)
+    st_delay = strategy("uint64", max_value=400 * DAY)
+    st_window = strategy("uint128", max_value=2 * DAY)
+
+    def __init__(cls, gov, token, auth, actors, fees):
+        cls.gov, cls.token, cls.actors, cls.fees = gov, token, actors, fees
+
+        cls.vault = gov.deploy(Vault)
+        cls.vault.initialize(token, auth, fees, fees)
+        cls.strategies = [gov.deploy(MockStrategy) for _ in range(2)]
+
+        model = VaultModel(decimals=18)
+        model.set_harvest_fee_receiver(fees.address)
+        model.set_burning_fee_receiver(fees.address)
+
+        configure = [
+            ("triggerPause", (), model.trigger_pause),
+            ("setDepositLimits", (MAX_UINT256, MAX_UINT256), model.set_deposit_limits),
+            ("setHarvestDelay", (6 * HOUR,), model.set_harvest_delay),
+            ("setHarvestWindow", (HOUR,), model.set_harvest_window),
+            ("setHarvestFeePercent", (WAD // 10,), model.set_harvest_fee_percent),
+            ("setBurningFeePercent", (WAD // 100,), model.set_burning_fee_percent),
+            ("setBlocksPerYear", (2_000_000,), model.set_blocks_per_year),
+        ]
+        for name, args, apply in configure:
+            getattr(cls.vault, name)(*args, {"from": gov})
+            apply(*args)
+
+        for s in cls.strategies:
+            s.initialize(cls.vault, token, gov, gov, "MockStrategy", {"from": gov})
+            cls.vault.trustStrategy(s, {"from": gov})
+            model.trust_strategy(s.address)
+
+        for a in actors:
+            token.mint(a, 10**24, {"from": gov})
+            token.approve(cls.vault, MAX_UINT256, {"from": a})
+            model.mint_underlying(a.address, 10**24)
+
+        cls.initial = model
+
+    def setup(self):
+        self.model = copy.deepcopy(self.initial)
+
+    def _transact(self, fn, args, sender, apply):
+        try:
+            tx = fn(*args, {"from": sender})
+        except VirtualMachineError:
+            tx = history[-1]
+
+        self.model.timestamp, self.model.block_number = tx.timestamp, tx.block_number
+        try:
+            result = apply()
+        except VaultRevert as e:
+            assert tx.status == 0, f"{fn._name} succeeded, the model reverted with {e.message}"
+            if e.message is not None:
+                assert tx.revert_msg == e.message
+            return
+        assert tx.status == 1, f"{fn._name} reverted with {tx.revert_msg}, the model succeeded"
+        if tx.return_value is not None:
+            assert tx.return_value == result
+
+    # users
+
+    def rule_deposit(self, st_actor, st_amount):
+        actor = self.actors[st_actor].address
+        self._transact(self.vault.deposit, (actor, st_amount), actor, lambda: self.model.deposit(actor, actor, st_amount))
+
+    def rule_enter_batch_burn(self, st_actor, st_percent):
+        actor = self.actors[st_actor].address
+        shares = self.model.balance_of(actor) * st_percent // 100
+        self._transact(
+            self.vault.enterBatchBurn, (shares,), actor, lambda: self.model.enter_batch_burn(actor, shares)
+        )
+
+    def rule_exit_batch_burn(self, st_actor):
+        actor = self.actors[st_actor].address
+        self._transact(self.vault.exitBatchBurn, (), actor, lambda: self.model.exit_batch_burn(actor))
+
+    # keeper
+
+    def rule_exec_batch_burn(self):
+        self._transact(self.vault.execBatchBurn, (), self.gov, self.model.exec_batch_burn)
+
+    def rule_harvest(self, st_strategies):
+        # bit i of the mask picks strategy i, bit 2 repeats the first one
+        picked = [s.address for i, s in enumerate(self.strategies) if st_strategies >> i & 1]
+        picked += picked[:1] if st_strategies & 4 else []
+        self._transact(self.vault.harvest, (picked,), self.gov, lambda: self.model.harvest(picked))
+
+    def rule_deposit_into_strategy(self, st_strategy, st_percent):
+        s = self.strategies[st_strategy].address
+        amount = self.model.total_float() * st_percent // 100
+        self._transact(
+            self.vault.depositIntoStrategy, (s, amount), self.gov, lambda: self.model.deposit_into_strategy(s, amount)
+        )
+
+    def rule_withdraw_from_strategy(self, st_strategy, st_percent):
+        s = self.strategies[st_strategy].address
+        amount = self.model.strategy(s).balance * st_percent // 100
+        self._transact(
+            self.vault.withdrawFromStrategy, (s, amount), self.gov, lambda: self.model.withdraw_from_strategy(s, amount)
+        )
+
+    # governance
+
+    def rule_set_harvest_fee_percent(self, st_fee):
+        self._transact(
+            self.vault.setHarvestFeePercent, (st_fee,), self.gov, lambda: self.model.set_harvest_fee_percent(st_fee)
+        )
+
+    def rule_set_burning_fee_percent(self, st_fee):
+        self._transact(
+            self.vault.setBurningFeePercent, (st_fee,), self.gov, lambda: self.model.set_burning_fee_percent(st_fee)
+        )
+
+    def rule_set_harvest_delay(self, st_delay):
+        self._transact(
+            self.vault.setHarvestDelay, (st_delay,), self.gov, lambda: self.model.set_harvest_delay(st_delay)
+        )
+
+    def rule_set_harvest_window(self, st_window):
+        self._transact(
+            self.vault.setHarvestWindow, (st_window,), self.gov, lambda: self.model.set_harvest_window(st_window)
+        )
+
+    def rule_distrust_strategy(self, st_strategy):
+        s = self.strategies[st_strategy].address
+        self._transact(self.vault.distrustStrategy, (s,), self.gov, lambda: self.model.distrust_strategy(s))
+
+    def rule_trust_strategy(self, st_strategy):
+        s = self.strategies[st_strategy].address
+        self._transact(self.vault.trustStrategy, (s,), self.gov, lambda: self.model.trust_strategy(s))
+
+    # the world around the vault
+
+    def rule_strategy_profit(self, st_strategy, st_amount):
+        s = self.strategies[st_strategy]
+        self.token.mint(s, st_amount, {"from": self.gov})
+        self.model.simulate_profit(s.address, st_amount)
+
+    def rule_strategy_loss(self, st_strategy, st_percent):
+        s = self.strategies[st_strategy]
+        amount = self.model.underlying_of(s.address) * min(st_percent, 100) // 100
+        s.simulateLoss(amount, {"from": self.gov})
+        self.model.simulate_loss(s.address, amount)
+
+    def rule_sleep(self, st_seconds):
+        chain.sleep(st_seconds)
+
+    def invariant_views(self):
+        model, vault = self.model, self.vault
+        model.timestamp, model.block_number = chain[-1].timestamp, chain.height
+
+        accounts = [a.address for a in self.actors] + [self.fees.address]
+        scalars = {
+            "totalSupply": model.total_supply,
+            "exchangeRate": model.exchange_rate(),
+            "totalUnderlying": model.total_underlying(),
+            "totalFloat": model.total_float(),
+            "lockedProfit": model.locked_profit(),
+            "totalStrategyHoldings": model.total_strategy_holdings,
+            "maxLockedProfit": model.max_locked_profit,
+            "estimatedReturn": model.estimated_return,
+            "harvestFeePercent": model.harvest_fee_percent,
+            "burningFeePercent": model.burning_fee_percent,
+            "harvestWindow": model.harvest_window,
+            "harvestDelay": model.harvest_delay,
+            "nextHarvestDelay": model.next_harvest_delay,
+            "lastHarvest": model.last_harvest,
+            "lastHarvestWindowStart": model.last_harvest_window_start,
+            "lastHarvestWindowStartBlock": model.last_harvest_window_start_block,
+            "lastHarvestIntervalInBlocks": model.last_harvest_interval_in_blocks,
+            "lastHarvestExchangeRate": model.last_harvest_exchange_rate,
+            "batchBurnRound": model.batch_burn_round,
+            "batchBurnBalance": model.batch_burn_balance,
+        }
+        rounds = range(1, model.batch_burn_round + 1)
+
+        with multicall(block_identifier=chain.height):
+            views = {name: getattr(vault, name)() for name in scalars}
+            shares = [vault.balanceOf(a) for a in accounts + [vault.address]]
+            underlying = [self.token.balanceOf(a) for a in accounts + [vault.address]]
+            receipts = [vault.userBatchBurnReceipts(a) for a in accounts]
+            burns = [vault.batchBurns(r) for r in rounds]
+            strategies = [vault.getStrategyData(s) for s in self.strategies]
+
+        for name, expected in scalars.items():
+            assert views[name] == expected, name
+        assert shares == [model.balance_of(a) for a in accounts + [model.VAULT]]
+        assert underlying == [model.underlying_of(a) for a in accounts + [model.VAULT]]
+        assert [tuple(r) for r in receipts] == [
+            (model.receipts[a].round, model.receipts[a].shares) if a in model.receipts else (0, 0) for a in accounts
+        ]
+        assert [tuple(b) for b in burns] == [
+            (model.batch_burn(r).total_shares, model.batch_burn(r).amount_per_share) for r in rounds
+        ]
+        assert [tuple(s) for s in strategies] == [
+            (model.strategy(s.address).trusted, model.strategy(s.address).balance) for s in self.strategies
+        ]
+
+
+def test_vault_matches_model(state_machine, accounts, gov, token, auth, misc_accounts):
+    state_machine(
+        VaultStateMachine,
+        gov,
+        token,
+        auth,
+        misc_accounts,
+        accounts[5],
+        settings={"max_examples": 50, "stateful_step_count": 40},
+    )
@@ -0,0 +1,130 @@
+import pytest
+from brownie import MockStrategy, Vault, chain
+
+from scripts.vault_model import VaultModel, VaultRevert
+
+MAX_UINT256 = 2**256 - 1
+HOUR = 60 * 60
+
+
+def create_model():
+    model = VaultModel(decimals=18)
+    model.trigger_pause()
+    model.set_deposit_limits(MAX_UINT256, MAX_UINT256)
+    return model
+
+
+def test_deposit_and_batch_burn_rounding():
+    model = create_model()
+    model.mint_underlying("alice", 10**18)
+    model.mint_underlying("bob", 10**18)
+
+    model.deposit("alice", "alice", 3)
+    # a single unit of profit makes later deposits round down
+    model.mint_underlying(model.VAULT, 1)
+    rate = model.exchange_rate()
+    assert model.deposit("bob", "bob", 10) == 10 * 10**18 // rate
+
+    model.enter_batch_burn("alice", 3)
+    model.exec_batch_burn()
+    assert model.exit_batch_burn("alice") == 3 * model.batch_burns[1].amount_per_share // 10**18
+
+
+def test_revert_strings():
+    model = create_model()
+    model.mint_underlying("alice", 10**18)
+    model.deposit("alice", "alice", 10**18)
+
+    with pytest.raises(VaultRevert, match="ERC20: transfer amount exceeds balance"):
+        model.enter_batch_burn("alice", 10**18 + 1)
+    with pytest.raises(VaultRevert, match="exitBatchBurn::NO_DEPOSITS"):
+        model.exit_batch_burn("alice")
+
+    model.enter_batch_burn("alice", 10**17)
+    with pytest.raises(VaultRevert, match="exitBatchBurn::ROUND_NOT_EXECUTED"):
+        model.exit_batch_burn("alice")
+
+    model.set_harvest_delay(HOUR)
+    model.harvest([])
+    model.advance(seconds=1)
+    with pytest.raises(VaultRevert, match="harvest::BAD_HARVEST_TIME"):
+        model.harvest([])
+    with pytest.raises(VaultRevert, match="batchBurn::LATEST_HARVEST_NOT_EXPIRED"):
+        model.exec_batch_burn()
+
+
+def test_revert_leaves_state_untouched():
+    model = create_model()
+    model.mint_underlying("alice", 10**18)
+    model.deposit("alice", "alice", 10**18)
+    model.trust_strategy("strategy")
+    model.deposit_into_strategy("strategy", 10**17)
+    model.simulate_loss("strategy", 1)
+
+    before = repr(model)
+    with pytest.raises(VaultRevert, match="withdrawFromStrategy::REDEEM_FAILED"):
+        model.withdraw_from_strategy("strategy", 10**17)
+
+    assert repr(model) == before
+
+
+def test_matches_chain(gov, token, auth, misc_accounts):
+    alice, fees = misc_accounts[:2]
+    vault = gov.deploy(Vault)
+    vault.initialize(token, auth, fees, fees)
+    vault.triggerPause()
+    vault.setDepositLimits(MAX_UINT256, MAX_UINT256)
+    vault.setHarvestDelay(6 * HOUR)
+    vault.setHarvestWindow(HOUR)
+    vault.setHarvestFeePercent(10**17)
+    vault.setBurningFeePercent(10**16)
+    vault.setBlocksPerYear(31_536_000)
+    strategy = gov.deploy(MockStrategy)
+    strategy.initialize(vault, token, gov, gov, "MockStrategy")
+    vault.trustStrategy(strategy)
+
+    model = create_model()
+    model.set_harvest_fee_receiver(fees.address)
+    model.set_burning_fee_receiver(fees.address)
+    model.set_harvest_delay(6 * HOUR)
+    model.set_harvest_window(HOUR)
+    model.set_harvest_fee_percent(10**17)
+    model.set_burning_fee_percent(10**16)
+    model.set_blocks_per_year(31_536_000)
+    model.trust_strategy(strategy.address)
+
+    def step(tx, apply):
+        model.timestamp, model.block_number = tx.timestamp, tx.block_number
+        return apply()
+
+    token.mint(alice, 10**21)
+    token.approve(vault, 10**21, {"from": alice})
+    model.mint_underlying(alice.address, 10**21)
+
+    step(vault.deposit(alice, 10**21, {"from": alice}), lambda: model.deposit(alice.address, alice.address, 10**21))
+    invested = 6 * 10**20
+    step(vault.depositIntoStrategy(strategy, invested), lambda: model.deposit_into_strategy(strategy.address, invested))
+
+    token.mint(strategy, 12_345_678_901)
+    model.simulate_profit(strategy.address, 12_345_678_901)
+    chain.sleep(HOUR)
+    step(vault.harvest([strategy]), lambda: model.harvest([strategy.address]))
+
+    chain.sleep(2 * HOUR)
+    chain.mine()
+    model.timestamp = chain[-1].timestamp
+    assert vault.exchangeRate() == model.exchange_rate()
+    assert vault.lockedProfit() == model.locked_profit()
+
+    step(vault.enterBatchBurn(10**20, {"from": alice}), lambda: model.enter_batch_burn(alice.address, 10**20))
+    chain.sleep(6 * HOUR)
+    step(vault.execBatchBurn(), model.exec_batch_burn)
+    step(vault.exitBatchBurn({"from": alice}), lambda: model.exit_batch_burn(alice.address))
+
+    assert vault.totalSupply() == model.total_supply
+    assert vault.balanceOf(fees) == model.balance_of(fees.address)
+    assert vault.estimatedReturn() == model.estimated_return
+    assert vault.maxLockedProfit() == model.max_locked_profit
+    assert vault.totalFloat() == model.total_float()
+    assert token.balanceOf(alice) == model.underlying_of(alice.address)
+    assert token.balanceOf(fees) == model.underlying_of(fees.address)
@@ -0,0 +1,52 @@
+import pytest
+
+from brownie import Vault
+
+from scripts.abi_registry import ContractRegistry
+from scripts.mock_vaults import deploy_auth, deploy_vault
+from scripts.vault_snapshot import take_vault_snapshots
+
+
+@pytest.fixture
+def registry(tmp_path):
+    yield ContractRegistry(str(tmp_path / "registry.json"))
+
+
+@pytest.fixture
+def fleet(gov, token):
+    auth = deploy_auth(gov)
+    yield [deploy_vault(gov, token, auth, n) for n in (1, 3)]
+
+
+def test_snapshot_matches_direct_reads(fleet, registry):
+    snapshots = take_vault_snapshots(fleet, registry, batch_size=8)
+
+    for v, snapshot in zip(fleet, snapshots):
+        vault = Vault.at(v["vault"])
+
+        assert snapshot.name == vault.name()
+        assert snapshot.decimals == vault.decimals()
+        assert snapshot.total_float == vault.totalFloat()
+        assert snapshot.total_strategy_holdings == vault.totalStrategyHoldings()
+        assert snapshot.estimated_return == vault.estimatedReturn()
+        assert list(snapshot.withdrawal_queue) == list(vault.getWithdrawalQueue())
+
+        for s in v["deposit_strategies"]:
+            assert (snapshot.strategies[s].trusted, snapshot.strategies[s].balance) == vault.getStrategyData(s)
+
+
+def test_local_deposits_match_chain(fleet, registry, gov):
+    v = fleet[1]
+    snapshot = take_vault_snapshots([v], registry)[0]
+    vault = Vault.at(v["vault"])
+    share = vault.totalFloat() // 3
+
+    for s in v["deposit_strategies"]:
+        snapshot.deposit(s, share)
+        vault.depositIntoStrategy(s, share, {"from": gov})
+
+    assert snapshot.total_float == vault.totalFloat()
+    assert snapshot.total_strategy_holdings == vault.totalStrategyHoldings()
+    for s in v["deposit_strategies"]:
+        assert snapshot.strategies[s].balance == vault.getStrategyData(s)["balance"]
+
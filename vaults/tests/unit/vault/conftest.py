@@ -0,0 +1,40 @@
+import pytest
+
+from brownie import ZERO_ADDRESS, MockStrategy, Vault
+
+MAX_UINT256 = 2**256 - 1
+
+
+# the world below is deployed once per module, every test starts from it and is reverted after
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
+
+@pytest.fixture(scope="module")
+def token(create_token):
+    yield create_token()
+
+
+@pytest.fixture(scope="module")
+def auth(create_auth):
+    yield create_auth()
+
+
+@pytest.fixture(scope="module")
+def vault(gov, token, auth):
+    vault = gov.deploy(Vault)
+    vault.initialize(token, auth, ZERO_ADDRESS, ZERO_ADDRESS)
+    vault.triggerPause()
+    vault.setDepositLimits(MAX_UINT256, MAX_UINT256)
+
+    yield vault
+
+
+@pytest.fixture(scope="module")
+def strategy(gov, token, vault):
+    strategy = gov.deploy(MockStrategy)
+    strategy.initialize(vault, token, gov, gov, "MockStrategy")
+    vault.trustStrategy(strategy)
+
+    yield strategy
@@ -1,18 +1,8 @@
 import pytest
 import brownie
 
-from brownie import ZERO_ADDRESS, MockStrategy, Vault
-
-MAX_UINT256 = 2**256 - 1
-
-
-def test_fail_enter_batch_burn_transfer_fails(misc_accounts, gov, token, auth, Vault):
-    # deploy the vault
-    vault = gov.deploy(Vault)
-    vault.initialize(token, auth, ZERO_ADDRESS, ZERO_ADDRESS)
-    vault.triggerPause()
-    vault.setDepositLimits(MAX_UINT256, MAX_UINT256)
 
+def test_fail_enter_batch_burn_transfer_fails(misc_accounts, token, vault):
     account = misc_accounts[0]
 
     token.mint(account, 1000 * 1e18)
@@ -22,13 +12,7 @@ def test_fail_enter_batch_burn_transfer_fails(misc_accounts, gov, token, auth, V
     with brownie.reverts("ERC20: transfer amount exceeds balance"):
         vault.enterBatchBurn(vault.balanceOf(account) + 1, {"from": account})
 
-def test_fail_enter_batch_burn_different_round(misc_accounts, gov, token, auth, Vault):
-    # deploy the vault
-    vault = gov.deploy(Vault)
-    vault.initialize(token, auth, ZERO_ADDRESS, ZERO_ADDRESS)
-    vault.triggerPause()
-    vault.setDepositLimits(MAX_UINT256, MAX_UINT256)
-
+def test_fail_enter_batch_burn_different_round(misc_accounts, token, vault):
     account = misc_accounts[0]
 
     token.mint(account, 1000 * 1e18)
@@ -41,13 +25,7 @@ def test_fail_enter_batch_burn_different_round(misc_accounts, gov, token, auth,
     with brownie.reverts("enterBatchBurn::DIFFERENT_ROUNDS"):
         vault.enterBatchBurn(vault.balanceOf(account), {'from': account})
 
-def test_exit_batch_burn_fails_if_no_deposit(misc_accounts, gov, token, auth, Vault):
-    # deploy the vault
-    vault = gov.deploy(Vault)
-    vault.initialize(token, auth, ZERO_ADDRESS, ZERO_ADDRESS)
-    vault.triggerPause()
-    vault.setDepositLimits(MAX_UINT256, MAX_UINT256)
-
+def test_exit_batch_burn_fails_if_no_deposit(misc_accounts, token, vault):
     account = misc_accounts[0]
 
     token.mint(account, 1000 * 1e18)
@@ -57,13 +35,7 @@ def test_exit_batch_burn_fails_if_no_deposit(misc_accounts, gov, token, auth, Va
     with brownie.reverts("exitBatchBurn::NO_DEPOSITS"):
         vault.exitBatchBurn({"from": account})
 
-def test_exit_batch_burn_fails_if_round_not_executed(misc_accounts, gov, token, auth, Vault):
-    # deploy the vault
-    vault = gov.deploy(Vault)
-    vault.initialize(token, auth, ZERO_ADDRESS, ZERO_ADDRESS)
-    vault.triggerPause()
-    vault.setDepositLimits(MAX_UINT256, MAX_UINT256)
-
+def test_exit_batch_burn_fails_if_round_not_executed(misc_accounts, token, vault):
     account = misc_accounts[0]
 
     token.mint(account, 1000 * 1e18)
@@ -74,13 +46,7 @@ def test_exit_batch_burn_fails_if_round_not_executed(misc_accounts, gov, token,
     with brownie.reverts("exitBatchBurn::ROUND_NOT_EXECUTED"):
         vault.exitBatchBurn({"from": account})
 
-def test_enter_batch_burn_different_round(misc_accounts, gov, token, auth, Vault):
-    # deploy the vault
-    vault = gov.deploy(Vault)
-    vault.initialize(token, auth, ZERO_ADDRESS, ZERO_ADDRESS)
-    vault.triggerPause()
-    vault.setDepositLimits(MAX_UINT256, MAX_UINT256)
-
+def test_enter_batch_burn_different_round(misc_accounts, token, vault):
     account = misc_accounts[0]
 
     token.mint(account, 1000 * 1e18)
@@ -95,13 +61,7 @@ def test_enter_batch_burn_different_round(misc_accounts, gov, token, auth, Vault
     assert receipt["round"] == 1
     assert receipt["shares"] == 1000 * 1e18
 
-def test_fails_exec_batch_harvest_not_expired(misc_accounts, gov, token, auth, Vault, MockStrategy):
-    # deploy the vault
-    vault = gov.deploy(Vault)
-    vault.initialize(token, auth, ZERO_ADDRESS, ZERO_ADDRESS)
-    vault.triggerPause()
-    vault.setDepositLimits(MAX_UINT256, MAX_UINT256)
-
+def test_fails_exec_batch_harvest_not_expired(misc_accounts, token, vault):
     account = misc_accounts[0]
 
     token.mint(account, 1000 * 1e18)
@@ -114,13 +74,7 @@ def test_fails_exec_batch_harvest_not_expired(misc_accounts, gov, token, auth, V
     with brownie.reverts("batchBurn::LATEST_HARVEST_NOT_EXPIRED"):
         vault.execBatchBurn()
 
-def test_fails_exec_batch_burn_zero_shares(misc_accounts, gov, token, auth, Vault, MockStrategy):
-    # deploy the vault
-    vault = gov.deploy(Vault)
-    vault.initialize(token, auth, ZERO_ADDRESS, ZERO_ADDRESS)
-    vault.triggerPause()
-    vault.setDepositLimits(MAX_UINT256, MAX_UINT256)
-
+def test_fails_exec_batch_burn_zero_shares(misc_accounts, token, vault):
     account = misc_accounts[0]
 
     token.mint(account, 1000 * 1e18)
@@ -130,25 +84,14 @@ def test_fails_exec_batch_burn_zero_shares(misc_accounts, gov, token, auth, Vaul
     with brownie.reverts("batchBurn::TOTAL_SHARES_CANNOT_BE_ZERO"):
         vault.execBatchBurn()
 
-def test_fails_exec_batch_burn_not_enough_underlying(misc_accounts, gov, token, auth, Vault):
-    # deploy the vault
-    vault = gov.deploy(Vault)
-    vault.initialize(token, auth, ZERO_ADDRESS, ZERO_ADDRESS)
-    vault.triggerPause()
-    vault.setDepositLimits(MAX_UINT256, MAX_UINT256)
-
+def test_fails_exec_batch_burn_not_enough_underlying(misc_accounts, token, vault, strategy):
     account = misc_accounts[0]
 
     token.mint(account, 1000 * 1e18)
     token.approve(vault, 1000 * 1e18, {'from': account})
     vault.deposit(account, 1000 * 1e18, {'from': account})
     vault.enterBatchBurn(vault.balanceOf(account), {'from': account})
-    
-    # deploy the strategy
-    strategy = gov.deploy(MockStrategy)
-    strategy.initialize(vault, token, gov, gov, "MockStrategy")
 
-    vault.trustStrategy(strategy)
     vault.depositIntoStrategy(strategy, 10 * 1e18)
 
     assert vault.totalFloat() == 990 * 1e18
@@ -156,13 +99,7 @@ def test_fails_exec_batch_burn_not_enough_underlying(misc_accounts, gov, token,
     with brownie.reverts("batchBurn::NOT_ENOUGH_UNDERLYING"):
         vault.execBatchBurn()
 
-def test_exec_batch_burn_fees_check(misc_accounts, gov, token, auth, Vault):
-    # deploy the vault
-    vault = gov.deploy(Vault)
-    vault.initialize(token, auth, ZERO_ADDRESS, ZERO_ADDRESS)
-    vault.triggerPause()
-    vault.setDepositLimits(MAX_UINT256, MAX_UINT256)
-
+def test_exec_batch_burn_fees_check(misc_accounts, token, vault):
     (account, receiver) = (misc_accounts[0], misc_accounts[1])
 
     vault.setBurningFeePercent(1e16)
@@ -176,13 +113,7 @@ def test_exec_batch_burn_fees_check(misc_accounts, gov, token, auth, Vault):
 
     assert token.balanceOf(receiver) == 10 * 1e18
 
-def test_e2e_batched_burning(misc_accounts, gov, token, auth, Vault, MockStrategy):
-    # deploy the vault
-    vault = gov.deploy(Vault)
-    vault.initialize(token, auth, ZERO_ADDRESS, ZERO_ADDRESS)
-    vault.triggerPause()
-    vault.setDepositLimits(MAX_UINT256, MAX_UINT256)
-
+def test_e2e_batched_burning(misc_accounts, token, vault):
     for u in misc_accounts:
         token.mint(u, 1000 * 1e18)
 
@@ -210,13 +141,7 @@ def test_e2e_batched_burning(misc_accounts, gov, token, auth, Vault, MockStrateg
         vault.exitBatchBurn({"from": u})
         assert token.balanceOf(u) == 1000 * 1e18
 
-def test_e2e_batched_burning_loss(misc_accounts, gov, token, auth, Vault):
-    # deploy the vault
-    vault = gov.deploy(Vault)
-    vault.initialize(token, auth, ZERO_ADDRESS, ZERO_ADDRESS)
-    vault.triggerPause()
-    vault.setDepositLimits(MAX_UINT256, MAX_UINT256)
-
+def test_e2e_batched_burning_loss(misc_accounts, token, vault):
     for u in misc_accounts:
         token.mint(u, 1000 * 1e18)
 
@@ -1,30 +1,18 @@
 import pytest
 import brownie
 
-from brownie import ZERO_ADDRESS, MockStrategy, Vault, chain
+from brownie import chain
 
-MAX_UINT256 = 2**256 - 1
 
-
-def test_trust_strategy(gov, token, auth, MockStrategy, Vault):
-    # deploy the vault
-    vault = gov.deploy(Vault)
-    vault.initialize(token, auth, ZERO_ADDRESS, ZERO_ADDRESS)
-
-    # deploy the strategy
-    strategy = gov.deploy(MockStrategy)
-    strategy.initialize(vault, token, gov, gov, "MockStrategy")
+def test_trust_strategy(gov, vault, create_strategy):
+    strategy = create_strategy()
 
     # calling set strategy should not revert
     assert not vault.getStrategyData(strategy)["trusted"]
     vault.trustStrategy(strategy, {"from": gov})
     assert vault.getStrategyData(strategy)["trusted"]
 
-def test_fails_trust_strategy_different_underlying(gov, create_token, token, auth, MockStrategy, Vault):
-    # deploy the vault
-    vault = gov.deploy(Vault)
-    vault.initialize(token, auth, ZERO_ADDRESS, ZERO_ADDRESS)
-
+def test_fails_trust_strategy_different_underlying(gov, create_token, vault, MockStrategy):
     # deploy the strategy
     diff_token = create_token()
     strategy = gov.deploy(MockStrategy)
@@ -32,20 +20,10 @@ def test_fails_trust_strategy_different_underlying(gov, create_token, token, aut
 
     with brownie.reverts("trustStrategy::WRONG_UNDERLYING"):
         vault.trustStrategy(strategy, {"from": gov})
-    
-    assert not vault.getStrategyData(strategy)["trusted"]
-
-def test_distrust_strategy(gov, token, auth, MockStrategy, Vault):
-    # deploy the vault
-    vault = gov.deploy(Vault)
-    vault.initialize(token, auth, ZERO_ADDRESS, ZERO_ADDRESS)
 
-    # deploy the strategy
-    strategy = gov.deploy(MockStrategy)
-    strategy.initialize(vault, token, gov, gov, "MockStrategy")
+    assert not vault.getStrategyData(strategy)["trusted"]
 
-    # trust the strategy
-    vault.trustStrategy(strategy, {"from": gov})
+def test_distrust_strategy(gov, vault, strategy):
     assert vault.getStrategyData(strategy)["trusted"]
 
     # calling set strategy should not revert
@@ -53,22 +31,7 @@ def test_distrust_strategy(gov, token, auth, MockStrategy, Vault):
     assert not vault.getStrategyData(strategy)["trusted"]
 
 
-def test_can_deposit_underlying_in_trusted_strategy(
-    gov, token, auth, MockStrategy, Vault
-):
-    # deploy the vault
-    vault = gov.deploy(Vault)
-    vault.initialize(token, auth, ZERO_ADDRESS, ZERO_ADDRESS)
-    vault.setDepositLimits(MAX_UINT256, MAX_UINT256)
-    vault.triggerPause()
-
-    # deploy the strategy
-    strategy = gov.deploy(MockStrategy)
-    strategy.initialize(vault, token, gov, gov, "MockStrategy")
-
-    # trust the strategy
-    vault.trustStrategy(strategy, {"from": gov})
-
+def test_can_deposit_underlying_in_trusted_strategy(gov, token, vault, strategy):
     # deposit underlying in the vault
     token.approve(vault, 1e19)
     vault.deposit(gov, 1e19)
@@ -84,18 +47,8 @@ def test_can_deposit_underlying_in_trusted_strategy(
     assert vault.totalUnderlying() == 1e19
 
 
-def test_cant_deposit_underlying_in_untrusted_strategy(
-    gov, token, auth, MockStrategy, Vault
-):
-    # deploy the vault
-    vault = gov.deploy(Vault)
-    vault.initialize(token, auth, ZERO_ADDRESS, ZERO_ADDRESS)
-    vault.setDepositLimits(MAX_UINT256, MAX_UINT256)
-    vault.triggerPause()
-
-    # deploy the strategy
-    strategy = gov.deploy(MockStrategy)
-    strategy.initialize(vault, token, gov, gov, "MockStrategy")
+def test_cant_deposit_underlying_in_untrusted_strategy(gov, token, vault, create_strategy):
+    strategy = create_strategy()
 
     # deposit underlying in the vault
     token.approve(vault, 1e19)
@@ -105,20 +58,7 @@ def test_cant_deposit_underlying_in_untrusted_strategy(
     with brownie.reverts("depositIntoStrategy::UNTRUSTED_STRATEGY"):
         vault.depositIntoStrategy(strategy, 1e18)
 
-def test_cant_deposit_amount_zero_in_trusted_strategy(gov, token, auth, MockStrategy, Vault):
-    # deploy the vault
-    vault = gov.deploy(Vault)
-    vault.initialize(token, auth, ZERO_ADDRESS, ZERO_ADDRESS)
-    vault.setDepositLimits(MAX_UINT256, MAX_UINT256)
-    vault.triggerPause()
-
-    # deploy the strategy
-    strategy = gov.deploy(MockStrategy)
-    strategy.initialize(vault, token, gov, gov, "MockStrategy")
-
-    # trust the strategy
-    vault.trustStrategy(strategy, {"from": gov})
-
+def test_cant_deposit_amount_zero_in_trusted_strategy(gov, token, vault, strategy):
     # deposit underlying in the vault
     token.approve(vault, 1e19)
     vault.deposit(gov, 1e19)
@@ -127,21 +67,9 @@ def test_cant_deposit_amount_zero_in_trusted_strategy(gov, token, auth, MockStra
     with brownie.reverts("depositIntoStrategy::AMOUNT_CANNOT_BE_ZERO"):
         vault.depositIntoStrategy(strategy, 0)
 
-def test_cant_deposit_failed_minting(gov, token, auth, MockStrategy, Vault):
-    # deploy the vault
-    vault = gov.deploy(Vault)
-    vault.initialize(token, auth, ZERO_ADDRESS, ZERO_ADDRESS)
-    vault.setDepositLimits(MAX_UINT256, MAX_UINT256)
-    vault.triggerPause()
-
-    # deploy the strategy
-    strategy = gov.deploy(MockStrategy)
-    strategy.initialize(vault, token, gov, gov, "MockStrategy")
+def test_cant_deposit_failed_minting(gov, token, vault, strategy):
     strategy.setSuccess(False)
 
-    # trust the strategy
-    vault.trustStrategy(strategy, {"from": gov})
-
     # deposit underlying in the vault
     token.approve(vault, 1e19)
     vault.deposit(gov, 1e19)
@@ -150,20 +78,7 @@ def test_cant_deposit_failed_minting(gov, token, auth, MockStrategy, Vault):
     with brownie.reverts("depositIntoStrategy::MINT_FAILED"):
         vault.depositIntoStrategy(strategy, 1e18)
 
-def test_fails_withdraw_from_untrusted_strategy(gov, token, auth, MockStrategy, Vault):
-    # deploy the vault
-    vault = gov.deploy(Vault)
-    vault.initialize(token, auth, ZERO_ADDRESS, ZERO_ADDRESS)
-    vault.setDepositLimits(MAX_UINT256, MAX_UINT256)
-    vault.triggerPause()
-
-    # deploy the strategy
-    strategy = gov.deploy(MockStrategy)
-    strategy.initialize(vault, token, gov, gov, "MockStrategy")
-
-    # trust the strategy
-    vault.trustStrategy(strategy, {"from": gov})
-
+def test_fails_withdraw_from_untrusted_strategy(gov, token, vault, strategy):
     # deposit underlying in the vault
     token.approve(vault, 1e19)
     vault.deposit(gov, 1e19)
@@ -177,20 +92,7 @@ def test_fails_withdraw_from_untrusted_strategy(gov, token, auth, MockStrategy,
     with brownie.reverts("withdrawFromStrategy::UNTRUSTED_STRATEGY"):
         vault.withdrawFromStrategy(strategy, 9e18)
 
-def test_fails_withdraw_zero_from_strategy(gov, token, auth, MockStrategy, Vault):
-    # deploy the vault
-    vault = gov.deploy(Vault)
-    vault.initialize(token, auth, ZERO_ADDRESS, ZERO_ADDRESS)
-    vault.setDepositLimits(MAX_UINT256, MAX_UINT256)
-    vault.triggerPause()
-
-    # deploy the strategy
-    strategy = gov.deploy(MockStrategy)
-    strategy.initialize(vault, token, gov, gov, "MockStrategy")
-
-    # trust the strategy
-    vault.trustStrategy(strategy, {"from": gov})
-
+def test_fails_withdraw_zero_from_strategy(gov, token, vault, strategy):
     # deposit underlying in the vault
     token.approve(vault, 1e19)
     vault.deposit(gov, 1e19)
@@ -202,20 +104,7 @@ def test_fails_withdraw_zero_from_strategy(gov, token, auth, MockStrategy, Vault
     with brownie.reverts("withdrawFromStrategy::AMOUNT_CANNOT_BE_ZERO"):
         vault.withdrawFromStrategy(strategy, 0)
 
-def test_fails_withdraw_more_than_deposit_from_strategy(gov, token, auth, MockStrategy, Vault):
-    # deploy the vault
-    vault = gov.deploy(Vault)
-    vault.initialize(token, auth, ZERO_ADDRESS, ZERO_ADDRESS)
-    vault.setDepositLimits(MAX_UINT256, MAX_UINT256)
-    vault.triggerPause()
-
-    # deploy the strategy
-    strategy = gov.deploy(MockStrategy)
-    strategy.initialize(vault, token, gov, gov, "MockStrategy")
-
-    # trust the strategy
-    vault.trustStrategy(strategy, {"from": gov})
-
+def test_fails_withdraw_more_than_deposit_from_strategy(gov, token, vault, strategy):
     # deposit underlying in the vault
     token.approve(vault, 1e19)
     vault.deposit(gov, 1e19)
@@ -223,7 +112,7 @@ def test_fails_withdraw_more_than_deposit_from_strategy(gov, token, auth, MockSt
     # deposit underlying in the strategy
     vault.depositIntoStrategy(strategy, 9e18)
 
-    # simulate a loss: 
+    # simulate a loss:
     #   - underlying accounted in vault is 9e18
     #   - actual underlying in the strategy is 8e18
     strategy.simulateLoss(1e18)
@@ -232,20 +121,7 @@ def test_fails_withdraw_more_than_deposit_from_strategy(gov, token, auth, MockSt
     with brownie.reverts("withdrawFromStrategy::REDEEM_FAILED"):
         vault.withdrawFromStrategy(strategy, 9e18)
 
-def test_withdraw_underlying_strategy(gov, token, auth, MockStrategy, Vault):
-    # deploy the vault
-    vault = gov.deploy(Vault)
-    vault.initialize(token, auth, ZERO_ADDRESS, ZERO_ADDRESS)
-    vault.setDepositLimits(MAX_UINT256, MAX_UINT256)
-    vault.triggerPause()
-
-    # deploy the strategy
-    strategy = gov.deploy(MockStrategy)
-    strategy.initialize(vault, token, gov, gov, "MockStrategy")
-
-    # trust the strategy
-    vault.trustStrategy(strategy, {"from": gov})
-
+def test_withdraw_underlying_strategy(gov, token, vault, strategy):
     # deposit underlying in the vault
     token.approve(vault, 1e19)
     vault.deposit(gov, 1e19)
@@ -259,28 +135,17 @@ def test_withdraw_underlying_strategy(gov, token, auth, MockStrategy, Vault):
     assert vault.totalFloat() == 1e19
     assert vault.totalUnderlying() == 1e19
 
-def test_harvest_happy_path_profit_state(gov, keeper, token, auth, MockStrategy):
-    # deploy the vault
-    vault = gov.deploy(Vault)
-    vault.initialize(token, auth, ZERO_ADDRESS, ZERO_ADDRESS)
-    vault.setDepositLimits(MAX_UINT256, MAX_UINT256)
-    vault.triggerPause()
-
+def test_harvest_happy_path_profit_state(gov, token, vault, strategy, create_strategy):
     vault.setHarvestDelay(7200)
     vault.setHarvestWindow(900)
 
-    # deploy the strategies
-    strategy = gov.deploy(MockStrategy)
-    strategy.initialize(vault, token, gov, keeper, "MockStrategy")
-
-    new_strategy = gov.deploy(MockStrategy)
-    new_strategy.initialize(vault, token, gov, keeper, "MockStrategy")
+    # deploy the second strategy
+    new_strategy = create_strategy()
 
     # deposit underlying in the vault
     token.approve(vault, 1e19)
     vault.deposit(gov, 1e19)
 
-    vault.trustStrategy(strategy)
     vault.trustStrategy(new_strategy)
 
     # deposit underlying in the strategy
@@ -288,7 +153,7 @@ def test_harvest_happy_path_profit_state(gov, keeper, token, auth, MockStrategy)
     vault.depositIntoStrategy(new_strategy, 5e18)
 
     # mint some tokens, simulating yield
-    # 2 units of yield on 10 units of underlying is 20% of return 
+    # 2 units of yield on 10 units of underlying is 20% of return
     token.mint(strategy, 1e18)
     token.mint(new_strategy, 1e18)
 
@@ -301,30 +166,19 @@ def test_harvest_happy_path_profit_state(gov, keeper, token, auth, MockStrategy)
     assert vault.maxLockedProfit() == 2e18
 
 
-def test_harvest_applies_new_harvest_delay(gov, keeper, token, auth, MockStrategy):
-    # deploy the vault
-    vault = gov.deploy(Vault)
-    vault.initialize(token, auth, ZERO_ADDRESS, ZERO_ADDRESS)
-    vault.setDepositLimits(MAX_UINT256, MAX_UINT256)
-    vault.triggerPause()
-
+def test_harvest_applies_new_harvest_delay(gov, keeper, token, vault, strategy, create_strategy):
     vault.setHarvestDelay(7200)
     vault.setHarvestWindow(900)
     vault.setHarvestFeePercent(1e16)
     vault.setHarvestFeeReceiver(keeper)
 
-    # deploy the strategies
-    strategy = gov.deploy(MockStrategy)
-    strategy.initialize(vault, token, gov, keeper, "MockStrategy")
-
-    new_strategy = gov.deploy(MockStrategy)
-    new_strategy.initialize(vault, token, gov, keeper, "MockStrategy")
+    # deploy the second strategy
+    new_strategy = create_strategy()
 
     # deposit underlying in the vault
     token.approve(vault, 1e19)
     vault.deposit(gov, 1e19)
 
-    vault.trustStrategy(strategy)
     vault.trustStrategy(new_strategy)
 
     # deposit underlying in the strategy
@@ -341,30 +195,19 @@ def test_harvest_applies_new_harvest_delay(gov, keeper, token, auth, MockStrateg
 
     assert vault.harvestDelay() == 14400
 
-def test_harvest_fees_check(gov, keeper, token, auth, MockStrategy):
-    # deploy the vault
-    vault = gov.deploy(Vault)
-    vault.initialize(token, auth, ZERO_ADDRESS, ZERO_ADDRESS)
-    vault.setDepositLimits(MAX_UINT256, MAX_UINT256)
-    vault.triggerPause()
-
+def test_harvest_fees_check(gov, keeper, token, vault, strategy, create_strategy):
     vault.setHarvestDelay(7200)
     vault.setHarvestWindow(900)
     vault.setHarvestFeePercent(1e16)
     vault.setHarvestFeeReceiver(keeper)
 
-    # deploy the strategies
-    strategy = gov.deploy(MockStrategy)
-    strategy.initialize(vault, token, gov, keeper, "MockStrategy")
-
-    new_strategy = gov.deploy(MockStrategy)
-    new_strategy.initialize(vault, token, gov, keeper, "MockStrategy")
+    # deploy the second strategy
+    new_strategy = create_strategy()
 
     # deposit underlying in the vault
     token.approve(vault, 1e19)
     vault.deposit(gov, 1e19)
 
-    vault.trustStrategy(strategy)
     vault.trustStrategy(new_strategy)
 
     # deposit underlying in the strategy
@@ -384,28 +227,17 @@ def test_harvest_fees_check(gov, keeper, token, auth, MockStrategy):
     assert vault.calculateUnderlying(keeper_balance) == 2e16
 
 
-def test_harvest_consecutive(gov, keeper, token, auth, MockStrategy):
-    # deploy the vault
-    vault = gov.deploy(Vault)
-    vault.initialize(token, auth, ZERO_ADDRESS, ZERO_ADDRESS)
-    vault.setDepositLimits(MAX_UINT256, MAX_UINT256)
-    vault.triggerPause()
-
+def test_harvest_consecutive(gov, token, vault, strategy, create_strategy):
     vault.setHarvestDelay(7200)
     vault.setHarvestWindow(900)
 
-    # deploy the strategies
-    strategy = gov.deploy(MockStrategy)
-    strategy.initialize(vault, token, gov, keeper, "MockStrategy")
-
-    new_strategy = gov.deploy(MockStrategy)
-    new_strategy.initialize(vault, token, gov, keeper, "MockStrategy")
+    # deploy the second strategy
+    new_strategy = create_strategy()
 
     # deposit underlying in the vault
     token.approve(vault, 1e19)
     vault.deposit(gov, 1e19)
 
-    vault.trustStrategy(strategy)
     vault.trustStrategy(new_strategy)
 
     # deposit underlying in the strategy
@@ -415,24 +247,13 @@ def test_harvest_consecutive(gov, keeper, token, auth, MockStrategy):
     vault.harvest([strategy])
     vault.harvest([new_strategy])
 
-def test_fails_harvest_bad_harvest_time(gov, keeper, token, auth, MockStrategy):
-    # deploy the vault
-    vault = gov.deploy(Vault)
-    vault.initialize(token, auth, ZERO_ADDRESS, ZERO_ADDRESS)
-    vault.setDepositLimits(MAX_UINT256, MAX_UINT256)
-    vault.triggerPause()
-
+def test_fails_harvest_bad_harvest_time(gov, token, vault, strategy, create_strategy):
     vault.setHarvestDelay(7200)
     vault.setHarvestWindow(900)
 
-    # deploy the strategies
-    strategy = gov.deploy(MockStrategy)
-    strategy.initialize(vault, token, gov, keeper, "MockStrategy")
+    # deploy the second strategy
+    new_strategy = create_strategy()
 
-    new_strategy = gov.deploy(MockStrategy)
-    new_strategy.initialize(vault, token, gov, keeper, "NewMockStrategy")
-
-    vault.trustStrategy(strategy)
     vault.trustStrategy(new_strategy)
 
     # deposit underlying in the vault
@@ -450,23 +271,11 @@ def test_fails_harvest_bad_harvest_time(gov, keeper, token, auth, MockStrategy):
         vault.harvest([new_strategy])
 
 
-def test_fails_harvest_untrusted_strategy(gov, keeper, token, auth, MockStrategy):
-    # deploy the vault
-    vault = gov.deploy(Vault)
-    vault.initialize(token, auth, ZERO_ADDRESS, ZERO_ADDRESS)
-    vault.setDepositLimits(MAX_UINT256, MAX_UINT256)
-    vault.triggerPause()
-
-    # deploy the strategy
-    strategy = gov.deploy(MockStrategy)
-    strategy.initialize(vault, token, gov, keeper, "MockStrategy")
-
+def test_fails_harvest_untrusted_strategy(gov, token, vault, strategy):
     # deposit underlying in the vault
     token.approve(vault, 1e19)
     vault.deposit(gov, 1e19)
 
-    vault.trustStrategy(strategy)
-
     # deposit underlying in the strategy
     vault.depositIntoStrategy(strategy, 9e18)
 
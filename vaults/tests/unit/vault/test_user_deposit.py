@@ -1,38 +1,26 @@
 import pytest
 import brownie
 
-from brownie import ZERO_ADDRESS, MockStrategy, Vault
+from brownie import ZERO_ADDRESS, MockStrategy
 
 MAX_UINT256 = 2**256 - 1
 
 
-def test_deposit_without_allowance(misc_accounts, gov, token, auth, Vault):
+def test_deposit_without_allowance(misc_accounts, token, vault):
     # mint some tokens to alice
     alice = misc_accounts[0]
     token.mint(alice, 10_000e18)
 
-    # deploy the vault
-    vault = gov.deploy(Vault)
-    vault.initialize(token, auth, ZERO_ADDRESS, ZERO_ADDRESS)
-    vault.triggerPause()
-    vault.setDepositLimits(MAX_UINT256, MAX_UINT256)
-
     # this should revert
     with brownie.reverts():
         vault.deposit(alice, 10_000e18, {"from": alice})
 
 
-def test_deposit(misc_accounts, gov, token, auth, Vault):
+def test_deposit(misc_accounts, token, vault):
     # mint some tokens to alice
     alice = misc_accounts[0]
     token.mint(alice, 10_000e18)
 
-    # deploy the vault
-    vault = gov.deploy(Vault)
-    vault.initialize(token, auth, ZERO_ADDRESS, ZERO_ADDRESS)
-    vault.triggerPause()
-    vault.setDepositLimits(MAX_UINT256, MAX_UINT256)
-
     # should pass
     balanceBefore = token.balanceOf(alice)
     exchangeRate = vault.exchangeRate()
@@ -44,14 +32,13 @@ def test_deposit(misc_accounts, gov, token, auth, Vault):
     assert token.balanceOf(alice) == (balanceBefore - 10_000e18)
     assert token.balanceOf(vault) == 10_000e18
 
-def test_user_deposit_when_paused(misc_accounts, gov, token, auth, Vault):
+def test_user_deposit_when_paused(misc_accounts, token, vault):
     # mint some tokens to alice
     alice = misc_accounts[0]
     token.mint(alice, 10_000e18)
 
-    # deploy the vault
-    vault = gov.deploy(Vault)
-    vault.initialize(token, auth, ZERO_ADDRESS, ZERO_ADDRESS)
+    # pause the vault
+    vault.triggerPause()
 
     # should pass
     token.approve(vault, 10_000e18, {"from": alice})
@@ -59,27 +46,19 @@ def test_user_deposit_when_paused(misc_accounts, gov, token, auth, Vault):
     with brownie.reverts("Pausable: paused"):
         vault.deposit(alice, 10_000e18, {"from": alice})
 
-def test_user_deposit_not_approved(misc_accounts, gov, token, auth, Vault):
+def test_user_deposit_not_approved(misc_accounts, token, vault):
     # mint some tokens to alice
     alice = misc_accounts[0]
     token.mint(alice, 10_000e18)
 
-    # deploy the vault
-    vault = gov.deploy(Vault)
-    vault.initialize(token, auth, ZERO_ADDRESS, ZERO_ADDRESS)
-
     with brownie.reverts():
         vault.deposit(alice, 10_000e18, {"from": alice})
 
-def test_user_deposit_over_user_limit(misc_accounts, gov, token, auth, Vault):
+def test_user_deposit_over_user_limit(misc_accounts, token, vault):
     # mint some tokens to alice
     alice = misc_accounts[0]
     token.mint(alice, 10_000e18)
 
-    # deploy the vault
-    vault = gov.deploy(Vault)
-    vault.initialize(token, auth, ZERO_ADDRESS, ZERO_ADDRESS)
-    vault.triggerPause()
     vault.setDepositLimits(1_000e18, MAX_UINT256)
 
     # should pass
@@ -88,15 +67,11 @@ def test_user_deposit_over_user_limit(misc_accounts, gov, token, auth, Vault):
     with brownie.reverts("_deposit::USER_DEPOSIT_LIMITS_REACHED"):
         vault.deposit(alice, 10_000e18, {"from": alice})
 
-def test_user_deposit_over_user_limit(misc_accounts, gov, token, auth, Vault):
+def test_user_deposit_over_vault_limit(misc_accounts, token, vault):
     # mint some tokens to alice
     alice = misc_accounts[0]
     token.mint(alice, 10_000e18)
 
-    # deploy the vault
-    vault = gov.deploy(Vault)
-    vault.initialize(token, auth, ZERO_ADDRESS, ZERO_ADDRESS)
-    vault.triggerPause()
     vault.setDepositLimits(MAX_UINT256, 9_999e18)
 
     # should pass